@@ -6,12 +6,17 @@ import os
 import shutil
 import json
 import re
+import hashlib
 
 if sys.version_info < (3, 11):
     TOML_VERSION = "toml"
 else:
     TOML_VERSION = "tomli-w"
 
+GOLDEN_CACHE_ENV = "RESEARCH_TEMPLATE_GOLDEN_CACHE"
+# Setup config entries that do not change what gets installed into .venv
+GOLDEN_IGNORED_KEYS = {"authors", "orcids"}
+
 
 def prompt_user(question, options):
     print(question)
@@ -170,6 +175,7 @@ def write_setup_config():
     ) = set_options(programming_language, version_control)
     payload = {
         "programming_language": programming_language,
+        "version_control": version_control,
         "authors": authors,
         "orcids": orcids,
         "python_env_manager": python_env_manager,
@@ -220,7 +226,7 @@ def install_uv():
             return False
 
 
-def create_with_uv():
+def create_with_uv(config_path):
     """Create virtual environment using uv with UV_LINK_MODE=copy to avoid hardlink errors,
     then run setup with the interpreter from .venv (not `uv run`)."""
 
@@ -228,14 +234,15 @@ def create_with_uv():
     env["UV_LINK_MODE"] = "copy"
 
     try:
-        # Create venv and lock deps with uv
-        subprocess.run(
-            ["uv", "venv"],
-            check=True,
-            env=env,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        # Create venv (unless restored from the golden cache) and lock deps with uv
+        if not pathlib.Path(".venv").exists():
+            subprocess.run(
+                ["uv", "venv"],
+                check=True,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
         subprocess.run(
             ["uv", "lock"],
             check=True,
@@ -282,11 +289,10 @@ def create_with_uv():
             f"Python interpreter not found at {python_exe}. Did 'uv venv' succeed?"
         )
 
-    config_path = write_setup_config()
     subprocess.run([python_exe, "setup/project_setup.py", "--config", config_path], check=True, env=env)
 
 
-def create_with_pip():
+def create_with_pip(config_path):
     env = os.environ.copy()
 
     subprocess.run(
@@ -335,20 +341,174 @@ def create_with_pip():
         stderr=subprocess.DEVNULL,
     )
 
-    config_path = write_setup_config()
     subprocess.run([python_exe, "setup/project_setup.py", "--config", config_path], check=True, env=env)
 
 
+def golden_cache_dir():
+    """Return the golden-environment cache directory, or None when the mode is disabled.
+
+    The mode is enabled by setting RESEARCH_TEMPLATE_GOLDEN_CACHE to a directory
+    (or to "1" to use the per-user cache directory).
+    """
+    value = os.environ.get(GOLDEN_CACHE_ENV, "").strip()
+    if not value or value.lower() in {"0", "false", "no"}:
+        return None
+    if value.lower() not in {"1", "true", "yes"}:
+        return pathlib.Path(value).expanduser().resolve()
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", str(pathlib.Path.home() / "AppData" / "Local"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", str(pathlib.Path.home() / ".cache"))
+    return pathlib.Path(base) / "research-template" / "golden"
+
+
+def _uv_version():
+    try:
+        return subprocess.run(["uv", "--version"], capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def _local_wheel_hashes():
+    """sha256 of the bundled repokit wheels, so a wheel rebuilt under the same version gets a new key."""
+    hashes = {}
+    for wheel in sorted(pathlib.Path("setup", "repokit").glob("**/dist/*.whl")):
+        hashes[wheel.as_posix()] = hashlib.sha256(wheel.read_bytes()).hexdigest()
+    return hashes
+
+
+def golden_key(config_path):
+    """Hash the setup choices, tool versions and local wheels that determine the contents of .venv."""
+    config = json.loads(pathlib.Path(config_path).read_text(encoding="utf-8"))
+    if str(config.get("python_env_manager", "")).lower() != "venv":
+        # Conda projects replace .venv with a conda env in run_setup.*
+        return None
+    # Golden envs are not relocatable on Windows (launcher .exe files embed absolute paths)
+    if os.name == "nt":
+        return None
+    # Every setup choice (version control, code host, remote storage, ...) can add packages
+    choices = {k: v for k, v in config.items() if k not in GOLDEN_IGNORED_KEYS}
+    payload = {
+        "choices": choices,
+        "python": platform.python_version(),
+        "platform": f"{platform.system()}-{platform.machine()}",
+        "toml": TOML_VERSION,
+        "uv": _uv_version(),
+        "wheels": _local_wheel_hashes(),
+    }
+    raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _rewrite_venv_paths(venv_dir, old_root, new_root, old_name, new_name):
+    """Point a copied .venv at its new project: pyvenv.cfg, activate scripts, shebangs, .pth files."""
+    candidates = [venv_dir / "pyvenv.cfg"]
+    candidates += [p for p in (venv_dir / "bin").iterdir() if p.is_file() and not p.is_symlink()]
+    candidates += list(venv_dir.glob("lib/python*/site-packages/*.pth"))
+    candidates += list(venv_dir.glob("lib/python*/site-packages/*.dist-info/direct_url.json"))
+
+    old_b, new_b = old_root.encode(), new_root.encode()
+    for path in candidates:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        if b"\0" in data[:1024]:
+            continue  # binary executable
+        text = data.replace(old_b, new_b)
+        if old_name != new_name and (path.name == "pyvenv.cfg" or path.name.startswith("activate")):
+            text = b"\n".join(
+                line.replace(old_name.encode(), new_name.encode()) if b"prompt" in line.lower() else line
+                for line in text.split(b"\n")
+            )
+        if text == data:
+            continue
+        # Replace (not edit in place) so hardlinks into the cache are broken, not modified
+        tmp = path.with_name(path.name + ".golden-tmp")
+        tmp.write_bytes(text)
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+
+
+def restore_golden_env(config_path):
+    """Instantiate .venv from a cached golden environment. Returns True on a cache hit."""
+    cache_dir = golden_cache_dir()
+    key = golden_key(config_path) if cache_dir else None
+    if not key:
+        return False
+    entry = cache_dir / key
+    meta_path = entry / "golden.json"
+    if not meta_path.exists() or not (entry / ".venv").is_dir():
+        return False
+
+    project_root = pathlib.Path.cwd().resolve()
+    target = project_root / ".venv"
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        shutil.copytree(entry / ".venv", target, symlinks=True, copy_function=_link_or_copy)
+        _rewrite_venv_paths(
+            target, meta["project_root"], str(project_root), meta["project_name"], project_root.name
+        )
+    except (OSError, KeyError, ValueError) as exc:
+        print(f"Golden environment restore failed ({exc}). Building from scratch.")
+        shutil.rmtree(target, ignore_errors=True)
+        return False
+
+    print(f"Restored golden environment {key} from {entry}")
+    return True
+
+
+def store_golden_env(config_path):
+    """Copy the fully set-up .venv into the golden cache for future projects."""
+    cache_dir = golden_cache_dir()
+    key = golden_key(config_path) if cache_dir else None
+    venv_dir = pathlib.Path(".venv")
+    if not key or not venv_dir.is_dir():
+        return
+    entry = cache_dir / key
+    if (entry / "golden.json").exists():
+        return
+
+    project_root = pathlib.Path.cwd().resolve()
+    tmp_entry = cache_dir / f".{key}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(venv_dir, tmp_entry / ".venv", symlinks=True)
+        meta = {"project_root": str(project_root), "project_name": project_root.name}
+        (tmp_entry / "golden.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp_entry, entry)
+        print(f"Stored golden environment {key} in {entry}")
+    except OSError as exc:
+        print(f"Could not store golden environment: {exc}")
+    finally:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+
 def main():
     env_path = pathlib.Path(".venv")
     if not env_path.exists():
+        config_path = write_setup_config()
+        restored = restore_golden_env(config_path)
         if install_uv():
             try:
-                create_with_uv()
+                create_with_uv(config_path)
+                if not restored:
+                    store_golden_env(config_path)
                 return
             except (subprocess.CalledProcessError, FileNotFoundError):
                 pass
-        create_with_pip()
+        if restored:
+            # Build the pip fallback from scratch, not on top of a half-set-up, hardlinked golden copy
+            shutil.rmtree(env_path, ignore_errors=True)
+        create_with_pip(config_path)
         return
 
 
@@ -0,0 +1,235 @@
+import argparse
+import fnmatch
+import hashlib
+import json
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import time
+
+from .data_manifest import hash_file
+from .ignore_patterns import ALWAYS_PRUNE, matcher, walk
+from .project_config import find_project_root, write_text_atomic
+
+MANIFEST_DIR = ".cache/backup_manifest"
+FULL_VERIFY_DAYS = 7
+
+
+def rclone_exe(root):
+    """Prefer the project-local rclone installed by install_rclone("./bin")."""
+    for name in ("rclone", "rclone.exe"):
+        local = root / "bin" / name
+        if local.exists():
+            return str(local)
+    exe = shutil.which("rclone")
+    if not exe:
+        raise FileNotFoundError("rclone not found in ./bin or on PATH.")
+    return exe
+
+
+def manifest_path(root, source, dest):
+    key = hashlib.sha1(f"{source}->{dest}".encode("utf-8")).hexdigest()[:16]
+    return root / MANIFEST_DIR / f"{key}.json"
+
+
+def load_manifest(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}, "last_full_verify": 0}
+
+
+def scan_local(root, source):
+    """Return {path relative to source: (size, mtime_ns)}, honoring [tool.rcloneignore]."""
+    src = root / source
+    prefix = src.relative_to(root).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+    found = {}
+    for rel, entry in walk(src, root=root, ignore="rcloneignore"):
+        if entry.is_file(follow_symlinks=False):
+            st = entry.stat(follow_symlinks=False)
+            found[rel[len(prefix) :]] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+def diff_manifest(root, source, manifest):
+    """
+    Compare the local tree with the last successfully pushed state.
+
+    Files whose size/mtime changed are re-hashed, so a touched-but-identical file
+    is not reported as modified.
+
+    Returns
+    -------
+        tuple: (added, modified, deleted, new_files) where new_files is the updated manifest table.
+    """
+    recorded = manifest.get("files", {})
+    local = scan_local(root, source)
+    added, modified, new_files = [], [], {}
+    for rel, (size, mtime) in local.items():
+        old = recorded.get(rel)
+        if old and old[0] == size and old[1] == mtime:
+            new_files[rel] = old
+            continue
+        digest = hash_file(root / source / rel)
+        new_files[rel] = [size, mtime, digest]
+        if not old:
+            added.append(rel)
+        elif old[2] != digest:
+            modified.append(rel)
+    deleted = sorted(set(recorded) - set(local))
+    return sorted(added), sorted(modified), deleted, new_files
+
+
+def _run_rclone(root, args, flags=()):
+    cmd = [rclone_exe(root), *args, *flags]
+    print(" ".join(cmd))
+    return subprocess.run(cmd).returncode == 0
+
+
+def _files_from(paths):
+    tmp = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+    tmp.write("\n".join(paths) + "\n")
+    tmp.close()
+    return tmp.name
+
+
+def _rebase(pattern, prefix_parts):
+    """Re-anchor a project-relative pattern below the source folder; None if it cannot match there."""
+    parts = pattern.split("/")
+    for i, seg in enumerate(prefix_parts):
+        if i == len(parts):
+            return "/**"  # the pattern covers the source folder itself
+        if parts[i] == "**":
+            return "/".join(parts[i:])
+        if not fnmatch.fnmatchcase(seg, parts[i]):
+            return None
+    return "/" + "/".join(parts[len(prefix_parts) :]) if len(parts) > len(prefix_parts) else "/**"
+
+
+def filter_rules(root, source):
+    """
+    Translate [tool.rcloneignore] into rclone filter rules relative to `source`.
+
+    gitignore lets the last matching pattern win while rclone stops at the first,
+    so the rules are emitted in reverse order.
+    """
+    prefix = pathlib.Path(source).as_posix().strip("/")
+    prefix_parts = [] if prefix in ("", ".") else prefix.split("/")
+    groups = []
+    for pattern in matcher("rcloneignore", root).patterns:
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        sign = "+" if pattern.startswith("!") else "-"
+        pattern = pattern.lstrip("!")
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/").replace("{", r"\{").replace("[!", "[^")
+        if "/" in pattern:
+            pattern = _rebase(pattern.lstrip("/"), prefix_parts)
+            if pattern is None:
+                continue
+        targets = [f"{pattern}/**"] if dir_only else [pattern, f"{pattern}/**"]
+        groups.append([f"{sign} {target}" for target in targets])
+    rules = [rule for group in reversed(groups) for rule in group]
+    if not prefix_parts:
+        rules += [f"- /{name}/**" for name in sorted(ALWAYS_PRUNE)]
+    return rules
+
+
+def push(source, dest, root=None, full_verify=False, verify_days=FULL_VERIFY_DAYS, dry_run=False, flags=()):
+    """
+    Push `source` (relative to the project root) to the rclone destination `dest`.
+
+    The remote is only touched for paths that changed since the last successful
+    push; a full `rclone sync` + `rclone check` runs when `full_verify` is set or
+    the last full verification is older than `verify_days`.
+
+    Returns
+    -------
+        dict: {"ok": bool, "files": int, "bytes": int, "seconds": float} for the files sent.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    mpath = manifest_path(root, source, dest)
+    manifest = load_manifest(mpath)
+    added, modified, deleted, new_files = diff_manifest(root, source, manifest)
+    src = str(root / source)
+
+    changed = added + modified
+    due = time.time() - manifest.get("last_full_verify", 0) > verify_days * 86400
+    start = time.perf_counter()
+    print(f"{len(added)} added, {len(modified)} modified, {len(deleted)} deleted.")
+    if full_verify or due:
+        # rclone sync only transfers what differs, so report the manifest diff, not every file
+        print("Running full sync and verification against the remote.")
+        ok = True
+        if not dry_run:
+            # The same [tool.rcloneignore] patterns the incremental scan honors
+            listing = _files_from(filter_rules(root, source))
+            filters = ["--filter-from", listing]
+            ok = _run_rclone(root, ["sync", src, dest, *filters], flags) and _run_rclone(
+                root, ["check", src, dest, "--one-way", *filters], flags
+            )
+            pathlib.Path(listing).unlink()
+        if ok and not dry_run:
+            manifest = {"files": new_files, "last_full_verify": time.time()}
+            write_text_atomic(mpath, json.dumps(manifest))
+        return _report(ok, changed, new_files, start)
+
+    if dry_run or not (changed or deleted):
+        if not dry_run and new_files != manifest.get("files"):
+            manifest["files"] = new_files  # only mtimes moved
+            write_text_atomic(mpath, json.dumps(manifest))
+        return _report(True, [], new_files, start)
+
+    ok = True
+    if changed:
+        listing = _files_from(changed)
+        ok = _run_rclone(root, ["copy", src, dest, "--files-from", listing, "--no-traverse"], flags)
+        pathlib.Path(listing).unlink()
+    if ok and deleted:
+        listing = _files_from(deleted)
+        ok = _run_rclone(root, ["delete", dest, "--files-from", listing], flags)
+        pathlib.Path(listing).unlink()
+    if ok:
+        manifest["files"] = new_files
+        write_text_atomic(mpath, json.dumps(manifest))
+    return _report(ok, changed, new_files, start)
+
+
+def _report(ok, sent, files, start):
+    seconds = time.perf_counter() - start
+    n_bytes = sum(files[rel][0] for rel in sent)
+    if sent and seconds > 0:
+        print(
+            f"Sent {len(sent)} files ({n_bytes / 1024**2:.1f} MB) in {seconds:.1f}s: "
+            f"{n_bytes / 1024**2 / seconds:.1f} MB/s, {len(sent) / seconds:.1f} files/s"
+        )
+    return {"ok": ok, "files": len(sent), "bytes": n_bytes, "seconds": seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manifest-based incremental rclone backup.")
+    parser.add_argument("command", choices=["diff", "push"], help="Show local diff or push changes")
+    parser.add_argument("dest", help="rclone destination, e.g. 'erda:project/data' or a local path")
+    parser.add_argument("--source", default="data", help="Folder to back up (default: data)")
+    parser.add_argument("--full-verify", action="store_true", help="Force a full sync and check")
+    parser.add_argument("--verify-days", type=int, default=FULL_VERIFY_DAYS, help="Days between full verifies")
+    args = parser.parse_args(argv)
+
+    if args.command == "push":
+        report = push(args.source, args.dest, full_verify=args.full_verify, verify_days=args.verify_days)
+        raise SystemExit(0 if report["ok"] else 1)
+
+    root = find_project_root()
+    manifest = load_manifest(manifest_path(root, args.source, args.dest))
+    added, modified, deleted, _ = diff_manifest(root, args.source, manifest)
+    for label, paths in (("+", added), ("~", modified), ("-", deleted)):
+        for rel in paths:
+            print(f"{label} {rel}")
+    print(f"{len(added)} added, {len(modified)} modified, {len(deleted)} deleted.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .backup_manifest import push, rclone_exe
+from .ignore_patterns import walk
+from .project_config import find_project_root
+
+PROFILES = ("auto", "small-files", "large-files")
+SAMPLE_LIMIT = 20_000
+SMALL_FILE_MEDIAN = 1024 * 1024
+
+# Log as JSON and emit only the final transfer stats, so they can be parsed from stderr
+STATS_FLAGS = ("--use-json-log", "--stats-log-level", "NOTICE", "--stats", "24h")
+
+# Upload chunk-size flags of chunked backends, per profile
+CHUNK_FLAGS = {
+    "dropbox": ("--dropbox-chunk-size", {"small-files": "16M", "large-files": "128M"}),
+    "onedrive": ("--onedrive-chunk-size", {"small-files": "10M", "large-files": "120M"}),
+    "drive": ("--drive-chunk-size", {"small-files": "16M", "large-files": "128M"}),
+    "s3": ("--s3-chunk-size", {"small-files": "16M", "large-files": "64M"}),
+}
+
+
+def scan_stats(root, source):
+    """Quick scan of `source`: file count, total bytes and median size (sampled)."""
+    sizes = []
+    count = total = 0
+    for _, entry in walk(root / source, root=root, ignore="rcloneignore"):
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        size = entry.stat(follow_symlinks=False).st_size
+        count += 1
+        total += size
+        if len(sizes) < SAMPLE_LIMIT:
+            sizes.append(size)
+    median = statistics.median(sizes) if sizes else 0
+    return {"files": count, "bytes": total, "median": median}
+
+
+def remote_type(root, dest):
+    """Return the rclone backend type of `dest` ('local' for plain paths)."""
+    name = dest.split(":", 1)[0] if ":" in dest and not os.path.isabs(dest) else ""
+    if not name or len(name) == 1:  # plain path or Windows drive letter
+        return "local"
+    result = subprocess.run(
+        [rclone_exe(root), "listremotes", "--long"], capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        remote, _, kind = line.partition(":")
+        if remote.strip() == name:
+            return kind.strip()
+    return ""
+
+
+def profile_flags(profile, stats, backend=""):
+    """
+    Derive rclone concurrency and buffer flags for a throughput profile.
+
+    "small-files" favors many parallel transfers/checkers, "large-files" favors
+    fewer transfers with multi-threaded streams and large chunks. "auto" picks
+    one from the median file size.
+    """
+    if profile == "auto":
+        profile = "small-files" if stats["median"] < SMALL_FILE_MEDIAN else "large-files"
+    cpus = os.cpu_count() or 4
+    if profile == "small-files":
+        flags = [
+            "--transfers", str(min(64, cpus * 8)),
+            "--checkers", str(min(128, cpus * 16)),
+            "--buffer-size", "1M",
+        ]
+    else:
+        flags = [
+            "--transfers", str(min(8, max(2, cpus // 2))),
+            "--checkers", str(min(16, cpus * 2)),
+            "--buffer-size", "64M",
+            "--multi-thread-streams", str(min(16, cpus)),
+            "--multi-thread-cutoff", "64M",
+        ]
+    if backend in CHUNK_FLAGS:
+        flag, sizes = CHUNK_FLAGS[backend]
+        flags += [flag, sizes[profile]]
+    return profile, flags
+
+
+def parse_stats(log):
+    """
+    Read the bytes and files rclone actually transferred from its JSON log
+    (the last entry carrying a `stats` block).
+
+    Returns
+    -------
+        dict: {"bytes": int, "files": int}
+    """
+    stats = {"bytes": 0, "files": 0}
+    for line in log.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("stats"), dict):
+            stats = {"bytes": entry["stats"].get("bytes", 0), "files": entry["stats"].get("transfers", 0)}
+    return stats
+
+
+def run_copy(root, src, dest, flags):
+    """Run `rclone copy` and return (ok, seconds, {"bytes", "files"} transferred)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [rclone_exe(root), "copy", src, dest, *flags, *STATS_FLAGS], stderr=subprocess.PIPE, text=True
+    )
+    seconds = time.perf_counter() - start
+    for line in proc.stderr.splitlines():
+        if '"stats"' not in line:
+            print(line, file=sys.stderr)
+    return proc.returncode == 0, seconds, parse_stats(proc.stderr)
+
+
+def report(label, files, n_bytes, seconds):
+    mb_s = n_bytes / 1024**2 / seconds if seconds else 0
+    files_s = files / seconds if seconds else 0
+    print(f"{label}: {files} files, {n_bytes / 1024**2:.1f} MB in {seconds:.1f}s ({mb_s:.1f} MB/s, {files_s:.1f} files/s)")
+    return {"profile": label, "mb_per_s": mb_s, "files_per_s": files_s, "seconds": seconds}
+
+
+def transfer(command, dest, source="data", profile="auto", root=None, other=None):
+    """
+    Run push/pull/transfer with flags derived from the chosen throughput profile.
+
+    push uses the manifest-based incremental push; pull copies `dest` into
+    `source`; transfer copies `dest` to the remote `other`.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    stats = scan_stats(root, source)
+    backend = remote_type(root, other if command == "transfer" else dest)
+    chosen, flags = profile_flags(profile, stats, backend)
+    print(f"Profile '{chosen}' for {stats['files']} files (median {stats['median'] / 1024:.0f} KB): {' '.join(flags)}")
+
+    if command == "push":
+        result = push(source, dest, root=root, flags=flags)
+        report(chosen, result["files"], result["bytes"], result["seconds"])
+        return result["ok"]
+    src, target = (dest, str(root / source)) if command == "pull" else (dest, other)
+    ok, seconds, sent = run_copy(root, src, target, flags)
+    report(chosen, sent["files"], sent["bytes"], seconds)
+    return ok
+
+
+def benchmark(source="data", root=None, dest=None):
+    """Copy `source` to a fresh local-path remote once per profile and compare throughput."""
+    root = pathlib.Path(root or find_project_root()).resolve()
+    stats = scan_stats(root, source)
+    results = []
+    for profile in ("small-files", "large-files"):
+        with tempfile.TemporaryDirectory(dir=dest) as target:
+            _, flags = profile_flags(profile, stats, "local")
+            ok, seconds, sent = run_copy(root, str(root / source), target, flags)
+            if ok:
+                results.append(report(profile, sent["files"], sent["bytes"], seconds))
+    auto, _ = profile_flags("auto", stats)
+    print(f"'auto' selects '{auto}' for this tree.")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="rclone backups with throughput tuning profiles.")
+    parser.add_argument("command", choices=["push", "pull", "transfer", "bench"])
+    parser.add_argument("dest", nargs="?", default=None, help="rclone remote path (source remote for transfer)")
+    parser.add_argument("other", nargs="?", default=None, help="Target remote for transfer")
+    parser.add_argument("--source", default="data", help="Local folder (default: data)")
+    parser.add_argument("--profile", choices=PROFILES, default="auto")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        benchmark(args.source, dest=args.dest)
+        return
+    if not args.dest or (args.command == "transfer" and not args.other):
+        parser.error("missing remote path")
+    ok = transfer(args.command, args.dest, args.source, args.profile, other=args.other)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
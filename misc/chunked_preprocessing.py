@@ -0,0 +1,208 @@
+import argparse
+import importlib
+import os
+import pathlib
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CHUNK_ROWS = 100_000
+TAB_SUFFIXES = (".tsv", ".tab")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / 1024**2
+    except (ImportError, AttributeError):
+        return None
+
+
+def read_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, **read_kwargs):
+    """Yield DataFrames of at most `chunk_rows` rows from a CSV/TSV/Parquet file."""
+    import pandas as pd
+
+    path = pathlib.Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    sep = "\t" if path.suffix.lower() in TAB_SUFFIXES else ","
+    with pd.read_csv(path, sep=sep, chunksize=chunk_rows, **read_kwargs) as reader:
+        yield from reader
+
+
+def default_clean(chunk):
+    """Strip column names and drop rows that are entirely empty."""
+    chunk.columns = [str(c).strip() for c in chunk.columns]
+    return chunk.dropna(how="all")
+
+
+def _to_schema(chunk, schema, number):
+    """
+    Convert a chunk to the Parquet schema pinned from the first chunk, column by column,
+    so a type that drifts between chunks names the offending column.
+    """
+    import pyarrow as pa
+
+    if list(chunk.columns) != schema.names:
+        raise ValueError(f"Chunk {number} has columns {list(chunk.columns)}, expected {schema.names}.")
+    arrays = []
+    for field in schema:
+        try:
+            arrays.append(pa.array(chunk[field.name], type=field.type, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(
+                f"Chunk {number}: column '{field.name}' ({chunk[field.name].dtype}) does not fit the type "
+                f"{field.type} inferred from the first chunk; set its type with --dtype {field.name}=<type>. ({e})"
+            ) from e
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ChunkWriter:
+    """
+    Append chunks to a CSV or Parquet file without holding earlier chunks in memory.
+    The output is written to a temporary file and only published by `close()`.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self.rows = 0
+        self.chunks = 0
+        self._parquet = None
+
+    def write(self, chunk):
+        self.chunks += 1
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.tmp, table.schema)
+            else:
+                table = _to_schema(chunk, self._parquet.schema, self.chunks)
+            self._parquet.write_table(table)
+        else:
+            chunk.to_csv(self.tmp, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self.tmp.exists():
+            os.replace(self.tmp, self.path)
+
+    def abort(self):
+        """Discard the partial output, leaving any previous `path` in place."""
+        if self._parquet is not None:
+            self._parquet.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def process_chunked(src, dest, steps=(default_clean,), chunk_rows=DEFAULT_CHUNK_ROWS, trace=False, dtype=None):
+    """
+    Stream `src` through `steps` chunk by chunk and append the results to `dest`.
+
+    read -> step 1 -> step 2 -> ... -> append: only one chunk is alive at a time,
+    so peak memory depends on `chunk_rows`, not on the size of the input.
+
+    Args:
+        steps (list[callable]): Functions taking and returning a DataFrame chunk.
+        chunk_rows (int): Rows per chunk.
+        trace (bool): Also measure the Python-heap high-water mark with tracemalloc (slower).
+        dtype (dict): Column dtypes for reading CSV/TSV input, e.g. {"zip": "string"}, so
+            every chunk gets the same types instead of per-chunk inference.
+
+    Returns
+    -------
+        dict: {"rows_in", "rows_out", "chunks", "seconds", "peak_rss_mb", "peak_heap_mb"}
+    """
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    writer = ChunkWriter(dest)
+    rows_in = chunks = 0
+    empty = None
+    read_kwargs = {"dtype": dtype} if dtype and pathlib.Path(src).suffix != ".parquet" else {}
+    try:
+        for chunk in read_chunks(src, chunk_rows, **read_kwargs):
+            rows_in += len(chunk)
+            chunks += 1
+            for step in steps:
+                chunk = step(chunk)
+            if len(chunk):
+                writer.write(chunk)
+            elif empty is None:
+                empty = chunk.iloc[:0]
+        if not writer.rows and empty is not None:
+            # Every row was filtered out: publish the header rather than leave an older `dest` in place
+            print(f"No rows left after the steps; writing {dest} with the header only.")
+            writer.write(empty)
+    except BaseException:
+        writer.abort()
+        if trace:
+            tracemalloc.stop()
+        raise
+    writer.close()
+    report = {
+        "rows_in": rows_in,
+        "rows_out": writer.rows,
+        "chunks": chunks,
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_heap_mb": tracemalloc.get_traced_memory()[1] / 1024**2 if trace else None,
+    }
+    if trace:
+        tracemalloc.stop()
+
+    line = f"{rows_in} rows in {chunks} chunks -> {writer.rows} rows in {report['seconds']:.1f}s"
+    if report["peak_rss_mb"] is not None:
+        line += f"; peak RSS {report['peak_rss_mb']:.0f} MB"
+    if report["peak_heap_mb"] is not None:
+        line += f", peak Python heap {report['peak_heap_mb']:.0f} MB"
+    print(line)
+    return report
+
+
+def load_step(spec):
+    """Resolve 'module:function' (e.g. 's04_preprocessing:clean') to a callable."""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core, chunked preprocessing (read -> steps -> append).")
+    parser.add_argument("src", help="Input CSV/TSV/Parquet file (e.g. data/raw/big.csv)")
+    parser.add_argument("dest", help="Output CSV/Parquet file (e.g. data/interim/big.parquet)")
+    parser.add_argument("--step", action="append", default=None, help="module:function applied to each chunk (repeatable)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per chunk")
+    parser.add_argument("--trace", action="store_true", help="Report the Python heap high-water mark")
+    parser.add_argument(
+        "--dtype", action="append", default=[], metavar="NAME=TYPE", help="Column dtype for CSV input, e.g. zip=string"
+    )
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.join(os.getcwd(), "src"))
+    steps = [load_step(s) for s in args.step] if args.step else [default_clean]
+    dtype = dict(item.split("=", 1) for item in args.dtype)
+    process_chunked(args.src, args.dest, steps, args.chunk_rows, args.trace, dtype or None)
+
+
+if __name__ == "__main__":
+    main()
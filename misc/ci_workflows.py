@@ -0,0 +1,212 @@
+import argparse
+import json
+import pathlib
+
+import yaml
+
+from .project_config import find_project_root, tool_section, write_text_atomic
+from .run_tests import shard_tests
+
+WORKFLOW_FILES = {
+    "GitHub": ".github/workflows/ci.yml",
+    "GitLab": ".gitlab-ci.yml",
+    # Codeberg runs Forgejo Actions, which accept the GitHub workflow syntax
+    "Codeberg": ".forgejo/workflows/ci.yml",
+}
+TEST_SUFFIXES = {"Python": (".py",), "R": (".R", ".r")}
+DEFAULT_PYTHON = "3.12"
+
+
+def project_settings(root):
+    """Language, environment manager, Python version and code host from `[tool.cookiecutter]`."""
+    section = tool_section("cookiecutter", root)
+    python = section.get("PYTHON_VERSION", "None")
+    return {
+        "language": section.get("PROGRAMMING_LANGUAGE", "Python"),
+        "env_manager": section.get("PYTHON_ENV_MANAGER", "Venv"),
+        "python": python if python not in ("", "None") else DEFAULT_PYTHON,
+        "host": section.get("CODE_REPO", "None"),
+    }
+
+
+def test_files(root, language):
+    suffixes = TEST_SUFFIXES.get(language, ())
+    tests = root / "tests"
+    if not tests.is_dir():
+        return []
+    return sorted(p.relative_to(root).as_posix() for p in tests.glob("test_s0*") if p.suffix in suffixes)
+
+
+def cache_spec(root, settings):
+    """
+    The dependency cache for the project environment.
+
+    Returns
+    -------
+        dict: {"lockfile", "path", "setup": [shell lines], "run": shell prefix for tests}
+    """
+    language, manager = settings["language"], settings["env_manager"]
+    if language == "R":
+        return {
+            "lockfile": "renv.lock",
+            "path": "~/.cache/R/renv",
+            "setup": ["Rscript -e 'install.packages(\"renv\"); renv::restore()'"],
+            "run": None,
+        }
+    if manager.lower() == "conda":
+        return {
+            "lockfile": "environment.yml",
+            "path": "~/conda_pkgs_dir",
+            # environment.yml is exported from the project env, which rarely lists pytest
+            "setup": ["conda env update --name base --file environment.yml", "conda install --name base --yes pytest"],
+            "run": "python -m pytest",
+        }
+    if (root / "uv.lock").exists():
+        return {
+            "lockfile": "uv.lock",
+            "path": "~/.cache/uv",
+            "setup": ["pip install uv", "uv sync --frozen"],
+            "run": "uv run --with pytest python -m pytest",
+        }
+    return {
+        "lockfile": "requirements.txt",
+        "path": "~/.cache/uv",
+        "setup": ["pip install uv", "uv pip install --system -r requirements.txt pytest"],
+        "run": "python -m pytest",
+    }
+
+
+def _test_command(spec, files_var):
+    if spec["run"]:
+        return f"{spec['run']} {files_var}"
+    return f'for f in {files_var}; do Rscript -e "testthat::test_file(\'$f\', stop_on_failure = TRUE)" || exit 1; done'
+
+
+def github_workflow(settings, spec, shards):
+    steps = [{"uses": "actions/checkout@v4"}]
+    if settings["language"] == "R":
+        steps.append({"uses": "r-lib/actions/setup-r@v2"})
+    elif settings["env_manager"].lower() == "conda":
+        steps.append({
+            "uses": "conda-incubator/setup-miniconda@v3",
+            "with": {"python-version": settings["python"], "pkgs-dirs": spec["path"], "auto-activate-base": True},
+        })
+    else:
+        steps.append({"uses": "actions/setup-python@v5", "with": {"python-version": settings["python"]}})
+    key = f"deps-${{{{ runner.os }}}}-${{{{ hashFiles('{spec['lockfile']}') }}}}"
+    steps.append({
+        "name": "Cache dependencies",
+        "uses": "actions/cache@v4",
+        "with": {"path": spec["path"], "key": key, "restore-keys": "deps-${{ runner.os }}-"},
+    })
+    steps.append({"name": "Install dependencies", "run": " && ".join(spec["setup"])})
+    steps.append({"name": "Run tests (shard ${{ matrix.shard }})", "run": _test_command(spec, "${{ matrix.files }}")})
+
+    job = {
+        "runs-on": "ubuntu-latest",
+        "strategy": {
+            "fail-fast": False,
+            "matrix": {"include": [{"shard": i + 1, "files": " ".join(g)} for i, g in enumerate(shards)]},
+        },
+        "steps": steps,
+    }
+    if settings["env_manager"].lower() == "conda" and settings["language"] != "R":
+        job["defaults"] = {"run": {"shell": "bash -el {0}"}}
+    return {"name": "CI", "on": {"push": None, "pull_request": None}, "jobs": {"tests": job}}
+
+
+def gitlab_pipeline(settings, spec, shards):
+    if settings["language"] == "R":
+        image = "rocker/r-ver:latest"
+    elif settings["env_manager"].lower() == "conda":
+        image = "condaforge/miniforge3:latest"
+    else:
+        image = f"python:{settings['python']}"
+    # GitLab can only cache paths inside the project folder
+    cache_dir = ".ci-cache"
+    variables = {"UV_CACHE_DIR": cache_dir, "CONDA_PKGS_DIRS": f"$CI_PROJECT_DIR/{cache_dir}", "RENV_PATHS_CACHE": cache_dir}
+    return {
+        "stages": ["test"],
+        "tests": {
+            "stage": "test",
+            "image": image,
+            "variables": variables,
+            "cache": {"key": {"files": [spec["lockfile"]]}, "paths": [cache_dir]},
+            "parallel": {"matrix": [{"TEST_FILES": " ".join(g)} for g in shards]},
+            "before_script": spec["setup"],
+            "script": [_test_command(spec, "$TEST_FILES")],
+        },
+    }
+
+
+def render_workflow(root=None, host=None, shards=4):
+    """
+    Render the CI configuration for the project's code host.
+
+    Returns
+    -------
+        tuple: (relative output path, YAML text)
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    settings = project_settings(root)
+    host = host or settings["host"]
+    if host not in WORKFLOW_FILES:
+        raise ValueError(f"No CI workflow for code host '{host}'.")
+    if settings["language"] not in TEST_SUFFIXES:
+        raise ValueError(f"CI workflows are generated for Python and R projects, not '{settings['language']}'.")
+    files = test_files(root, settings["language"])
+    groups = shard_tests(root, files, shards) if files else [["tests"]]
+    spec = cache_spec(root, settings)
+    if host == "GitLab":
+        data = gitlab_pipeline(settings, spec, groups)
+    else:
+        data = github_workflow(settings, spec, groups)
+    text = yaml.safe_dump(data, sort_keys=False, width=120)
+    return WORKFLOW_FILES[host], text
+
+
+def validate(text, schema_path):
+    """
+    Check rendered YAML against a CI JSON schema (e.g. the SchemaStore github-workflow.json
+    or gitlab-ci.json). Requires the optional `jsonschema` package.
+
+    Returns
+    -------
+        list[str]: Validation errors (empty if valid).
+    """
+    try:
+        import jsonschema
+    except ImportError:
+        raise ImportError("Schema validation requires 'jsonschema' (pip install jsonschema).")
+    schema = json.loads(pathlib.Path(schema_path).read_text(encoding="utf-8"))
+    data = yaml.safe_load(text)
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    return [f"{'/'.join(map(str, e.absolute_path))}: {e.message}" for e in validator.iter_errors(data)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render CI workflows with dependency caching and test sharding.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--host", choices=list(WORKFLOW_FILES), default=None, help="Default: CODE_REPO")
+    parser.add_argument("--shards", type=int, default=4, help="Parallel test jobs")
+    parser.add_argument("--schema", default=None, help="JSON schema file to validate the rendered YAML against")
+    parser.add_argument("--write", action="store_true", help="Write the workflow file instead of printing it")
+    args = parser.parse_args(argv)
+
+    rel, text = render_workflow(args.root, args.host, args.shards)
+    if args.schema:
+        errors = validate(text, args.schema)
+        for error in errors:
+            print(f"Schema error: {error}")
+        if errors:
+            raise SystemExit(1)
+    if args.write:
+        root = pathlib.Path(args.root or find_project_root())
+        write_text_atomic(root / rel, text)
+        print(f"Wrote {rel}")
+    else:
+        print(text, end="")
+
+
+if __name__ == "__main__":
+    main()
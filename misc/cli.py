@@ -0,0 +1,51 @@
+import importlib
+import sys
+
+# name -> (module, summary). Modules are imported only when their command runs.
+COMMANDS = {
+    "manifest": ("data_manifest", "Build a content-hash manifest of the data/ tree"),
+    "tree": ("project_tree", "Render the bounded project tree into README.md"),
+    "dmp": ("dmp_inventory", "Incrementally sync dmp.json datasets with data/"),
+    "package": ("dcas_package", "Build a deterministic DCAS replication package"),
+    "publish": ("deposit_upload", "Upload files to a Zenodo or Dataverse deposit"),
+    "backup": ("backup_manifest", "Manifest-based incremental rclone backup"),
+    "backup-profile": ("backup_profiles", "rclone push/pull/transfer with throughput profiles"),
+    "imports": ("import_scanner", "Scan project code for imported packages"),
+    "env-export": ("env_export", "Export requirements.txt/environment.yml in-process"),
+    "deps": ("deps_fingerprint", "Regenerate dependency files when their inputs changed"),
+    "deps-prune": ("deps_prune", "Find and prune packages the project code does not use"),
+    "large-files": ("large_files", "Flag or route oversized files before committing/pushing"),
+    "data-push": ("vc_data_push", "Parallel, batched DataLad/DVC save and push of the data tree"),
+    "ci": ("ci_workflows", "Render CI workflows with dependency caching and test sharding"),
+    "tests": ("run_tests", "Run the tests/ suite in parallel shards with per-test timing"),
+    "lint": ("lint_cache", "Incremental, cached linting of src/ and tests/"),
+    "columnar": ("columnar", "Columnar (Parquet/Arrow) ingestion of data/raw and load benchmark"),
+    "chunked": ("chunked_preprocessing", "Out-of-core, chunked preprocessing with a memory report"),
+    "sweep": ("param_sweep", "Parameter sweeps in a local process pool or as SLURM array jobs"),
+    "notebook": ("run_notebook", "Headless, parallel notebook runs with parameter injection and cell timing"),
+}
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: python -m misc.cli <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Dispatch to a subcommand, importing only that command's module."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"Unknown command '{name}'.\n\n{usage()}", file=sys.stderr)
+        return 2
+    module = importlib.import_module(f".{COMMANDS[name][0]}", __package__)
+    return module.main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
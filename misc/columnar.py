@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import pathlib
+import random
+import re
+import shutil
+import tempfile
+import time
+
+from .project_config import find_project_root, write_text_atomic
+
+RAW_DIR = "data/raw"
+INTERIM_DIR = "data/interim"
+STATE_FILE = ".cache/columnar_ingest.json"
+FORMATS = ("parquet", "arrow")
+DELIMITERS = {".csv": ",", ".tsv": "\t", ".txt": ","}
+CONVERSION_ERROR = re.compile(r"CSV column #(\d+)")
+
+
+def _pyarrow():
+    """Import pyarrow on first use, so the CLI starts without it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Columnar mode requires 'pyarrow' (pip install pyarrow).")
+    return pa, pa_csv, ds
+
+
+def _csv_reader(path, block_size, column_types=None):
+    """
+    Streaming CSV reader: batches of `block_size` bytes, so memory stays bounded.
+    Column types are inferred from the first block unless given in `column_types`.
+    """
+    pa, pa_csv, _ = _pyarrow()
+    parse = pa_csv.ParseOptions(delimiter=DELIMITERS.get(path.suffix.lower(), ","))
+    read = pa_csv.ReadOptions(block_size=block_size)
+    types = {name: pa.type_for_alias(t) if isinstance(t, str) else t for name, t in (column_types or {}).items()}
+    convert = pa_csv.ConvertOptions(column_types=types)
+    return pa_csv.open_csv(path, read_options=read, parse_options=parse, convert_options=convert)
+
+
+def ingest_file(src, dest, fmt="parquet", partition_by=None, block_size=64 * 1024**2, column_types=None):
+    """
+    Convert one delimited text file into a (optionally hive-partitioned) columnar dataset folder.
+
+    Types are inferred from the first block of the file. A column holding values
+    that do not fit its inferred type further down (e.g. "abc" in a numeric
+    column) is re-read as string; pass `column_types` ({column: "int64", ...})
+    to fix types up front. Nothing is published unless the whole file converts.
+
+    Returns
+    -------
+        int: Number of rows written.
+    """
+    pa, _, ds = _pyarrow()
+    column_types = dict(column_types or {})
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    while True:
+        reader = _csv_reader(src, block_size, column_types)
+        rows = 0
+
+        def batches(reader=reader):
+            nonlocal rows
+            for batch in reader:
+                rows += batch.num_rows
+                yield batch
+
+        try:
+            ds.write_dataset(
+                batches(),
+                tmp,
+                schema=reader.schema,
+                format="ipc" if fmt == "arrow" else "parquet",
+                partitioning=partition_by or None,
+                partitioning_flavor="hive" if partition_by else None,
+                existing_data_behavior="delete_matching",
+                max_rows_per_group=1024 * 1024,
+            )
+            break
+        except pa.ArrowInvalid as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            match = CONVERSION_ERROR.search(str(e))
+            name = reader.schema.names[int(match.group(1))] if match else None
+            if name is None or name in column_types:
+                raise
+            print(f"{src.name}: column '{name}' does not fit its inferred type; reading it as string ({e})")
+            column_types[name] = "string"
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+    if dest.exists():
+        shutil.rmtree(dest)
+    os.replace(tmp, dest)
+    return rows
+
+
+def ingest(root=None, fmt="parquet", partition_by=None, force=False, column_types=None):
+    """
+    Ingest data/raw/**/*.csv|tsv once into data/interim/<name>/ as Parquet or Arrow IPC.
+
+    Files whose size and mtime match the last ingest are skipped. Later stages read
+    the result lazily with `open_dataset` / `load`. `column_types` ({column: type alias})
+    overrides type inference in every file that has those columns.
+
+    Returns
+    -------
+        list[str]: Datasets (re)written.
+    """
+    _pyarrow()
+    root = pathlib.Path(root or find_project_root()).resolve()
+    raw, interim = root / RAW_DIR, root / INTERIM_DIR
+    state_path = root / STATE_FILE
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+
+    written = []
+    for src in sorted(raw.rglob("*")):
+        if src.suffix.lower() not in DELIMITERS or not src.is_file():
+            continue
+        rel = src.relative_to(raw).as_posix()
+        st = src.stat()
+        signature = [st.st_size, st.st_mtime_ns, fmt, partition_by or [], column_types or {}]
+        dest = interim / pathlib.PurePath(rel).with_suffix("")
+        if not force and state.get(rel) == signature and dest.exists():
+            continue
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        rows = ingest_file(src, dest, fmt, partition_by, column_types=column_types)
+        print(f"{rel} -> {dest.relative_to(root).as_posix()} ({rows} rows, {time.perf_counter() - start:.1f}s)")
+        state[rel] = signature
+        written.append(dest.relative_to(root).as_posix())
+    write_text_atomic(state_path, json.dumps(state, indent=2))
+    if not written:
+        print("Columnar datasets are up to date.")
+    return written
+
+
+def open_dataset(name, root=None):
+    """
+    Lazily open an ingested dataset (no data is read until scanned).
+
+    Use `dataset.to_table(columns=[...], filter=ds.field("year") == 2020)` for column
+    projection and predicate/partition pruning. Files are memory-mapped, so Arrow IPC
+    datasets are read without copying.
+    """
+    _, _, ds = _pyarrow()
+    from pyarrow import fs
+
+    root = pathlib.Path(root or find_project_root()).resolve()
+    path = root / INTERIM_DIR / name
+    fmt = "ipc" if any(path.rglob("*.arrow")) else "parquet"
+    return ds.dataset(path, format=fmt, partitioning="hive", filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def load(name, columns=None, filter=None, root=None):
+    """Read selected columns (and rows) of an ingested dataset into a pyarrow Table."""
+    return open_dataset(name, root).to_table(columns=columns, filter=filter)
+
+
+def _timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(rows=2_000_000, columns=10, repeat=3, workdir=None):
+    """
+    Compare load times of the same generated table stored as CSV, Parquet and
+    Arrow IPC, reading all columns and a two-column projection.
+
+    Returns
+    -------
+        dict: {label: seconds}
+    """
+    pa, pa_csv, _ = _pyarrow()
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    rng = random.Random(0)
+    data = {f"c{i}": [rng.random() for _ in range(rows)] for i in range(columns - 1)}
+    data["group"] = [f"g{i % 16}" for i in range(rows)]
+    table = pa.table(data)
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        tmp = pathlib.Path(tmp)
+        pa_csv.write_csv(table, tmp / "data.csv")
+        pq.write_table(table, tmp / "data.parquet")
+        feather.write_feather(table, tmp / "data.arrow", compression="uncompressed")
+        sizes = {p.suffix: p.stat().st_size for p in tmp.iterdir()}
+        projection = ["c0", "group"]
+
+        results = {
+            "csv (all columns)": _timed(lambda: pa_csv.read_csv(tmp / "data.csv"), repeat),
+            "csv (2 columns)": _timed(
+                lambda: pa_csv.read_csv(tmp / "data.csv", convert_options=pa_csv.ConvertOptions(include_columns=projection)),
+                repeat,
+            ),
+            "parquet (all columns)": _timed(lambda: pq.read_table(tmp / "data.parquet"), repeat),
+            "parquet (2 columns)": _timed(lambda: pq.read_table(tmp / "data.parquet", columns=projection), repeat),
+            "arrow mmap (all columns)": _timed(lambda: feather.read_table(tmp / "data.arrow", memory_map=True), repeat),
+            "arrow mmap (2 columns)": _timed(
+                lambda: feather.read_table(tmp / "data.arrow", columns=projection, memory_map=True), repeat
+            ),
+        }
+
+    print(f"{rows} rows x {columns} columns; file sizes: "
+          + ", ".join(f"{suffix[1:]} {size / 1024**2:.1f} MB" for suffix, size in sorted(sizes.items())))
+    baseline = results["csv (all columns)"]
+    for label, seconds in results.items():
+        print(f"  {label:<26} {seconds * 1000:9.1f} ms  ({baseline / seconds:6.1f}x vs csv)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar (Parquet/Arrow) ingestion of data/raw.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="Convert data/raw CSV/TSV files into data/interim")
+    p_ingest.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    p_ingest.add_argument("--format", choices=FORMATS, default="parquet")
+    p_ingest.add_argument("--partition-by", nargs="*", default=None, help="Hive-partition by these columns")
+    p_ingest.add_argument("--force", action="store_true", help="Re-ingest unchanged files")
+    p_ingest.add_argument(
+        "--column-type", action="append", default=[], metavar="NAME=TYPE", help="Column type override, e.g. zip=string"
+    )
+    p_bench = sub.add_parser("bench", help="CSV vs Parquet vs Arrow load times on generated data")
+    p_bench.add_argument("--rows", type=int, default=2_000_000)
+    p_bench.add_argument("--columns", type=int, default=10)
+    p_bench.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        column_types = dict(item.split("=", 1) for item in args.column_type)
+        ingest(args.root, args.format, args.partition_by, args.force, column_types)
+    else:
+        benchmark(args.rows, args.columns, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .ignore_patterns import walk
+from .project_config import find_project_root, tool_patterns, write_text_atomic
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+MANIFEST_FILE = "data_manifest.json"
+CACHE_FILE = ".cache/data_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+SKIP_FILES = {".gitkeep"}
+
+
+def hash_algorithm():
+    return "xxh3_128" if xxhash is not None else "blake2b"
+
+
+def hash_file(path, algorithm=None):
+    """Hash a file in 1 MB chunks (never loads the whole file)."""
+    algorithm = algorithm or hash_algorithm()
+    h = xxhash.xxh3_128() if algorithm == "xxh3_128" else hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dataset_roots(root):
+    """
+    Resolve the `[tool.datasets]` patterns to existing dataset folders.
+
+    Wildcard patterns only match folders, so loose files such as data/README.md
+    are not datasets; a pattern naming a file exactly still selects it.
+    """
+    patterns = tool_patterns("datasets", root) or ["data/*"]
+    found = set()
+    for pattern in patterns:
+        wildcard = any(ch in pattern for ch in "*?[")
+        for path in root.glob(pattern):
+            if path.name not in SKIP_FILES and (path.is_dir() or not wildcard):
+                found.add(path)
+    return sorted(found)
+
+
+def load_cache(cache_path):
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def build_manifest(root=None, workers=None, write=True):
+    """
+    Build a content-hash manifest of the dataset folders under data/.
+
+    Files whose (inode, size, mtime) match the persistent cache are not re-read;
+    the remaining files are hashed in parallel.
+
+    Args:
+        root (str | Path): Project root. Defaults to the folder holding pyproject.toml.
+        workers (int): Number of hashing threads. Defaults to min(32, 2 * CPUs).
+        write (bool): Write `data_manifest.json` and update the cache.
+
+    Returns
+    -------
+        dict: The manifest with per-dataset totals and per-file size/digest.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    algorithm = hash_algorithm()
+    cache_path = root / CACHE_FILE
+    cache = load_cache(cache_path)
+    if cache.get("algorithm") != algorithm:
+        cache = {"algorithm": algorithm, "files": {}}
+    cached = cache["files"]
+
+    entries = {}
+    for dataset in dataset_roots(root):
+        name = dataset.relative_to(root).as_posix()
+        if dataset.is_file():
+            entries[name] = (name, dataset.stat())
+            continue
+        for rel, entry in walk(dataset, root=root):
+            if entry.name not in SKIP_FILES and entry.is_file(follow_symlinks=False):
+                entries[rel] = (name, entry.stat(follow_symlinks=False))
+
+    digests = {}
+    todo = []
+    for rel, (_, st) in entries.items():
+        hit = cached.get(rel)
+        if hit and hit[:3] == [st.st_ino, st.st_size, st.st_mtime_ns]:
+            digests[rel] = hit[3]
+        else:
+            todo.append(rel)
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rel, digest in zip(todo, pool.map(lambda r: hash_file(root / r, algorithm), todo)):
+            digests[rel] = digest
+
+    manifest = {
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "algorithm": algorithm,
+        "datasets": {},
+        "files": {},
+    }
+    dataset_hashes = {}
+    for rel in sorted(entries):
+        dataset, st = entries[rel]
+        manifest["files"][rel] = {"size": st.st_size, "digest": digests[rel]}
+        info = manifest["datasets"].setdefault(dataset, {"file_count": 0, "byte_size": 0})
+        info["file_count"] += 1
+        info["byte_size"] += st.st_size
+        # Dataset-level fixity digest over the sorted (path, digest) pairs
+        h = dataset_hashes.setdefault(dataset, hashlib.blake2b(digest_size=20))
+        h.update(f"{rel}\0{digests[rel]}\n".encode("utf-8"))
+
+    for dataset, h in dataset_hashes.items():
+        manifest["datasets"][dataset]["digest"] = h.hexdigest()
+
+    if write:
+        write_text_atomic(root / MANIFEST_FILE, json.dumps(manifest, indent=2))
+        cache["files"] = {
+            rel: [st.st_ino, st.st_size, st.st_mtime_ns, digests[rel]]
+            for rel, (_, st) in entries.items()
+        }
+        write_text_atomic(cache_path, json.dumps(cache))
+
+    print(
+        f"Manifest: {len(entries)} files in {len(manifest['datasets'])} datasets "
+        f"({len(todo)} hashed, {len(entries) - len(todo)} from cache)"
+    )
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a content-hash manifest of the data/ tree.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of hashing threads")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write manifest or cache")
+    args = parser.parse_args(argv)
+    build_manifest(args.root, workers=args.workers, write=not args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import gzip
+import os
+import pathlib
+import shutil
+import subprocess
+import tarfile
+
+from .ignore_patterns import walk
+from .project_config import find_project_root, tool_patterns
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Fixed timestamp for all archive entries (1980-01-01), overridable via SOURCE_DATE_EPOCH
+DEFAULT_EPOCH = 315532800
+
+
+def collect_files(root, with_data=False):
+    """
+    Return the sorted relative paths of all files in the replication package:
+    the `[tool.dcas]` patterns plus, optionally, the `[tool.datasets]` folders.
+    """
+    patterns = tool_patterns("dcas", root)
+    if with_data:
+        patterns += tool_patterns("datasets", root) or ["data/*"]
+    files = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_file():
+                files.add(path.relative_to(root).as_posix())
+            elif path.is_dir():
+                files.update(
+                    rel
+                    for rel, entry in walk(path, root=root, ignore="rcloneignore")
+                    if entry.is_file(follow_symlinks=False)
+                )
+    return sorted(files)
+
+
+def _process_closer(proc, label, raw=None):
+    """Close the pipe into a compressor process and raise if the process failed."""
+
+    def close():
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = proc.wait()
+        if raw is not None:
+            raw.close()
+        if returncode != 0:
+            raise RuntimeError(f"{label} failed with exit code {returncode}.")
+
+    return close
+
+
+def _compressor(out_path, threads):
+    """
+    Open a write stream for the archive.
+
+    Returns
+    -------
+        tuple: (stream, closer, label) — write the tar to `stream`, then call `closer()`.
+    """
+    name = out_path.name
+    if name.endswith(".zst"):
+        if zstandard is not None:
+            raw = open(out_path, "wb")
+            cctx = zstandard.ZstdCompressor(level=3, threads=threads)
+            stream = cctx.stream_writer(raw)
+            return stream, lambda: (stream.close(), raw.close()), f"zstandard ({threads} threads)"
+        if shutil.which("zstd"):
+            proc = subprocess.Popen(
+                ["zstd", "-q", "-f", f"-T{threads}", "-o", str(out_path)], stdin=subprocess.PIPE
+            )
+            label = f"zstd -T{threads}"
+            return proc.stdin, _process_closer(proc, label), label
+        raise RuntimeError("zstd output requested but neither 'zstandard' nor the zstd CLI is available.")
+
+    if shutil.which("pigz"):
+        raw = open(out_path, "wb")
+        proc = subprocess.Popen(["pigz", "-n", "-p", str(threads)], stdin=subprocess.PIPE, stdout=raw)
+        label = f"pigz -p {threads}"
+        return proc.stdin, _process_closer(proc, label, raw), label
+    raw = open(out_path, "wb")
+    stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+    return stream, lambda: (stream.close(), raw.close()), "gzip"
+
+
+def _tarinfo(root, rel, epoch):
+    st = (root / rel).stat()
+    info = tarfile.TarInfo(rel)
+    info.size = st.st_size
+    info.mtime = epoch
+    info.mode = 0o755 if st.st_mode & 0o111 else 0o644
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def build_package(root=None, output=None, with_data=False, threads=None):
+    """
+    Stream the replication package into a deterministic tar archive.
+
+    Entries are sorted with fixed timestamps and ownership, so identical inputs
+    give byte-identical archives. Files are streamed from disk in chunks and
+    compressed with multi-threaded zstd (`.tar.zst`) or pigz/gzip (`.tar.gz`).
+
+    Returns
+    -------
+        pathlib.Path: The archive path.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    out_path = pathlib.Path(output or root / "replication_package.tar.gz").resolve()
+    threads = threads or os.cpu_count() or 1
+    epoch = int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_EPOCH))
+
+    files = [f for f in collect_files(root, with_data) if (root / f).resolve() != out_path]
+    stream, closer, label = _compressor(out_path, threads)
+    total = 0
+    try:
+        try:
+            with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                for rel in files:
+                    info = _tarinfo(root, rel, epoch)
+                    with open(root / rel, "rb") as f:
+                        tar.addfile(info, f)
+                    total += info.size
+        finally:
+            closer()
+    except BaseException:
+        # Never leave a truncated archive behind that looks like a finished package
+        out_path.unlink(missing_ok=True)
+        raise
+
+    print(f"Packaged {len(files)} files ({total / 1024**2:.1f} MB) into {out_path} using {label}")
+    return out_path
+
+
+def stage_package(root=None, dest="replication_package", with_data=False):
+    """
+    Lay the replication package out as a folder, hard-linking files instead of copying
+    them (falls back to copying across filesystems).
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    dest = pathlib.Path(dest)
+    dest = dest if dest.is_absolute() else root / dest
+    linked = copied = 0
+    for rel in collect_files(root, with_data):
+        target = dest / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(root / rel, target)
+            linked += 1
+        except OSError:
+            shutil.copy2(root / rel, target)
+            copied += 1
+    print(f"Staged {linked + copied} files in {dest} ({linked} hard-linked, {copied} copied)")
+    return dest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a deterministic DCAS replication package.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--output", default=None, help="Archive path (.tar.gz or .tar.zst)")
+    parser.add_argument("--with-data", action="store_true", help="Include the [tool.datasets] folders")
+    parser.add_argument("--threads", type=int, default=None, help="Compression threads")
+    parser.add_argument("--stage", default=None, help="Stage as a hard-linked folder instead")
+    args = parser.parse_args(argv)
+    if args.stage:
+        stage_package(args.root, args.stage, args.with_data)
+    else:
+        build_package(args.root, args.output, args.with_data, args.threads)
+
+
+if __name__ == "__main__":
+    main()
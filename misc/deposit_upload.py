@@ -0,0 +1,308 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import pathlib
+import threading
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .ignore_patterns import walk
+from .project_config import find_project_root, write_text_atomic
+
+STATE_FILE = ".cache/deposit_upload.jsonl"
+ZENODO_SANDBOX_API = "https://sandbox.zenodo.org/api"
+CHUNK_SIZE = 1024 * 1024
+
+
+def md5_file(path):
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class MultipartFile:
+    """
+    A multipart/form-data body holding one file field, read from disk in chunks
+    as it is sent. Used when requests-toolbelt is not installed.
+    """
+
+    def __init__(self, field, name, path, content_type="application/octet-stream"):
+        boundary = uuid.uuid4().hex
+        filename = name.replace('"', "%22")
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        self._length = len(head) + os.path.getsize(path) + len(tail)
+        self._parts = [io.BytesIO(head), open(path, "rb"), io.BytesIO(tail)]
+
+    def __len__(self):
+        # requests sends a Content-Length header instead of chunked encoding
+        return self._length
+
+    def read(self, size=-1):
+        out = b""
+        while self._parts and (size < 0 or len(out) < size):
+            chunk = self._parts[0].read(-1 if size < 0 else size - len(out))
+            if not chunk:
+                self._parts.pop(0).close()
+                continue
+            out += chunk
+        return out
+
+    def close(self):
+        for part in self._parts:
+            part.close()
+        self._parts = []
+
+
+def load_state(state_path):
+    """
+    Replay the append-only upload log into {target key: {relative path: record}}.
+    Later lines win; a torn last line from an interrupted run is ignored.
+    """
+    state = {}
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                target = state.setdefault(record.pop("target"), {})
+                target[record.pop("path")] = record
+    except OSError:
+        pass
+    return state
+
+
+def compact_state(state_path, state):
+    """Rewrite the log with one line per file, dropping superseded records."""
+    lines = [
+        json.dumps({"target": key, "path": rel, **record})
+        for key, files in state.items()
+        for rel, record in sorted(files.items())
+    ]
+    write_text_atomic(state_path, "".join(line + "\n" for line in lines))
+
+
+def make_session(kind, token, workers):
+    """A pooled HTTP session shared by all upload threads."""
+    # Imported on first use: requests is slow to import and `publish --help` does not need it
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=3)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if token and kind == "dataverse":
+        session.headers["X-Dataverse-key"] = token
+    elif token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
+def zenodo_target(session, api, deposition_id):
+    """
+    Resolve a Zenodo (sandbox) deposition.
+
+    Returns
+    -------
+        tuple: (upload(name, path) -> remote md5, {remote filename: md5})
+    """
+    r = session.get(f"{api.rstrip('/')}/deposit/depositions/{deposition_id}", timeout=60)
+    r.raise_for_status()
+    deposition = r.json()
+    bucket = deposition["links"]["bucket"]
+    remote = {f["filename"]: f.get("checksum", "").split(":")[-1] for f in deposition.get("files", [])}
+
+    def upload(name, path):
+        # requests streams file objects from disk; set the length so empty files are not sent chunked
+        headers = {"Content-Length": str(os.path.getsize(path)), "Content-Type": "application/octet-stream"}
+        with open(path, "rb") as f:
+            resp = session.put(f"{bucket}/{urllib.parse.quote(name)}", data=f, headers=headers, timeout=None)
+        resp.raise_for_status()
+        return resp.json().get("checksum", "").split(":")[-1]
+
+    return upload, remote
+
+
+def dataverse_target(session, base_url, persistent_id):
+    """
+    Resolve a Dataverse dataset by persistent identifier (e.g. doi:10.5072/FK2/ABC).
+
+    Returns
+    -------
+        tuple: (upload(name, path) -> remote md5, {remote filename: md5})
+    """
+    base = base_url.rstrip("/")
+    params = {"persistentId": persistent_id}
+    r = session.get(f"{base}/api/datasets/:persistentId/", params=params, timeout=60)
+    r.raise_for_status()
+    remote = {}
+    for item in r.json()["data"]["latestVersion"].get("files", []):
+        data_file = item.get("dataFile", {})
+        checksum = data_file.get("checksum", {})
+        md5 = data_file.get("md5") or (checksum.get("value") if checksum.get("type") == "MD5" else "")
+        remote[data_file.get("filename")] = md5
+
+    try:
+        from requests_toolbelt import MultipartEncoder
+    except ImportError:
+        MultipartEncoder = None
+
+    def upload(name, path):
+        url = f"{base}/api/datasets/:persistentId/add"
+
+        def post(body):
+            headers = {"Content-Type": body.content_type}
+            return session.post(url, params=params, data=body, headers=headers, timeout=None)
+
+        if MultipartEncoder is not None:
+            with open(path, "rb") as f:
+                resp = post(MultipartEncoder(fields={"file": (name, f, "application/octet-stream")}))
+        else:
+            body = MultipartFile("file", name, path)
+            try:
+                resp = post(body)
+            finally:
+                body.close()
+        resp.raise_for_status()
+        files = resp.json().get("data", {}).get("files", [])
+        return files[0].get("dataFile", {}).get("md5", "") if files else ""
+
+    return upload, remote
+
+
+def collect_files(root, paths):
+    files = []
+    for p in paths:
+        path = (root / p).resolve()
+        if path.is_file():
+            files.append(path.relative_to(root).as_posix())
+        elif path.is_dir():
+            files += [rel for rel, e in walk(path, root=root) if e.is_file(follow_symlinks=False)]
+    return sorted(set(files))
+
+
+def publish_files(paths, target, root=None, workers=4, flat=False):
+    """
+    Upload files concurrently to a deposit, resuming interrupted publishes.
+
+    Per-file progress is appended to `.cache/deposit_upload.jsonl` (one line per
+    finished file, compacted at the end of the run); files already uploaded
+    unchanged, or whose md5 already matches the remote file, are skipped.
+
+    Args:
+        paths (list): Files/folders relative to the project root.
+        target (dict): {"kind": "zenodo"|"dataverse", "url": ..., "id": ..., "token": ...}
+        workers (int): Number of concurrent uploads.
+        flat (bool): Upload under the file name only instead of the relative path.
+
+    Returns
+    -------
+        dict: {"uploaded": [...], "skipped": [...], "failed": {path: error}}
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    session = make_session(target["kind"], target.get("token"), workers)
+    if target["kind"] == "zenodo":
+        upload, remote = zenodo_target(session, target.get("url") or ZENODO_SANDBOX_API, target["id"])
+    else:
+        upload, remote = dataverse_target(session, target["url"], target["id"])
+
+    state_path = root / STATE_FILE
+    state = load_state(state_path)
+    key = f"{target['kind']}:{target.get('url', '')}:{target['id']}"
+    done = state.setdefault(key, {})
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    log = open(state_path, "a", encoding="utf-8")
+    lock = threading.Lock()
+    report = {"uploaded": [], "skipped": [], "failed": {}}
+
+    # A Zenodo bucket PUT replaces a file of the same name; Dataverse /add would keep both under a new name
+    replaces = target["kind"] == "zenodo"
+
+    def remote_name(rel):
+        return pathlib.PurePosixPath(rel).name if flat else rel.replace("/", "__")
+
+    def task(rel):
+        path = root / rel
+        st = path.stat()
+        sig = [st.st_size, st.st_mtime_ns]
+        record = done.get(rel, {})
+        if record.get("sig") == sig and record.get("status") == "done":
+            return rel, "skipped"
+        md5 = record["md5"] if record.get("sig") == sig and record.get("md5") else md5_file(path)
+        name = remote_name(rel)
+        if remote.get(name) == md5:
+            status = "skipped"
+        elif name in remote and not replaces:
+            raise IOError(
+                f"the deposit already holds a different '{name}' (md5 {remote[name] or 'unknown'}); "
+                "delete or replace it there first"
+            )
+        else:
+            remote_md5 = upload(name, path)
+            if remote_md5 and remote_md5 != md5:
+                raise IOError(f"checksum mismatch after upload ({remote_md5} != {md5})")
+            status = "uploaded"
+        record = {"sig": sig, "md5": md5, "status": "done"}
+        with lock:
+            done[rel] = record
+            log.write(json.dumps({"target": key, "path": rel, **record}) + "\n")
+            log.flush()
+        return rel, status
+
+    files = collect_files(root, paths)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(task, rel): rel for rel in files}
+            for future in as_completed(futures):
+                rel = futures[future]
+                try:
+                    _, status = future.result()
+                    report[status].append(rel)
+                    print(f"[{status}] {rel}")
+                except Exception as e:
+                    report["failed"][rel] = str(e)
+                    print(f"[failed] {rel}: {e}")
+    finally:
+        log.close()
+    compact_state(state_path, state)
+
+    print(
+        f"Uploaded {len(report['uploaded'])}, skipped {len(report['skipped'])}, "
+        f"failed {len(report['failed'])} of {len(files)} files."
+    )
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upload files to a Zenodo or Dataverse deposit.")
+    parser.add_argument("kind", choices=["zenodo", "dataverse"], help="Deposit service")
+    parser.add_argument("id", help="Zenodo deposition id or Dataverse persistent id")
+    parser.add_argument("paths", nargs="+", help="Files or folders to upload")
+    parser.add_argument("--url", default=None, help="API/base URL (default: Zenodo sandbox)")
+    parser.add_argument("--token", default=None, help="API token (default: ZENODO_TOKEN/DATAVERSE_TOKEN)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent uploads")
+    parser.add_argument("--flat", action="store_true", help="Upload under the bare file name")
+    args = parser.parse_args(argv)
+
+    if args.kind == "dataverse" and not args.url:
+        parser.error("--url is required for Dataverse")
+    token = args.token or os.environ.get("ZENODO_TOKEN" if args.kind == "zenodo" else "DATAVERSE_TOKEN")
+    target = {"kind": args.kind, "url": args.url, "id": args.id, "token": token}
+    report = publish_files(args.paths, target, workers=args.workers, flat=args.flat)
+    raise SystemExit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
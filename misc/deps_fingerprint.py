@@ -0,0 +1,76 @@
+import argparse
+import hashlib
+import json
+import pathlib
+
+from .env_export import export_env_files, snapshot
+from .import_scanner import dependencies_text, scan_imports
+from .project_config import find_project_root, tool_section, write_text_atomic
+
+FINGERPRINT_FILE = ".deps_fingerprint.json"
+LOCKFILES = ("uv.lock", "renv.lock")
+OUTPUTS = ("requirements.txt", "environment.yml", "dependencies.txt")
+
+
+def compute_fingerprint(root, found=None):
+    """
+    Hash everything the generated dependency files are derived from: the lockfiles,
+    the installed environment, the imports scanned from the code and the
+    `[tool.platform_rules]` markers.
+    """
+    h = hashlib.sha256()
+    for name in LOCKFILES:
+        path = root / name
+        h.update(name.encode("utf-8"))
+        h.update(path.read_bytes() if path.exists() else b"-")
+    snap = snapshot(root)
+    packages = sorted(f"{p['name']}=={p['version']}" for p in snap["pip"].values())
+    packages += sorted(f"conda:{r['name']}={r['version']}" for r in snap["conda"])
+    h.update("\n".join(packages).encode("utf-8"))
+    found = scan_imports(root) if found is None else found
+    h.update(json.dumps(found, sort_keys=True).encode("utf-8"))
+    h.update(json.dumps(tool_section("platform_rules", root), sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def regenerate(root=None, force=False):
+    """
+    Regenerate requirements.txt, environment.yml and dependencies.txt unless the
+    stored fingerprint shows that none of their inputs changed.
+
+    Returns
+    -------
+        bool: True if the files were regenerated.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    found = scan_imports(root)
+    fingerprint = compute_fingerprint(root, found)
+    fp_path = root / FINGERPRINT_FILE
+    try:
+        stored = json.loads(fp_path.read_text(encoding="utf-8")).get("fingerprint")
+    except (OSError, ValueError):
+        stored = None
+
+    if not force and stored == fingerprint and all((root / f).exists() for f in OUTPUTS):
+        print("Dependencies unchanged; skipping regeneration (use --force to override).")
+        return False
+
+    export_env_files(root)
+    deps_path = root / "dependencies.txt"
+    text = dependencies_text(found, root)
+    if not deps_path.exists() or deps_path.read_text(encoding="utf-8") != text:
+        write_text_atomic(deps_path, text)
+    write_text_atomic(fp_path, json.dumps({"fingerprint": fingerprint, "outputs": list(OUTPUTS)}, indent=2))
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate dependency files only when their inputs changed.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the fingerprint matches")
+    args = parser.parse_args(argv)
+    regenerate(args.root, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import argparse
+import importlib.metadata
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+
+from .env_export import normalize_name
+from .import_scanner import distribution_index, scan_imports
+from .project_config import find_project_root, load_pyproject, tool_section, write_text_atomic
+
+# Packaging tools and setup requirements that are never pruned
+ALWAYS_KEEP = {"pip", "setuptools", "wheel", "uv", "python-dotenv", "pathspec", "pyyaml", "toml", "tomli-w"}
+
+REQ_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def _requirement_names(dist):
+    """Names of a distribution's unconditional requirements (extras are skipped)."""
+    names = []
+    for req in importlib.metadata.requires(dist) or []:
+        name, _, marker = req.partition(";")
+        if "extra" in marker:
+            continue
+        if marker.strip():
+            try:
+                from packaging.markers import Marker
+
+                if not Marker(marker).evaluate():
+                    continue
+            except Exception:
+                pass
+        match = REQ_NAME.match(name)
+        if match:
+            names.append(normalize_name(match.group(1)))
+    return names
+
+
+def installed():
+    found = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            found[normalize_name(name)] = dist
+    return found
+
+
+def dependency_closure(roots, dists):
+    """All distributions reachable from `roots` through their requirements."""
+    seen = set()
+    stack = [r for r in roots if r in dists]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        stack.extend(n for n in _requirement_names(dists[name].metadata["Name"]) if n in dists and n not in seen)
+    return seen
+
+
+def install_size(dist):
+    total = 0
+    for f in dist.files or []:
+        try:
+            total += dist.locate_file(f).stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def find_unused(root=None, keep=()):
+    """
+    Return {name: bytes} for installed distributions that no scanned code imports,
+    directly or transitively, and that are not declared in pyproject.toml or kept
+    via `keep`, `[tool.deps_prune] keep` or ALWAYS_KEEP.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    dists = installed()
+    index = distribution_index()
+    keep = [*keep, *tool_section("deps_prune", root).get("keep", [])]
+    roots = ALWAYS_KEEP | {normalize_name(k) for k in keep}
+    roots |= {n for n in dists if n.startswith("repokit")}
+    for name in scan_imports(root).get("python", []):
+        roots.update(normalize_name(d) for d in index.get(name, []))
+    for req in load_pyproject(root).get("project", {}).get("dependencies", []):
+        match = REQ_NAME.match(req)
+        if match:
+            roots.add(normalize_name(match.group(1)))
+    used = dependency_closure(roots, dists)
+    return {name: install_size(dist) for name, dist in sorted(dists.items()) if name not in used}
+
+
+def _filter_lines(path, unused, pattern):
+    if not path.exists():
+        return False
+    lines = path.read_text(encoding="utf-8").splitlines()
+    kept = []
+    for line in lines:
+        match = pattern.match(line)
+        if match and normalize_name(match.group(1)) in unused:
+            continue
+        kept.append(line)
+    if kept == lines:
+        return False
+    write_text_atomic(path, "\n".join(kept) + "\n")
+    return True
+
+
+def prune(root=None, keep=(), write=False, uninstall=False, dry_run=True):
+    """
+    Report, exclude and optionally uninstall distributions the project does not use.
+
+    Args:
+        keep (list): Extra distributions to keep.
+        write (bool): Drop unused packages from requirements.txt and environment.yml.
+        uninstall (bool): Uninstall unused packages from the current environment.
+        dry_run (bool): With `uninstall`, only print the uninstall command.
+
+    Returns
+    -------
+        dict: {name: installed bytes} of the unused distributions.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    unused = find_unused(root, keep)
+    for name, size in unused.items():
+        print(f"  {name:<40} {size / 1024**2:8.1f} MB")
+    print(f"{len(unused)} unused packages, {sum(unused.values()) / 1024**2:.1f} MB of installed files.")
+
+    if write and unused:
+        for name, pattern in (
+            ("requirements.txt", REQ_NAME),
+            ("environment.yml", re.compile(r"^\s*-\s+([A-Za-z0-9][A-Za-z0-9._-]*)\s*[=<>]")),
+        ):
+            if _filter_lines(root / name, unused, pattern):
+                print(f"Removed unused packages from {name}")
+
+    if uninstall and unused:
+        if shutil.which("uv"):
+            cmd = ["uv", "pip", "uninstall", "--python", sys.executable, *unused]
+        else:
+            cmd = [sys.executable, "-m", "pip", "uninstall", "-y", *unused]
+        if dry_run:
+            print(f"Dry run; re-run with --yes to execute: {' '.join(cmd)}")
+        else:
+            subprocess.run(cmd, check=False)
+    return unused
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find and prune packages the project code does not use.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--keep", nargs="*", default=[], help="Extra packages to keep")
+    parser.add_argument("--write", action="store_true", help="Drop unused packages from requirements.txt/environment.yml")
+    parser.add_argument("--uninstall", action="store_true", help="Show the command uninstalling unused packages")
+    parser.add_argument("--yes", action="store_true", help="With --uninstall, actually uninstall")
+    args = parser.parse_args(argv)
+    prune(args.root, args.keep, args.write, args.uninstall, dry_run=not args.yes)
+
+
+if __name__ == "__main__":
+    main()
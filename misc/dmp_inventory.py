@@ -0,0 +1,197 @@
+import argparse
+import json
+import mimetypes
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .data_manifest import SKIP_FILES, dataset_roots
+from .ignore_patterns import matcher, walk
+from .project_config import find_project_root
+
+DMP_FILE = "dmp.json"
+
+# Keys the RDA-DMP 1.2 schema requires on dataset/distribution objects (not a full schema check)
+DATASET_REQUIRED = ("dataset_id", "personal_data", "sensitive_data", "title")
+DISTRIBUTION_REQUIRED = ("data_access", "title")
+
+
+def file_format(path):
+    mime, _ = mimetypes.guess_type(path)
+    if mime:
+        return mime
+    suffix = pathlib.Path(path).suffix.lstrip(".").lower()
+    return suffix or "application/octet-stream"
+
+
+def scan_dataset(root, dataset):
+    """Return {relative file path: (byte_size, format)} for one dataset folder."""
+    if dataset.is_file():
+        rel = dataset.relative_to(root).as_posix()
+        return {rel: (dataset.stat().st_size, file_format(rel))}
+    found = {}
+    for rel, entry in walk(dataset, root=root):
+        if entry.name in SKIP_FILES or not entry.is_file(follow_symlinks=False):
+            continue
+        found[rel] = (entry.stat(follow_symlinks=False).st_size, file_format(entry.name))
+    return found
+
+
+def scan_inventory(root, workers=None):
+    """Scan all dataset folders in parallel. Returns {dataset: {file: (byte_size, format)}}."""
+    roots = [d for d in dataset_roots(root) if d.is_dir() or d.is_file()]
+    workers = workers or min(16, len(roots) or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scans = pool.map(lambda d: scan_dataset(root, d), roots)
+        return {d.relative_to(root).as_posix(): files for d, files in zip(roots, scans)}
+
+
+def new_dataset(name, restricted):
+    return {
+        "title": name,
+        "dataset_id": {"identifier": name, "type": "other"},
+        "personal_data": "unknown",
+        "sensitive_data": "yes" if restricted else "unknown",
+        "distribution": [],
+    }
+
+
+def sync_distributions(dataset, files, policy):
+    """Update one dataset's distributions in place. Returns the number of changed entries."""
+    changes = 0
+    kept = []
+    existing = {d.get("title"): d for d in dataset.get("distribution", [])}
+    for title, dist in existing.items():
+        if title not in files:
+            changes += 1  # file removed
+            continue
+        byte_size, fmt = files[title]
+        if dist.get("byte_size") != byte_size:
+            dist["byte_size"] = byte_size
+            changes += 1
+        if not dist.get("format"):
+            dist["format"] = [fmt]
+            changes += 1
+        kept.append(dist)
+    for title in sorted(set(files) - set(existing)):
+        byte_size, fmt = files[title]
+        kept.append(
+            {
+                "title": title,
+                "byte_size": byte_size,
+                "format": [fmt],
+                "data_access": "closed" if policy and policy.match_path(title) else "open",
+            }
+        )
+        changes += 1
+    if changes:
+        dataset["distribution"] = sorted(kept, key=lambda d: d.get("title", ""))
+    return changes
+
+
+def check_required_fields(datasets):
+    """
+    Raise ValueError if a dataset or distribution misses one of the keys in
+    DATASET_REQUIRED/DISTRIBUTION_REQUIRED. This is a minimal sanity check;
+    use `validate_schema` for full RDA-DMP validation.
+    """
+    for ds in datasets:
+        missing = [k for k in DATASET_REQUIRED if k not in ds]
+        for dist in ds.get("distribution", []):
+            missing += [f"distribution.{k}" for k in DISTRIBUTION_REQUIRED if k not in dist]
+        if missing:
+            raise ValueError(f"Dataset '{ds.get('title')}' misses required fields: {missing}")
+
+
+def validate_schema(doc, schema_path):
+    """
+    Validate the whole DMP document against a JSON schema file (e.g. the RDA-DMP 1.2
+    maDMP-schema-1.2.json). Requires the optional `jsonschema` package.
+
+    Returns
+    -------
+        list[str]: One message per schema violation (empty if valid).
+    """
+    try:
+        import jsonschema
+    except ImportError:
+        raise ImportError("Schema validation requires 'jsonschema' (pip install jsonschema).")
+    schema = json.loads(pathlib.Path(schema_path).read_text(encoding="utf-8"))
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    return [f"{'/'.join(map(str, e.absolute_path)) or '<root>'}: {e.message}" for e in validator.iter_errors(doc)]
+
+
+def update_dmp_datasets(root=None, dmp_file=DMP_FILE, workers=None, schema=None):
+    """
+    Bring the dataset/distribution entries of dmp.json in line with the data/ folders.
+
+    Only datasets and distributions whose files were added, removed or changed
+    size are touched; user-edited fields are preserved. Nothing is written when
+    the inventory matches what is recorded. With `schema`, the updated document
+    must validate against that JSON schema file before it is written.
+
+    Returns
+    -------
+        int: Number of changed dataset/distribution entries.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    dmp_path = root / dmp_file
+    doc = json.loads(dmp_path.read_text(encoding="utf-8")) if dmp_path.exists() else {}
+    dmp = doc.setdefault("dmp", {})
+    policy = matcher("data_policy", root)
+    inventory = scan_inventory(root, workers)
+
+    datasets = dmp.get("dataset", [])
+    by_id = {d.get("dataset_id", {}).get("identifier"): d for d in datasets}
+    changes = 0
+    result = []
+    for ds in datasets:
+        ident = ds.get("dataset_id", {}).get("identifier")
+        if ident in inventory:
+            changes += sync_distributions(ds, inventory[ident], policy)
+        elif isinstance(ident, str) and ident.startswith("data/"):
+            changes += 1  # dataset folder no longer exists
+            continue
+        result.append(ds)
+    for name in sorted(set(inventory) - set(by_id)):
+        ds = new_dataset(name, bool(policy and policy.match_path(name, is_dir=True)))
+        sync_distributions(ds, inventory[name], policy)
+        if any(d["data_access"] == "closed" for d in ds["distribution"]):
+            ds["sensitive_data"] = "yes"
+        result.append(ds)
+        changes += 1
+
+    if not changes:
+        print("dmp.json datasets are up to date.")
+        return 0
+
+    check_required_fields(result)
+    dmp["dataset"] = result
+    dmp["modified"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if schema:
+        errors = validate_schema(doc, schema)
+        if errors:
+            raise ValueError(f"{dmp_path.name} does not validate against {schema}:\n  " + "\n  ".join(errors))
+
+    # Stream the JSON to a temporary file, then swap it in atomically
+    tmp = dmp_path.with_name(f".{dmp_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, dmp_path)
+    print(f"Updated {changes} dataset/distribution entries in {dmp_path.name}")
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally sync dmp.json datasets with data/.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--dmp", default=DMP_FILE, help="DMP file relative to the root")
+    parser.add_argument("--workers", type=int, default=None, help="Number of scanning threads")
+    parser.add_argument("--schema", default=None, help="RDA-DMP JSON schema file to validate the result against")
+    args = parser.parse_args(argv)
+    update_dmp_datasets(args.root, args.dmp, args.workers, args.schema)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import importlib.metadata
+import json
+import os
+import pathlib
+import platform
+import re
+import site
+import sys
+import sysconfig
+import urllib.parse
+import urllib.request
+
+from .project_config import find_project_root, write_text_atomic
+
+CACHE_FILE = ".cache/env_snapshot.json"
+SNAPSHOT_VERSION = 2
+
+# Installer tooling; pinning these makes requirements.txt fight the target environment's own pip/uv
+BOOTSTRAP_PACKAGES = {"pip", "setuptools", "wheel", "uv", "distribute"}
+
+
+def normalize_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def site_dirs():
+    paths = {sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]}
+    if site.ENABLE_USER_SITE:
+        paths.add(site.getusersitepackages())
+    return sorted(p for p in paths if os.path.isdir(p))
+
+
+def conda_meta_dir():
+    # The running interpreter's env; CONDA_PREFIX names whichever env the shell activated
+    path = pathlib.Path(sys.prefix) / "conda-meta"
+    return path if path.is_dir() else None
+
+
+def environment_signature():
+    """Directory mtimes of site-packages and conda-meta; they change whenever packages are (un)installed."""
+    dirs = site_dirs()
+    meta = conda_meta_dir()
+    if meta:
+        dirs.append(str(meta))
+    return [sys.executable] + [[d, os.stat(d).st_mtime_ns] for d in dirs]
+
+
+def read_pip_packages():
+    """Installed Python distributions read in-process from importlib.metadata."""
+    packages = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata["Name"]
+        if not name:
+            continue
+        installer = (dist.read_text("INSTALLER") or "").strip()
+        try:
+            # PEP 610: present for editable, local-path, URL and VCS installs
+            direct_url = json.loads(dist.read_text("direct_url.json") or "null")
+        except ValueError:
+            direct_url = None
+        packages[normalize_name(name)] = {
+            "name": name,
+            "version": dist.version,
+            "installer": installer,
+            "direct_url": direct_url,
+        }
+    return packages
+
+
+def read_conda_packages():
+    """Conda package records read directly from conda-meta/*.json."""
+    meta = conda_meta_dir()
+    if not meta:
+        return []
+    records = []
+    for path in sorted(meta.glob("*.json")):
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        channel = record.get("channel", "") or ""
+        channel = channel.rstrip("/").split("/")
+        # ".../conda-forge/linux-64" -> "conda-forge"
+        channel = channel[-2] if len(channel) > 1 and channel[-1] == record.get("subdir") else channel[-1]
+        records.append({"name": record["name"], "version": record["version"], "channel": channel})
+    return records
+
+
+def snapshot(root=None, refresh=False):
+    """
+    Return the installed-package snapshot, re-reading package metadata only when
+    site-packages or conda-meta changed since the cached snapshot was taken.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    cache_path = root / CACHE_FILE
+    signature = environment_signature()
+    if not refresh:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("signature") == signature and cached.get("version") == SNAPSHOT_VERSION:
+                return cached
+        except (OSError, ValueError):
+            pass
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "signature": signature,
+        "python": platform.python_version(),
+        "pip": read_pip_packages(),
+        "conda": read_conda_packages(),
+    }
+    write_text_atomic(cache_path, json.dumps(data))
+    return data
+
+
+def requirement_line(package, root=None):
+    """
+    Render one installed distribution as a requirement. Index installs and local
+    wheel/sdist files (e.g. the setup/ wheels, removed after setup) are pinned
+    (`name==version`); editable installs become `-e <path>` (relative to `root`
+    when inside it) and other direct-URL installs `name @ <url>`.
+    """
+    direct = package.get("direct_url")
+    if not direct or not direct.get("url"):
+        return f"{package['name']}=={package['version']}"
+    url = direct["url"]
+    vcs = direct.get("vcs_info")
+    if vcs:
+        return f"{package['name']} @ {vcs['vcs']}+{url}@{vcs.get('commit_id', '')}".rstrip("@")
+    if direct.get("dir_info", {}).get("editable") and url.startswith("file:"):
+        path = pathlib.Path(urllib.request.url2pathname(urllib.parse.urlparse(url).path))
+        try:
+            return f"-e ./{path.relative_to(root).as_posix()}"
+        except (TypeError, ValueError):
+            return f"-e {path}"
+    if url.startswith("file:") and "archive_info" in direct:
+        return f"{package['name']}=={package['version']}"
+    return f"{package['name']} @ {url}"
+
+
+def _exported(snap):
+    return [p for key, p in snap["pip"].items() if key not in BOOTSTRAP_PACKAGES]
+
+
+def requirements_text(snap, root=None):
+    lines = [requirement_line(p, root) for p in _exported(snap)]
+    return "\n".join(sorted(lines, key=str.lower)) + "\n"
+
+
+def environment_yml_text(snap, name, root=None):
+    conda = snap["conda"]
+    channels = sorted({r["channel"] for r in conda if r["channel"]}) or ["conda-forge"]
+    lines = [f"name: {name}", "channels:"] + [f"  - {c}" for c in channels] + ["dependencies:"]
+    if conda:
+        conda_names = {normalize_name(r["name"]) for r in conda}
+        lines += [f"  - {r['name']}={r['version']}" for r in sorted(conda, key=lambda r: r["name"])]
+        pip_only = [p for p in _exported(snap) if normalize_name(p["name"]) not in conda_names and p["installer"] != "conda"]
+    else:
+        lines.append(f"  - python={snap['python']}")
+        pip_only = _exported(snap)
+    if pip_only:
+        lines += ["  - pip", "  - pip:"]
+        lines += [f"    - {requirement_line(p, root)}" for p in sorted(pip_only, key=lambda p: p["name"].lower())]
+    return "\n".join(lines) + "\n"
+
+
+def _write_if_changed(path, text):
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    write_text_atomic(path, text)
+    return True
+
+
+def export_env_files(root=None, refresh=False):
+    """
+    Write requirements.txt and environment.yml from the in-process snapshot
+    (no `pip freeze` / `conda env export` subprocesses). Files are only
+    rewritten when their content changes.
+
+    Returns
+    -------
+        list[str]: The files that were written.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    snap = snapshot(root, refresh)
+    written = []
+    if _write_if_changed(root / "requirements.txt", requirements_text(snap, root)):
+        written.append("requirements.txt")
+    if _write_if_changed(root / "environment.yml", environment_yml_text(snap, root.name, root)):
+        written.append("environment.yml")
+    print(f"Updated: {', '.join(written)}" if written else "requirements.txt and environment.yml are up to date.")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export requirements.txt/environment.yml in-process.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached snapshot")
+    args = parser.parse_args(argv)
+    export_env_files(args.root, args.refresh)
+
+
+if __name__ == "__main__":
+    main()
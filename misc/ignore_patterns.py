@@ -0,0 +1,192 @@
+import functools
+import hashlib
+import os
+import pathlib
+import re
+
+from .project_config import find_project_root, load_pyproject
+
+SECTIONS = ("rcloneignore", "treeignore", "datasets", "data_policy", "dcas")
+
+# Top-level folders that never hold project files worth walking
+ALWAYS_PRUNE = frozenset({".venv", ".conda", "bin"})
+
+
+def _glob_to_regex(glob):
+    """Translate a gitignore-style glob body (no leading '!' or trailing '/') to a regex."""
+    out = []
+    i = 0
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("/**", i) and i + 3 == len(glob):
+            out.append("(?:/.*)?")
+            i += 3
+            continue
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _pattern_to_regex(pattern):
+    """
+    Compile one pattern with gitignore semantics.
+
+    Returns
+    -------
+        tuple: (regex: str, dir_only: bool, negate: bool), or None for blank/comment lines.
+    """
+    pattern = pattern.strip()
+    if not pattern or pattern.startswith("#"):
+        return None
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    body = _glob_to_regex(pattern.lstrip("/"))
+    regex = f"{body}$" if anchored else f"(?:.*/)?{body}$"
+    return regex, dir_only, negate
+
+
+class PatternSet:
+    """
+    A list of gitignore-style patterns compiled into two combined regexes
+    (one for any entry, one for directory-only patterns), so a path is matched
+    with a single regex call instead of one call per pattern.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        compiled = [c for c in (_pattern_to_regex(p) for p in self.patterns) if c]
+        self.has_negations = any(neg for _, _, neg in compiled)
+        if self.has_negations:
+            # Last matching pattern wins, so keep them ordered
+            self._ordered = [(re.compile(r), d, n) for r, d, n in compiled]
+        any_rx = [r for r, d, n in compiled if not d and not n]
+        dir_rx = [r for r, d, n in compiled if d and not n]
+        self._any = re.compile("|".join(f"(?:{r})" for r in any_rx)) if any_rx else None
+        self._dir = re.compile("|".join(f"(?:{r})" for r in dir_rx)) if dir_rx else None
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def match(self, rel_path, is_dir=False):
+        """Match a single entry (posix path relative to the project root), ignoring its parents."""
+        if self.has_negations:
+            result = False
+            for rx, dir_only, negate in self._ordered:
+                if (is_dir or not dir_only) and rx.match(rel_path):
+                    result = not negate
+            return result
+        if self._any is not None and self._any.match(rel_path):
+            return True
+        return bool(is_dir and self._dir is not None and self._dir.match(rel_path))
+
+    def match_path(self, rel_path, is_dir=False):
+        """Match an entry or any of its parent folders, as git does for ignored directories."""
+        parts = rel_path.strip("/").split("/")
+        for i in range(1, len(parts)):
+            if self.match("/".join(parts[:i]), is_dir=True):
+                return True
+        return self.match(rel_path, is_dir=is_dir)
+
+
+def _pyproject_digest(root):
+    path = pathlib.Path(root) / "pyproject.toml"
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_sections(root, digest):
+    tools = load_pyproject(root).get("tool", {})
+    return {name: PatternSet(tools.get(name, {}).get("patterns", [])) for name in SECTIONS}
+
+
+def load_matchers(root=None):
+    """
+    Compile the pattern lists of all pyproject.toml sections in SECTIONS.
+
+    The compiled matchers are cached per project and reused until pyproject.toml changes.
+    """
+    root = str(pathlib.Path(root or find_project_root()).resolve())
+    return _compile_sections(root, _pyproject_digest(root))
+
+
+def matcher(section, root=None):
+    """Return the compiled PatternSet for `[tool.<section>]`."""
+    return load_matchers(root)[section]
+
+
+def walk(top=None, root=None, ignore=None, prune=ALWAYS_PRUNE, include_dirs=False):
+    """
+    Walk `top` with os.scandir, yielding (rel_path, DirEntry) for every entry not ignored.
+
+    Ignored directories are pruned (never descended into), as are the `prune`
+    folder names at the project root.
+
+    Args:
+        top (str | Path): Folder to walk. Defaults to the project root.
+        root (str | Path): Project root that patterns are relative to.
+        ignore (str | PatternSet | None): Section name (e.g. "rcloneignore") or a PatternSet.
+        prune (set): Top-level folder names that are never walked.
+        include_dirs (bool): Also yield directories (before their contents).
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    top = pathlib.Path(top).resolve() if top else root
+    if isinstance(ignore, str):
+        ignore = matcher(ignore, root)
+
+    start = "" if top == root else top.relative_to(root).as_posix()
+    if start and ignore and ignore.match_path(start, is_dir=top.is_dir()):
+        return
+
+    stack = [(str(top), start)]
+    while stack:
+        path, rel_dir = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_dir and not rel_dir and entry.name in prune:
+                continue
+            if ignore and ignore.match(rel, is_dir=is_dir):
+                continue
+            if is_dir:
+                if include_dirs:
+                    yield rel, entry
+                subdirs.append((entry.path, rel))
+            else:
+                yield rel, entry
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,198 @@
+import argparse
+import ast
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import pathlib
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .ignore_patterns import walk
+from .project_config import find_project_root, tool_section, write_text_atomic
+
+CACHE_FILE = ".cache/import_scan.json"
+SCAN_DIRS = ("src", "tests")
+LANGUAGES = {".py": "python", ".ipynb": "python", ".r": "r", ".rmd": "r", ".do": "stata"}
+
+R_PATTERN = re.compile(
+    r"""(?:library|require|requireNamespace)\(\s*["']?([A-Za-z][\w.]*)["']?|\b([A-Za-z][\w.]*)::"""
+)
+STATA_PATTERN = re.compile(r"^\s*(?:ssc|net)\s+install\s+(\w+)", re.MULTILINE)
+
+# Packages shipped with every R installation; `stats::median` is not a dependency
+R_BASE_PACKAGES = frozenset(
+    {"base", "compiler", "datasets", "grDevices", "graphics", "grid", "methods", "parallel", "splines"}
+    | {"stats", "stats4", "tcltk", "tools", "utils"}
+)
+
+
+def _python_imports(source):
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def parse_file(path):
+    """Return (language, sorted import names) for one source file. Runs in worker processes."""
+    lang = LANGUAGES[pathlib.Path(path).suffix.lower()]
+    text = pathlib.Path(path).read_text(encoding="utf-8", errors="ignore")
+    if path.endswith(".ipynb"):
+        try:
+            cells = json.loads(text).get("cells", [])
+        except ValueError:
+            cells = []
+        code = [c.get("source", "") for c in cells if c.get("cell_type") == "code"]
+        # Drop IPython magics/shell lines so the cells parse as Python
+        text = "\n".join(
+            line
+            for src in code
+            for line in ("".join(src) if isinstance(src, list) else src).splitlines()
+            if not line.lstrip().startswith(("%", "!"))
+        )
+    if lang == "python":
+        names = _python_imports(text)
+    elif lang == "r":
+        names = {a or b for a, b in R_PATTERN.findall(text)}
+    else:
+        names = set(STATA_PATTERN.findall(text))
+    return lang, sorted(names)
+
+
+def source_files(root):
+    found = []
+    for folder in SCAN_DIRS:
+        for rel, entry in walk(root / folder, root=root, ignore="treeignore"):
+            if pathlib.PurePath(rel).suffix.lower() in LANGUAGES and entry.is_file():
+                found.append(rel)
+    return sorted(found)
+
+
+@functools.lru_cache(maxsize=1)
+def distribution_index():
+    """Map top-level import names to installed distributions, built once per process."""
+    index = {}
+    for name, dists in importlib.metadata.packages_distributions().items():
+        index[name] = sorted(set(dists))
+    return index
+
+
+def _digest(path):
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def scan_imports(root=None, workers=None):
+    """
+    Scan src/ and tests/ for imports, library() calls and ssc/net installs.
+
+    Files are parsed in a process pool; results are cached per file content hash
+    in `.cache/import_scan.json`, so unchanged files are never re-parsed.
+
+    Returns
+    -------
+        dict: {language: sorted list of imported names}
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    cache_path = root / CACHE_FILE
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    results, todo, digests = {}, [], {}
+    for rel in source_files(root):
+        digest = _digest(root / rel)
+        digests[rel] = digest
+        hit = cache.get(rel)
+        if hit and hit[0] == digest:
+            results[rel] = (hit[1], hit[2])
+        else:
+            todo.append(rel)
+
+    if len(todo) > 1:
+        workers = workers or min(len(todo), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = pool.map(parse_file, [str(root / rel) for rel in todo], chunksize=16)
+            results.update(zip(todo, parsed))
+    elif todo:
+        results[todo[0]] = parse_file(str(root / todo[0]))
+
+    if todo or set(cache) != set(results):
+        cache = {rel: [digests[rel], lang, names] for rel, (lang, names) in results.items()}
+        write_text_atomic(cache_path, json.dumps(cache))
+
+    local_modules = {pathlib.PurePath(rel).stem for rel in results}
+    by_lang = {}
+    for lang, names in results.values():
+        skip = local_modules | R_BASE_PACKAGES if lang == "r" else local_modules
+        by_lang.setdefault(lang, set()).update(n for n in names if n not in skip)
+    print(f"Scanned {len(results)} files ({len(todo)} parsed, {len(results) - len(todo)} cached)")
+    return {lang: sorted(names) for lang, names in by_lang.items()}
+
+
+def python_requirements(import_names, root=None):
+    """
+    Map Python import names to installed distributions with pinned versions,
+    adding sys_platform markers from `[tool.platform_rules]`.
+
+    Returns
+    -------
+        list[str]: Requirement lines, e.g. ['numpy==1.26.4', 'pywin32==306; sys_platform == "win32"']
+    """
+    rules = {k.lower(): v for k, v in tool_section("platform_rules", root).items() if not k.startswith("tool-")}
+    stdlib = getattr(sys, "stdlib_module_names", set())
+    index = distribution_index()
+    lines = set()
+    for name in import_names:
+        if name in stdlib or name in sys.builtin_module_names:
+            continue
+        for dist in index.get(name, []):
+            try:
+                version = importlib.metadata.version(dist)
+            except importlib.metadata.PackageNotFoundError:
+                continue
+            line = f"{dist}=={version}"
+            platform = rules.get(dist.lower())
+            if platform:
+                line += f'; sys_platform == "{platform}"'
+            lines.add(line)
+    return sorted(lines, key=str.lower)
+
+
+def dependencies_text(found, root=None):
+    """Render scan results in the dependencies.txt format read by install_dependencies.py."""
+    lines = ["Dependencies:", *python_requirements(found.get("python", []), root)]
+    for lang, title in (("r", "R packages:"), ("stata", "Stata packages:")):
+        if found.get(lang):
+            lines += ["", title, *found[lang]]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan project code for imported packages.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes")
+    parser.add_argument("--write", default=None, help="Write a dependencies file (e.g. dependencies.txt)")
+    args = parser.parse_args(argv)
+
+    found = scan_imports(args.root, args.workers)
+    text = dependencies_text(found, args.root)
+    if args.write:
+        root = pathlib.Path(args.root or find_project_root())
+        write_text_atomic(root / args.write, text)
+    else:
+        print(text, end="")
+
+
+if __name__ == "__main__":
+    main()
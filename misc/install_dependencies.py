@@ -3,9 +3,25 @@ import sys
 import re
 import os
 import importlib
+import importlib.metadata
 
 from .common import *
 
+try:
+    from packaging.markers import InvalidMarker, Marker
+except ImportError:
+    Marker = None
+
+def marker_applies(marker):
+    # Evaluate a PEP 508 environment marker such as 'sys_platform == "win32"'
+    if Marker is not None:
+        try:
+            return Marker(marker).evaluate()
+        except InvalidMarker:
+            return True
+    match = re.fullmatch(r'\s*sys_platform\s*==\s*["\']([^"\']+)["\']\s*', marker)
+    return match is None or match.group(1) == sys.platform
+
 def parse_dependencies(file_path="dependencies.txt"):
     required_libraries = []
     try:
@@ -27,8 +43,14 @@ def parse_dependencies(file_path="dependencies.txt"):
                 if line.strip() == '':
                     break
                 
+                # Skip requirements whose environment marker excludes this platform
+                requirement, _, marker = line.partition(';')
+                if marker.strip() and not marker_applies(marker):
+                    print(f"Skipping {requirement.strip()} (not needed on {sys.platform})")
+                    continue
+
                 # Regex to match package names and versions
-                match = re.match(r'(\S+)(==\S+)?', line.strip())
+                match = re.match(r'([^\s=]+)(==\S+)?', requirement.strip())
                 if match:
                     lib_name = match.group(1)
                     version = match.group(2) if match.group(2) else None
@@ -47,9 +69,18 @@ def is_standard_library(lib_name):
     spec = importlib.util.find_spec(lib_name)
     return spec is not None and spec.origin is None  # Origin None means it's built-in
 
+def installed_distributions():
+    # Read installed packages in-process instead of spawning `pip freeze`
+    installed = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed[re.sub(r"[-_.]+", "-", name).lower()] = dist.version
+    return installed
+
 def install_dependencies(required_libraries):
-    # Get list of installed libraries
-    installed_libraries = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze']).decode().splitlines()
+    # Get installed libraries as {normalized name: version}
+    installed_libraries = installed_distributions()
 
     # Check and install missing libraries
     for lib in required_libraries:
@@ -62,8 +93,10 @@ def install_dependencies(required_libraries):
                 print(f"Skipping installation of standard library: {lib_name}")
                 continue
 
-            # Check if the library is already installed
-            if not any(lib.lower() in installed_lib.lower() for installed_lib in installed_libraries):
+            # Check if the library (and pinned version, if any) is already installed
+            version = lib.split('==')[1] if '==' in lib else None
+            installed_version = installed_libraries.get(re.sub(r"[-_.]+", "-", lib_name).lower())
+            if installed_version is None or (version and installed_version != version):
                 print(f"Installing {lib}...")
                 subprocess.check_call([sys.executable, '-m', 'pip', 'install', lib])
             else:
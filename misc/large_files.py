@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import pathlib
+import shutil
+import stat
+import subprocess
+import sys
+
+from .ignore_patterns import ALWAYS_PRUNE, PatternSet
+from .project_config import find_project_root, tool_patterns, tool_section, write_text_atomic
+
+INDEX_FILE = ".cache/size_index.json"
+DEFAULT_THRESHOLD_MB = 50
+ACTIONS = ("flag", "route")
+HOOK_MARKER = "# large-files guard"
+
+# Runs the guard before every `git push`; the tool folder is baked in because the
+# generated project does not ship misc/, and a moved tool folder only warns.
+PRE_PUSH_HOOK = """#!/bin/sh
+{marker}
+cd "$(git rev-parse --show-toplevel)" || exit 1
+if [ ! -d "{tools}/misc" ]; then
+    echo "large-files guard: {tools}/misc not found; skipping the size check." >&2
+    exit 0
+fi
+PYTHONPATH="{tools}{sep}$PYTHONPATH" exec "{python}" -m misc.large_files
+"""
+
+
+def guard_settings(root):
+    """Read `[tool.large_files]`: the size threshold (bytes) and the action."""
+    section = tool_section("large_files", root)
+    threshold = float(section.get("threshold_mb", DEFAULT_THRESHOLD_MB)) * 1024**2
+    action = section.get("action", "flag")
+    if action not in ACTIONS:
+        raise ValueError(f"[tool.large_files] action must be one of {ACTIONS}, got '{action}'.")
+    return threshold, action
+
+
+def exempt_patterns(root):
+    """
+    Paths the guard never looks at: `[tool.large_files]` patterns plus the
+    project's .gitignore (ignored files are never committed anyway).
+    """
+    patterns = tool_patterns("large_files", root) or ["data/", ".cache/", ".trash/"]
+    patterns.append(".git/")
+    gitignore = root / ".gitignore"
+    if gitignore.exists():
+        patterns += gitignore.read_text(encoding="utf-8", errors="ignore").splitlines()
+    return PatternSet(patterns)
+
+
+def load_index(root):
+    try:
+        index = json.loads((root / INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return index.get("dirs", {})
+
+
+def scan_sizes(root=None, refresh=False):
+    """
+    Return {path: size} for every non-exempt file in the working tree.
+
+    Directory listings are cached in `.cache/size_index.json` keyed by the
+    directory's mtime, so unchanged folders are neither re-listed nor matched
+    against the ignore patterns again; only their files are stat'ed (sizes can
+    change in place without touching the folder).
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    ignore = exempt_patterns(root)
+    cached = {} if refresh else load_index(root)
+    signature = sorted(ignore.patterns)
+    if cached.get("", {}).get("signature") != signature:
+        cached = {}
+
+    dirs, sizes = {}, {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        path = root / rel_dir if rel_dir else root
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        entry = cached.get(rel_dir)
+        if entry is None or entry["mtime"] != mtime:
+            files, subdirs = [], []
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        rel = f"{rel_dir}/{e.name}" if rel_dir else e.name
+                        is_dir = e.is_dir(follow_symlinks=False)
+                        if is_dir and not rel_dir and e.name in ALWAYS_PRUNE:
+                            continue
+                        if ignore.match(rel, is_dir=is_dir):
+                            continue
+                        (subdirs if is_dir else files).append(e.name)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            entry = {"mtime": mtime, "files": sorted(files), "dirs": sorted(subdirs)}
+        dirs[rel_dir] = entry
+        for name in entry["files"]:
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                sizes[rel] = os.stat(root / rel, follow_symlinks=False).st_size
+            except OSError:
+                pass
+        stack.extend(f"{rel_dir}/{d}" if rel_dir else d for d in entry["dirs"])
+
+    dirs[""]["signature"] = signature
+    if dirs != cached:
+        write_text_atomic(root / INDEX_FILE, json.dumps({"dirs": dirs}))
+    return sizes
+
+
+def find_large_files(root=None, threshold=None, refresh=False):
+    """Return {path: size} of files above the threshold, largest first."""
+    root = pathlib.Path(root or find_project_root()).resolve()
+    threshold = threshold if threshold is not None else guard_settings(root)[0]
+    sizes = scan_sizes(root, refresh)
+    large = {rel: size for rel, size in sizes.items() if size > threshold}
+    return dict(sorted(large.items(), key=lambda item: -item[1]))
+
+
+def _annex_rules(root):
+    attributes = root / ".gitattributes"
+    if not attributes.exists():
+        return set()
+    lines = attributes.read_text(encoding="utf-8").splitlines()
+    return {line.rsplit(" ", 1)[0].replace("[[:space:]]", " ") for line in lines if line.endswith("annex.largefiles=anything")}
+
+
+def already_tracked(root, rel, annexed):
+    """True if `rel` is already handed to DVC (a sibling .dvc file) or to the annex (.gitattributes rule)."""
+    return rel in annexed or (root / f"{rel}.dvc").exists()
+
+
+def route_large_files(root, paths, version_control):
+    """
+    Hand large files to the data-tracking backend instead of plain Git.
+
+    DVC: `dvc add` (writes a .dvc pointer and git-ignores the file).
+    DataLad: an `annex.largefiles=anything` rule in .gitattributes, so the next
+    `datalad save` puts the file into the annex.
+
+    Returns
+    -------
+        list[str]: The paths that were routed.
+    """
+    if not paths:
+        return []
+    if version_control == "DVC" and shutil.which("dvc"):
+        ok = subprocess.run(["dvc", "add", *paths], cwd=root).returncode == 0
+        return list(paths) if ok else []
+    if version_control == "Datalad":
+        attributes = root / ".gitattributes"
+        lines = attributes.read_text(encoding="utf-8").splitlines() if attributes.exists() else []
+        rules = [f"{p.replace(' ', '[[:space:]]')} annex.largefiles=anything" for p in paths]
+        new = [rule for rule in rules if rule not in lines]
+        if new:
+            write_text_atomic(attributes, "\n".join(lines + new) + "\n")
+        return list(paths)
+    return []
+
+
+def guard(root=None, action=None, refresh=False):
+    """
+    Check the working tree for oversized files before committing or pushing.
+
+    With action "flag" the files are only reported; with "route" they are
+    handed to DVC or DataLad when that is the project's version control.
+
+    Returns
+    -------
+        bool: True when no unhandled large files remain (safe to push).
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    threshold, configured = guard_settings(root)
+    action = action or configured
+    annexed = _annex_rules(root)
+    large = find_large_files(root, threshold, refresh)
+    large = {rel: size for rel, size in large.items() if not already_tracked(root, rel, annexed)}
+    if not large:
+        return True
+
+    version_control = tool_section("cookiecutter", root).get("VERSION_CONTROL", "None")
+    routed = route_large_files(root, list(large), version_control) if action == "route" else []
+    for rel, size in large.items():
+        status = "routed" if rel in routed else "too large"
+        print(f"  {rel:<60} {size / 1024**2:10.1f} MB  {status}")
+    remaining = [rel for rel in large if rel not in routed]
+    if remaining:
+        print(
+            f"{len(remaining)} files exceed {threshold / 1024**2:.0f} MB. Move them to data/, "
+            f"track them with DVC/DataLad, or raise [tool.large_files] threshold_mb."
+        )
+    return not remaining
+
+
+def install_hook(root=None, python=None):
+    """
+    Install a Git pre-push hook that runs `guard()` and blocks the push while
+    unhandled large files remain. An existing pre-push hook that was not
+    written by this tool is left alone.
+
+    Returns
+    -------
+        bool: True if the hook is installed.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    hook = root / ".git" / "hooks" / "pre-push"
+    if not hook.parent.parent.is_dir():
+        print(f"{root} is not a Git repository; no pre-push hook installed.")
+        return False
+    if hook.exists() and HOOK_MARKER not in hook.read_text(encoding="utf-8", errors="ignore"):
+        print(f"{hook} already exists; add `python -m misc.cli large-files` to it by hand.")
+        return False
+    tools = pathlib.Path(__file__).resolve().parent.parent.as_posix()
+    python = pathlib.Path(python or sys.executable).as_posix()
+    text = PRE_PUSH_HOOK.format(marker=HOOK_MARKER, tools=tools, sep=os.pathsep, python=python)
+    hook.parent.mkdir(exist_ok=True)
+    write_text_atomic(hook, text)
+    hook.chmod(hook.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    print(f"Installed the large-files pre-push hook in {hook}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag or route oversized files before committing/pushing.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--action", choices=ACTIONS, default=None, help="Override [tool.large_files] action")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached size index")
+    parser.add_argument("--install-hook", action="store_true", help="Run the guard before every `git push`")
+    args = parser.parse_args(argv)
+    if args.install_hook:
+        raise SystemExit(0 if install_hook(args.root) else 1)
+    raise SystemExit(0 if guard(args.root, args.action, args.refresh) else 1)
+
+
+if __name__ == "__main__":
+    main()
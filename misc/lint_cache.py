@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .data_manifest import hash_file
+from .import_scanner import source_files
+from .project_config import find_project_root, tool_section, write_text_atomic
+
+CACHE_FILE = ".cache/lint_cache.json"
+BATCH_SIZE = 100
+ISSUE_LINE = re.compile(r"^(.+?):(\d+):(\d+): (.*)$")
+
+# Files whose contents change what a linter reports
+CONFIG_FILES = {
+    "python": ("ruff.toml", ".ruff.toml", "setup.cfg", ".flake8", "tox.ini"),
+    "r": (".lintr",),
+}
+SUFFIXES = {"python": (".py",), "r": (".r", ".R", ".rmd", ".Rmd")}
+
+# Exit codes meaning "ran fine" (ruff and flake8 exit 1 when they report issues); anything else is a linter error
+OK_CODES = {"ruff": (0, 1), "flake8": (0, 1), "Rscript": (0,)}
+
+LINTR_SCRIPT = (
+    "for (f in commandArgs(TRUE)) for (l in lintr::lint(f)) "
+    'cat(sprintf("%s:%d:%d: %s %s\\n", f, l$line_number, l$column_number, l$linter, l$message))'
+)
+
+
+def linter_command(language):
+    """The linter invocation for a language (files are appended), or None if none is installed."""
+    if language == "python":
+        if shutil.which("ruff"):
+            return ["ruff", "check", "--no-cache", "--output-format", "concise"]
+        if shutil.which("flake8"):
+            return ["flake8"]
+    if language == "r" and shutil.which("Rscript"):
+        return ["Rscript", "-e", LINTR_SCRIPT, "--args"]
+    return None
+
+
+def config_key(root, language, command):
+    """
+    Hash of everything besides the file itself that affects lint results:
+    the linter command and version, its config files and the pyproject [tool.<linter>] table.
+    """
+    h = hashlib.sha1(json.dumps(command).encode("utf-8"))
+    version = subprocess.run([command[0], "--version"], capture_output=True, text=True)
+    h.update(version.stdout.encode("utf-8"))
+    for name in CONFIG_FILES[language]:
+        path = root / name
+        if path.exists():
+            h.update(path.read_bytes())
+    h.update(json.dumps(tool_section(command[0], root), sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def run_linter(root, command, files):
+    """
+    Lint `files` in batches.
+
+    Returns
+    -------
+        tuple: ({file: [issue, ...]} with [] for clean files, {file: error} for files
+        in batches where the linter itself failed, e.g. on a broken config).
+    """
+    issues, errors = {}, {}
+    for i in range(0, len(files), BATCH_SIZE):
+        batch = files[i : i + BATCH_SIZE]
+        proc = subprocess.run([*command, *batch], cwd=root, capture_output=True, text=True)
+        if proc.returncode not in OK_CODES.get(command[0], (0,)):
+            message = proc.stderr.strip() or proc.stdout.strip()
+            error = f"{command[0]} failed with exit code {proc.returncode}: {message}"
+            errors.update(dict.fromkeys(batch, error))
+            continue
+        issues.update({rel: [] for rel in batch})
+        for line in proc.stdout.splitlines():
+            match = ISSUE_LINE.match(line.strip())
+            if not match:
+                continue
+            rel = pathlib.Path(match.group(1)).as_posix()
+            rel = rel[2:] if rel.startswith("./") else rel
+            if rel in issues:
+                issues[rel].append(f"{match.group(2)}:{match.group(3)}: {match.group(4)}")
+    return issues, errors
+
+
+def lint_language(root, language, files, cache):
+    """
+    Lint the changed files of one language.
+
+    Returns
+    -------
+        tuple: (language entry for the cache, files linted, {file: linter error});
+        files the linter failed on are left out of the entry so they are retried.
+    """
+    command = linter_command(language)
+    if command is None:
+        print(f"No {language} linter installed; skipping {len(files)} files.")
+        return None, 0, {}
+    key = config_key(root, language, command)
+    previous = cache.get(language, {})
+    cached = previous.get("files", {}) if previous.get("config") == key else {}
+
+    digests = {rel: hash_file(root / rel) for rel in files}
+    todo = [rel for rel in files if cached.get(rel, [None])[0] != digests[rel]]
+    fresh, errors = run_linter(root, command, todo) if todo else ({}, {})
+
+    entry = {"config": key, "files": {}}
+    for rel in files:
+        if rel in errors:
+            continue
+        issues = fresh[rel] if rel in fresh else cached[rel][1]
+        entry["files"][rel] = [digests[rel], issues]
+    return entry, len(todo), errors
+
+
+def lint(root=None, files=None, workers=None):
+    """
+    Lint src/ and tests/, re-running linters only on files whose content hash or
+    linter configuration changed since the last run. Languages are linted concurrently.
+
+    Returns
+    -------
+        tuple: ({file: [issue, ...]} for files with issues, {file: linter error}).
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    files = files or source_files(root)
+    by_language = {}
+    for rel in files:
+        for language, suffixes in SUFFIXES.items():
+            if rel.endswith(suffixes):
+                by_language.setdefault(language, []).append(rel)
+
+    cache_path = root / CACHE_FILE
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    workers = workers or max(1, min(len(by_language), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = {lang: pool.submit(lint_language, root, lang, paths, cache) for lang, paths in by_language.items()}
+
+    found, errors, linted, total = {}, {}, 0, 0
+    for language, job in jobs.items():
+        entry, count, failed = job.result()
+        if entry is None:
+            continue
+        errors.update(failed)
+        linted += count
+        total += len(entry["files"])
+        # Keep cached results of files that were not part of this run
+        merged = {**cache.get(language, {}).get("files", {}), **entry["files"]}
+        if cache.get(language, {}).get("config") != entry["config"]:
+            merged = entry["files"]
+        cache[language] = {"config": entry["config"], "files": merged}
+        for rel, (_, issues) in entry["files"].items():
+            if issues:
+                found[rel] = issues
+    write_text_atomic(cache_path, json.dumps(cache))
+
+    for rel in sorted(found):
+        for issue in found[rel]:
+            print(f"{rel}:{issue}")
+    for error in sorted(set(errors.values())):
+        print(error)
+    print(f"Linted {linted} of {total} files ({total - linted} unchanged); {sum(map(len, found.values()))} issues.")
+    if errors:
+        print(f"Linter errors on {len(errors)} files; their results were not cached.")
+    return found, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental, cached linting of src/ and tests/.")
+    parser.add_argument("files", nargs="*", help="Files to lint (default: src/ and tests/)")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--workers", type=int, default=None, help="Languages linted concurrently")
+    args = parser.parse_args(argv)
+    found, errors = lint(args.root, args.files or None, args.workers)
+    raise SystemExit(1 if found or errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Disk-backed memoization for pipeline steps (s04_preprocessing, s05_modeling, ...).
+
+This module is self-contained so it can be copied next to `s02_utils.py`:
+
+    from memoize import memoize
+
+    @memoize
+    def clean(df, threshold=0.5):
+        ...
+
+Results are stored under `data/interim/.memoize/<function>/`, keyed by a hash of
+the function's source code and its arguments, so editing a function only
+invalidates that function's results. Helper functions it calls are not part of
+the key; decorate them as well, or pass `version=` to force a refresh.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+DEFAULT_MAX_BYTES = int(os.environ.get("MEMOIZE_MAX_BYTES", 10 * 1024**3))
+# Arrays at least this large are saved as .npy and memory-mapped on load
+MMAP_THRESHOLD = 16 * 1024**2
+
+_STATS = {}
+
+
+def project_root(start=None):
+    start = pathlib.Path(start or os.getcwd()).resolve()
+    for folder in (start, *start.parents):
+        if (folder / "pyproject.toml").is_file():
+            return folder
+    return start
+
+
+def default_cache_dir():
+    return project_root() / "data" / "interim" / ".memoize"
+
+
+def _hash_value(h, value):
+    """Feed `value` into the hash; arrays and tables are hashed by their raw buffers."""
+    if np is not None and isinstance(value, np.ndarray) and value.dtype != object:
+        h.update(f"ndarray{value.dtype}{value.shape}".encode("utf-8"))
+        h.update(np.ascontiguousarray(value).data)
+    elif pa is not None and isinstance(value, pa.Table):
+        h.update(str(value.schema).encode("utf-8"))
+        for column in value.columns:
+            for chunk in column.chunks:
+                # A slice shares its parent's buffers; offset and length say which rows it holds
+                h.update(f"chunk{chunk.offset}:{len(chunk)}".encode("utf-8"))
+                for buf in chunk.buffers():
+                    if buf is not None:
+                        h.update(buf)
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode("utf-8"))
+        for item in value:
+            _hash_value(h, item)
+    elif isinstance(value, (set, frozenset)):
+        # Iteration order of sets depends on the per-process string hash seed
+        h.update(f"{type(value).__name__}{len(value)}".encode("utf-8"))
+        for digest in sorted(_digest(item) for item in value):
+            h.update(digest)
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}".encode("utf-8"))
+        for digest, key in sorted(((_digest(key), key) for key in value), key=lambda item: item[0]):
+            h.update(digest)
+            _hash_value(h, value[key])
+    else:
+        h.update(pickle.dumps(value, protocol=4))
+
+
+def _digest(value):
+    sub = hashlib.sha256()
+    _hash_value(sub, value)
+    return sub.digest()
+
+
+def function_key(func, version=None):
+    """Hash of the function's identity and source (falls back to its bytecode)."""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    text = f"{func.__module__}.{func.__qualname__}\n{source}\n{version}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def call_key(func_key, args, kwargs):
+    h = hashlib.sha256(func_key.encode("utf-8"))
+    _hash_value(h, args)
+    _hash_value(h, kwargs)
+    return h.hexdigest()
+
+
+def _store(path_base, result):
+    """Write `result` next to `path_base` in the best format for its type. Returns the file written."""
+    if np is not None and isinstance(result, np.ndarray) and result.dtype != object and result.nbytes >= MMAP_THRESHOLD:
+        path = path_base.with_suffix(".npy")
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, result, allow_pickle=False)
+    elif pa is not None and isinstance(result, pa.Table):
+        path = path_base.with_suffix(".arrow")
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, result.schema) as writer:
+            writer.write_table(result)
+    else:
+        path = path_base.with_suffix(".pkl")
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def _load(path):
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if path.suffix == ".arrow":
+        # Zero-copy: the table's buffers point into the memory-mapped file
+        return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _find(path_base):
+    for suffix in (".npy", ".arrow", ".pkl"):
+        path = path_base.with_suffix(suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def evict(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Delete least recently used entries until the cache is below `max_bytes`.
+    Entries are touched on every hit, so mtime order is recency order.
+
+    Returns
+    -------
+        int: Bytes freed.
+    """
+    cache_dir = pathlib.Path(cache_dir or default_cache_dir())
+    entries = []
+    for path in cache_dir.glob("*/*"):
+        if path.suffix in (".npy", ".arrow", ".pkl"):
+            st = path.stat()
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= max_bytes:
+            break
+        try:
+            path.unlink()
+            path.with_suffix(".time").unlink(missing_ok=True)
+            freed += size
+        except OSError:
+            pass
+    return freed
+
+
+def memoize(func=None, *, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, version=None):
+    """
+    Cache a function's results on disk.
+
+    Args:
+        cache_dir (str | Path): Cache folder. Defaults to data/interim/.memoize in the project.
+        max_bytes (int): Size limit of the whole cache; least recently used entries are evicted.
+        version: Bump to invalidate results without editing the function.
+
+    Large NumPy arrays are returned as read-only memory maps and pyarrow Tables
+    as zero-copy memory-mapped tables. Arguments that cannot be hashed bypass
+    the cache. The wrapper exposes `cache_stats()` and `cache_clear()`.
+    """
+    if func is None:
+        return functools.partial(memoize, cache_dir=cache_dir, max_bytes=max_bytes, version=version)
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    stats = _STATS.setdefault(name, {"hits": 0, "misses": 0, "bypass": 0, "bytes_written": 0, "seconds_saved": 0.0})
+    fkey = function_key(func, version)
+
+    def folder():
+        return pathlib.Path(cache_dir or default_cache_dir()) / f"{func.__qualname__}-{fkey}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = call_key(fkey, args, kwargs)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            stats["bypass"] += 1
+            return func(*args, **kwargs)
+
+        base = folder() / key
+        path = _find(base)
+        if path is not None:
+            try:
+                result = _load(path)
+                os.utime(path)
+                stats["hits"] += 1
+                seconds = base.with_suffix(".time")
+                if seconds.exists():
+                    stats["seconds_saved"] += float(seconds.read_text())
+                return result
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+                path.unlink(missing_ok=True)
+
+        stats["misses"] += 1
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        base.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            path = _store(base, result)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return result
+        base.with_suffix(".time").write_text(f"{elapsed:.6f}")
+        stats["bytes_written"] += path.stat().st_size
+        evict(folder().parent, max_bytes)
+        return result
+
+    def cache_clear():
+        for path in folder().glob("*"):
+            path.unlink(missing_ok=True)
+
+    wrapper.cache_stats = lambda: dict(stats)
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def memo_stats(show=True):
+    """Hit/miss statistics of all memoized functions in this process."""
+    if show:
+        for name, s in sorted(_STATS.items()):
+            calls = s["hits"] + s["misses"]
+            rate = s["hits"] / calls * 100 if calls else 0
+            print(
+                f"{name}: {s['hits']} hits, {s['misses']} misses ({rate:.0f}% hit rate), "
+                f"{s['bypass']} bypassed, {s['bytes_written'] / 1024**2:.1f} MB written, "
+                f"{s['seconds_saved']:.1f}s saved"
+            )
+    return {name: dict(s) for name, s in _STATS.items()}
@@ -0,0 +1,312 @@
+import argparse
+import csv
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import pathlib
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .project_config import find_project_root, load_toml, write_text_atomic
+
+try:
+    import resource
+except ImportError:  # Windows: no per-task rlimits
+    resource = None
+
+SWEEP_DIR = "results/sweeps"
+
+
+def load_grid(path=None, params=()):
+    """
+    Build the parameter grid from a JSON/TOML file ({name: [values]}) and/or
+    `name=v1,v2` strings. Values are parsed as JSON where possible ("3" -> 3).
+    """
+    grid = {}
+    if path:
+        if str(path).endswith(".toml"):
+            grid.update(load_toml(path))
+        else:
+            grid.update(json.loads(pathlib.Path(path).read_text(encoding="utf-8")))
+    for item in params:
+        name, _, values = item.partition("=")
+        parsed = []
+        for value in values.split(","):
+            try:
+                parsed.append(json.loads(value))
+            except ValueError:
+                parsed.append(value)
+        grid[name.strip()] = parsed
+    return {k: v if isinstance(v, list) else [v] for k, v in grid.items()}
+
+
+def expand_grid(grid):
+    """Cartesian product of the grid as a list of {name: value} dicts (stable order)."""
+    names = sorted(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+
+
+def task_id(index, params):
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:8]
+    return f"{index:05d}-{digest}"
+
+
+def resolve_target(spec, root):
+    """Import 'module:function' with the project's src/ on sys.path."""
+    src = str(pathlib.Path(root) / "src")
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name or "main")
+
+
+class TaskLimitExceeded(Exception):
+    pass
+
+
+def _raise_limit(signum, frame):
+    raise TaskLimitExceeded("CPU time limit exceeded" if signum == signal.SIGXCPU else "wall-clock timeout")
+
+
+def _apply_limits(mem_mb, cpu_seconds, timeout):
+    """
+    Limit the current worker process. The default actions of SIGXCPU/SIGALRM
+    would kill the worker (and break the pool), so they raise in the task instead.
+    """
+    if resource is None:
+        return
+    if mem_mb:
+        limit = int(mem_mb) * 1024**2
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        signal.signal(signal.SIGXCPU, _raise_limit)
+        resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + 5))
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_limit)
+        signal.alarm(int(timeout))
+
+
+def run_task(target, root, params, limits=None):
+    """
+    Run one configuration (in a worker process) under its resource limits.
+
+    Returns
+    -------
+        dict: {"params", "status": "ok" | "error", "seconds", "result" | "error"}
+    """
+    start = time.perf_counter()
+    try:
+        _apply_limits(*(limits or (None, None, None)))
+        result = resolve_target(target, root)(**params)
+        record = {"params": params, "status": "ok", "result": result}
+    except MemoryError:
+        record = {"params": params, "status": "error", "error": "MemoryError: memory limit exceeded"}
+    except BaseException as e:  # SystemExit/KeyboardInterrupt from the task must not kill the sweep
+        record = {"params": params, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    if resource is not None and limits and limits[2]:
+        signal.alarm(0)
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def run_isolated(target, root, params, limits):
+    """
+    Run one task in a process of its own, so its limits end with it. A limit
+    hit inside C code can kill the process outright (SIGKILL, SIGSEGV); that
+    fails this task only.
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(run_task, target, root, params, limits).result()
+        except BrokenProcessPool:
+            error = "worker process died (killed by a resource limit or a crash)"
+            return {"params": params, "status": "error", "error": error, "seconds": time.perf_counter() - start}
+
+
+def _executor(workers, limited):
+    """
+    Pool for the sweep and the function it runs per task. Limits must not carry
+    over to the next task in a reused worker (RLIMIT_CPU counts the whole
+    process's CPU time), and a worker killed by a limit would break a shared
+    pool for every pending task, so limited tasks each get a single-use pool.
+    """
+    if not limited:
+        return ProcessPoolExecutor(max_workers=workers), run_task
+    return ThreadPoolExecutor(max_workers=workers), run_isolated
+
+
+def write_summary(out_dir, records):
+    """Write summary.csv with one row per task: id, status, seconds, params and scalar results."""
+    param_names = sorted({k for r in records.values() for k in r["params"]})
+    result_names = sorted({
+        k for r in records.values() if isinstance(r.get("result"), dict)
+        for k, v in r["result"].items() if isinstance(v, (int, float, str, bool))
+    })
+    path = out_dir / "summary.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        # Result keys that repeat a parameter name get a prefix
+        header = [f"result_{n}" if n in param_names else n for n in result_names]
+        writer.writerow(["task", "status", "seconds", *param_names, *header])
+        for tid in sorted(records):
+            r = records[tid]
+            result = r.get("result") if isinstance(r.get("result"), dict) else {}
+            writer.writerow(
+                [tid, r["status"], f"{r['seconds']:.3f}"]
+                + [r["params"].get(n, "") for n in param_names]
+                + [result.get(n, "") for n in result_names]
+            )
+    return path
+
+
+def run_sweep(target, grid, name="sweep", root=None, workers=None, mem_mb=None, cpu_seconds=None, timeout=None, rerun=False):
+    """
+    Run every configuration of `grid` through `target` in a local process pool.
+
+    Each task writes results/sweeps/<name>/<task>.json; tasks that already
+    succeeded are skipped unless `rerun`. Per-task limits (POSIX): address
+    space `mem_mb`, CPU time `cpu_seconds` and wall-clock `timeout`.
+
+    Returns
+    -------
+        dict: {task_id: record}
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    out_dir = root / SWEEP_DIR / name
+    configs = expand_grid(grid)
+    write_text_atomic(out_dir / "grid.json", json.dumps({"target": target, "grid": grid}, indent=2, default=str))
+
+    records, todo = {}, []
+    for i, params in enumerate(configs):
+        tid = task_id(i, params)
+        path = out_dir / f"{tid}.json"
+        if path.exists() and not rerun:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            if record.get("status") == "ok":
+                records[tid] = record
+                continue
+        todo.append((tid, params))
+
+    workers = workers or min(len(todo), os.cpu_count() or 1) or 1
+    print(f"{len(configs)} configurations, {len(records)} already done, running {len(todo)} on {workers} workers.")
+    start = time.perf_counter()
+    limits = (mem_mb, cpu_seconds, timeout)
+    pool, run = _executor(workers, any(limits))
+    with pool:
+        futures = {pool.submit(run, target, str(root), params, limits): tid for tid, params in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            tid = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:  # worker killed (e.g. CPU limit signal)
+                record = {"params": dict(todo)[tid], "status": "error", "error": repr(e), "seconds": 0.0}
+            records[tid] = record
+            write_text_atomic(out_dir / f"{tid}.json", json.dumps(record, indent=2, default=str))
+            print(f"[{done}/{len(todo)}] {tid} {record['status']} ({record['seconds']:.1f}s)")
+
+    summary = write_summary(out_dir, records)
+    wall = time.perf_counter() - start
+    busy = sum(records[tid]["seconds"] for tid, _ in todo)
+    failed = sum(r["status"] != "ok" for r in records.values())
+    print(f"Sweep finished in {wall:.1f}s ({busy:.1f}s of task time); {failed} failed. Summary: {summary.relative_to(root)}")
+    return records
+
+
+def write_slurm_script(target, grid, name="sweep", root=None, cpus=1, mem="4G", time_limit="01:00:00", max_parallel=None, python="python"):
+    """
+    Write results/sweeps/<name>/sweep.sbatch: a SLURM array job with one task
+    per configuration that calls `python -m misc.param_sweep task`.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    out_dir = root / SWEEP_DIR / name
+    configs = expand_grid(grid)
+    write_text_atomic(out_dir / "grid.json", json.dumps({"target": target, "grid": grid}, indent=2, default=str))
+    array = f"0-{len(configs) - 1}" + (f"%{max_parallel}" if max_parallel else "")
+    rel = out_dir.relative_to(root).as_posix()
+    script = "\n".join([
+        "#!/bin/bash",
+        f"#SBATCH --job-name={name}",
+        f"#SBATCH --array={array}",
+        f"#SBATCH --cpus-per-task={cpus}",
+        f"#SBATCH --mem={mem}",
+        f"#SBATCH --time={time_limit}",
+        f"#SBATCH --output={rel}/slurm-%A_%a.out",
+        "",
+        f'cd "{root.as_posix()}"',
+        f'export PYTHONPATH="{pathlib.Path(__file__).resolve().parent.parent.as_posix()}:$PYTHONPATH"',
+        "export OMP_NUM_THREADS=$SLURM_CPUS_PER_TASK",
+        f"{python} -m misc.param_sweep task {rel}/grid.json $SLURM_ARRAY_TASK_ID",
+        "",
+    ])
+    path = out_dir / "sweep.sbatch"
+    write_text_atomic(path, script)
+    print(f"Wrote {path.relative_to(root)} ({len(configs)} array tasks). Submit with: sbatch {path.relative_to(root)}")
+    print(f"Collect results afterwards with: python -m misc.param_sweep summary {rel}")
+    return path
+
+
+def run_array_task(grid_file, index, root=None):
+    """Run configuration `index` of a saved grid (the body of one SLURM array task)."""
+    root = pathlib.Path(root or find_project_root()).resolve()
+    spec = json.loads(pathlib.Path(grid_file).read_text(encoding="utf-8"))
+    params = expand_grid(spec["grid"])[index]
+    record = run_task(spec["target"], str(root), params)
+    out_dir = pathlib.Path(grid_file).resolve().parent
+    write_text_atomic(out_dir / f"{task_id(index, params)}.json", json.dumps(record, indent=2, default=str))
+    return record["status"] == "ok"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parameter sweeps: local process pool or SLURM array jobs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for cmd in ("run", "slurm"):
+        p = sub.add_parser(cmd, help="Run locally" if cmd == "run" else "Write a SLURM array job script")
+        p.add_argument("target", help="module:function in src/, e.g. s05_modeling:main")
+        p.add_argument("--grid", default=None, help="JSON/TOML file with {name: [values]}")
+        p.add_argument("-p", "--param", action="append", default=[], help="name=v1,v2 (repeatable)")
+        p.add_argument("--name", default="sweep", help="Folder under results/sweeps")
+        if cmd == "run":
+            p.add_argument("--workers", type=int, default=None)
+            p.add_argument("--mem-mb", type=int, default=None, help="Per-task memory limit")
+            p.add_argument("--cpu-seconds", type=int, default=None, help="Per-task CPU-time limit")
+            p.add_argument("--timeout", type=int, default=None, help="Per-task wall-clock limit (seconds)")
+            p.add_argument("--rerun", action="store_true", help="Re-run tasks that already succeeded")
+        else:
+            p.add_argument("--cpus", type=int, default=1)
+            p.add_argument("--mem", default="4G")
+            p.add_argument("--time", default="01:00:00")
+            p.add_argument("--max-parallel", type=int, default=None)
+    p_task = sub.add_parser("task", help="Run one configuration of a saved grid (used by SLURM)")
+    p_task.add_argument("grid_file")
+    p_task.add_argument("index", type=int)
+    p_summary = sub.add_parser("summary", help="Rebuild summary.csv from task results")
+    p_summary.add_argument("folder")
+    args = parser.parse_args(argv)
+
+    if args.command == "task":
+        raise SystemExit(0 if run_array_task(args.grid_file, args.index) else 1)
+    if args.command == "summary":
+        folder = pathlib.Path(args.folder)
+        records = {p.stem: json.loads(p.read_text(encoding="utf-8")) for p in folder.glob("[0-9]*.json")}
+        print(f"Wrote {write_summary(folder, records)} ({len(records)} tasks)")
+        return
+    grid = load_grid(args.grid, args.param)
+    if not grid:
+        parser.error("no parameters given (use --grid or --param)")
+    if args.command == "run":
+        records = run_sweep(
+            args.target, grid, args.name, workers=args.workers, mem_mb=args.mem_mb,
+            cpu_seconds=args.cpu_seconds, timeout=args.timeout, rerun=args.rerun,
+        )
+        raise SystemExit(0 if all(r["status"] == "ok" for r in records.values()) else 1)
+    write_slurm_script(args.target, grid, args.name, cpus=args.cpus, mem=args.mem, time_limit=args.time, max_parallel=args.max_parallel)
+
+
+if __name__ == "__main__":
+    main()
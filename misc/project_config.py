@@ -0,0 +1,61 @@
+import os
+import pathlib
+import sys
+
+if sys.version_info < (3, 11):
+    import toml
+
+    def _loads(text):
+        return toml.loads(text)
+else:
+    import tomllib
+
+    def _loads(text):
+        return tomllib.loads(text)
+
+
+def find_project_root(start=None):
+    """
+    Walk up from `start` (default: the working directory) to the first folder holding a pyproject.toml.
+
+    Returns
+    -------
+        pathlib.Path: The project root, or the resolved start folder if none is found.
+    """
+    start = pathlib.Path(start or os.getcwd()).resolve()
+    for folder in (start, *start.parents):
+        if (folder / "pyproject.toml").is_file():
+            return folder
+    return start
+
+
+def load_toml(path):
+    """Read a TOML file into a dict (a leading BOM is tolerated)."""
+    return _loads(pathlib.Path(path).read_text(encoding="utf-8-sig"))
+
+
+def load_pyproject(root=None):
+    """Read the project's pyproject.toml (the template writes it with a BOM) into a dict."""
+    path = pathlib.Path(root or find_project_root()) / "pyproject.toml"
+    if not path.exists():
+        return {}
+    return load_toml(path)
+
+
+def tool_section(name, root=None):
+    """Return the `[tool.<name>]` table of pyproject.toml, or an empty dict."""
+    return load_pyproject(root).get("tool", {}).get(name, {})
+
+
+def tool_patterns(name, root=None):
+    """Return the `patterns` list of `[tool.<name>]`, e.g. tool_patterns("datasets")."""
+    return list(tool_section(name, root).get("patterns", []))
+
+
+def write_text_atomic(path, text):
+    """Write `text` to `path` through a temporary file so readers never see a partial file."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import pathlib
+
+from .ignore_patterns import matcher, walk
+from .project_config import find_project_root, write_text_atomic
+
+TREE_START = "<!-- project-tree:start -->"
+TREE_END = "<!-- project-tree:end -->"
+
+# Children of these folders are rendered as one "N files, X GB" summary line
+SUMMARY_ROOTS = ("data",)
+COUNT_LIMIT = 100_000
+
+
+def format_size(n_bytes):
+    size = float(n_bytes)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _manifest_datasets(root):
+    try:
+        return json.loads((root / "data_manifest.json").read_text(encoding="utf-8"))["datasets"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def summarize_folder(root, rel, datasets):
+    """Return 'N files, X GB' for a data folder, from data_manifest.json when available."""
+    if rel in datasets:
+        info = datasets[rel]
+        return f"{info['file_count']} files, {format_size(info['byte_size'])}"
+    count = size = 0
+    for _, entry in walk(root / rel, root=root):
+        if entry.name == ".gitkeep":
+            continue
+        count += 1
+        try:
+            size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+        if count >= COUNT_LIMIT:
+            return f"{count}+ files, {format_size(size)}+"
+    return f"{count} files, {format_size(size)}"
+
+
+def build_tree(root=None, max_depth=3, max_entries=25):
+    """
+    Build the project directory tree honoring `[tool.treeignore]`.
+
+    Ignored folders are pruned before they are read, folders below `max_depth`
+    are not expanded, at most `max_entries` entries are listed per folder and
+    dataset folders under data/ are collapsed into summary lines.
+
+    Returns
+    -------
+        list[str]: The rendered tree lines.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    ignore = matcher("treeignore", root)
+    datasets = _manifest_datasets(root)
+    lines = []
+
+    def listdir(path, rel_dir):
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return []
+        visible = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if not (ignore and ignore.match(rel, is_dir=is_dir)):
+                visible.append((not is_dir, entry.name.lower(), entry, rel, is_dir))
+        return sorted(visible)
+
+    def render(path, rel_dir, prefix, depth):
+        children = listdir(path, rel_dir)
+        shown = children[:max_entries]
+        hidden = len(children) - len(shown)
+        for i, (_, _, entry, rel, is_dir) in enumerate(shown):
+            last = i == len(shown) - 1 and not hidden
+            branch = "└── " if last else "├── "
+            if not is_dir:
+                lines.append(f"{prefix}{branch}{entry.name}")
+                continue
+            if rel_dir in SUMMARY_ROOTS:
+                summary = summarize_folder(root, rel, datasets)
+                lines.append(f"{prefix}{branch}{entry.name}/  ({summary})")
+            elif depth >= max_depth:
+                lines.append(f"{prefix}{branch}{entry.name}/ ...")
+            else:
+                lines.append(f"{prefix}{branch}{entry.name}/")
+                render(entry.path, rel, prefix + ("    " if last else "│   "), depth + 1)
+        if hidden:
+            lines.append(f"{prefix}└── ... ({hidden} more)")
+
+    render(str(root), "", "", 1)
+    return lines
+
+
+def update_readme_tree(readme="README.md", root=None, max_depth=3, max_entries=25):
+    """
+    Re-render the project tree section of README.md.
+
+    The section is delimited by TREE_START/TREE_END markers and is appended if missing.
+    The README is only rewritten when the rendered tree differs from what it holds.
+
+    Returns
+    -------
+        bool: True if README.md was written.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    readme_path = root / readme
+    tree = "\n".join(build_tree(root, max_depth=max_depth, max_entries=max_entries))
+    section = f"{TREE_START}\n```\n{tree}\n```\n{TREE_END}"
+
+    text = readme_path.read_text(encoding="utf-8") if readme_path.exists() else ""
+    start, end = text.find(TREE_START), text.find(TREE_END)
+    if start != -1 and end > start:
+        if text[start : end + len(TREE_END)] == section:
+            print("Project tree unchanged; README.md not rewritten.")
+            return False
+        new_text = text[:start] + section + text[end + len(TREE_END) :]
+    else:
+        new_text = text.rstrip("\n") + ("\n\n" if text else "") + f"## Project Tree\n\n{section}\n"
+
+    write_text_atomic(readme_path, new_text)
+    print(f"Updated project tree in {readme_path}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the bounded project tree into README.md.")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--readme", default="README.md", help="README file relative to the root")
+    parser.add_argument("--max-depth", type=int, default=3, help="Deepest folder level to expand")
+    parser.add_argument("--max-entries", type=int, default=25, help="Entries listed per folder")
+    parser.add_argument("--print", action="store_true", help="Print the tree instead of updating README")
+    args = parser.parse_args(argv)
+    if args.print:
+        print("\n".join(build_tree(args.root, args.max_depth, args.max_entries)))
+        return
+    update_readme_tree(args.readme, args.root, args.max_depth, args.max_entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import argparse
+import csv
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .param_sweep import expand_grid, load_grid, task_id
+from .project_config import find_project_root, write_text_atomic
+
+RESULTS_DIR = "results/notebooks"
+# Run before each parameter set in a reused kernel: clear the namespace and undo any chdir of the last run
+RESET_CODE = {
+    "python": "%reset -f\nimport os\nos.chdir({cwd})\ndel os",
+    "r": "rm(list = ls(all.names = TRUE))\nsetwd({cwd})",
+}
+
+# One kernel per worker process and working folder, reused for every parameter set that worker runs
+_KERNEL = {}
+
+
+def _jupyter():
+    """Import the Jupyter execution stack on first use, so the CLI starts without it."""
+    try:
+        import nbformat
+        from jupyter_client import KernelManager
+        from nbclient import NotebookClient
+    except ImportError:
+        raise ImportError("Executing .ipynb notebooks requires 'nbclient' and 'nbformat'.")
+    return nbformat, KernelManager, NotebookClient
+
+
+def _literal(value, language):
+    """Render a parameter value as a source literal for the kernel language."""
+    if language == "r":
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if value is None:
+            return "NULL"
+        if isinstance(value, (list, tuple)):
+            return "c(" + ", ".join(_literal(v, language) for v in value) + ")"
+        return json.dumps(value)
+    return repr(value)
+
+
+def inject_parameters(nb, params, language):
+    """
+    Insert a cell assigning `params` right after the cell tagged "parameters"
+    (or at the top), so injected values override the notebook defaults.
+    """
+    if not params:
+        return nb
+    nbformat, _, _ = _jupyter()
+    op = " <- " if language == "r" else " = "
+    source = "# Injected parameters\n" + "\n".join(f"{k}{op}{_literal(v, language)}" for k, v in params.items())
+    cell = nbformat.v4.new_code_cell(source, metadata={"tags": ["injected-parameters"]})
+    index = next((i + 1 for i, c in enumerate(nb.cells) if "parameters" in c.metadata.get("tags", [])), 0)
+    nb.cells.insert(index, cell)
+    return nb
+
+
+def cell_timings(nb):
+    """[(cell index, first source line, seconds)] from nbclient's execution timestamps."""
+    rows = []
+    for i, cell in enumerate(nb.cells):
+        execution = cell.metadata.get("execution", {})
+        started, finished = execution.get("iopub.execute_input"), execution.get("shell.execute_reply")
+        if cell.cell_type != "code" or not (started and finished):
+            continue
+        seconds = (datetime.fromisoformat(finished.rstrip("Z")) - datetime.fromisoformat(started.rstrip("Z"))).total_seconds()
+        rows.append((i, (cell.source.splitlines() or [""])[0][:60], seconds))
+    return rows
+
+
+def _kernel(kernel_name, cwd):
+    _, KernelManager, _ = _jupyter()
+    key = (kernel_name, str(cwd))
+    km = _KERNEL.get(key)
+    if km is None or not km.is_alive():
+        km = KernelManager(kernel_name=kernel_name)
+        km.start_kernel(cwd=str(cwd))
+        _KERNEL[key] = km
+    return km
+
+
+def _discard_kernel(kernel_name, cwd):
+    """Shut down and forget this process's kernel, so the next run starts a fresh one."""
+    km = _KERNEL.pop((kernel_name, str(cwd)), None)
+    if km is not None:
+        km.shutdown_kernel(now=True)
+
+
+def execute_ipynb(path, params, out_path, cwd, timeout=None, fresh=False):
+    """Execute one parameter set of a Jupyter notebook in `cwd`, reusing this process's kernel unless `fresh`."""
+    nbformat, _, NotebookClient = _jupyter()
+    nb = nbformat.read(str(path), as_version=4)
+    kernelspec = nb.metadata.get("kernelspec", {})
+    kernel_name = kernelspec.get("name", "python3")
+    language = kernelspec.get("language", "python").lower()
+    inject_parameters(nb, params, language)
+
+    km = None if fresh else _kernel(kernel_name, cwd)
+    client = NotebookClient(nb, km=km, timeout=timeout, kernel_name=kernel_name, resources={"metadata": {"path": str(cwd)}})
+    error = None
+    try:
+        if km is None:
+            client.execute()
+        else:
+            # Start from a clean namespace and working folder in the reused kernel
+            client.kc = km.client()
+            try:
+                client.kc.start_channels()
+                client.kc.wait_for_ready(timeout=60)
+                reset = RESET_CODE.get(language)
+                if reset:
+                    client.kc.execute_interactive(reset.format(cwd=_literal(str(cwd), language)), timeout=60)
+                client.reset_execution_trackers()
+                for index, cell in enumerate(nb.cells):
+                    client.execute_cell(cell, index)
+            finally:
+                client.kc.stop_channels()
+    except Exception as e:  # noqa: BLE001 - any failure is recorded on the run
+        # CellExecutionError carries the kernel-side exception name and message
+        error = f"{getattr(e, 'ename', type(e).__name__)}: {getattr(e, 'evalue', e)}"
+        if km is not None:
+            # A failed run can leave the kernel busy (timeout) or in a broken state
+            _discard_kernel(kernel_name, cwd)
+    nbformat.write(nb, str(out_path))
+    return cell_timings(nb), error
+
+
+def execute_rmd(path, params, out_path, cwd):
+    """Render an R Markdown notebook with rmarkdown params, timing each chunk with a knitr hook."""
+    timing = out_path.with_suffix(".timing.tsv")
+    r_params = ", ".join(f"{k} = {_literal(v, 'r')}" for k, v in params.items())
+    expr = (
+        f'timing <- "{timing.as_posix()}"; '
+        "knitr::knit_hooks$set(timing = function(before, options) { "
+        "if (before) assign('.t0', Sys.time(), envir = globalenv()) else "
+        "cat(options$label, '\\t', as.numeric(Sys.time() - get('.t0', envir = globalenv()), units = 'secs'), "
+        "'\\n', file = timing, append = TRUE, sep = '') }); "
+        "knitr::opts_chunk$set(timing = TRUE); "
+        f'rmarkdown::render("{path.as_posix()}", params = list({r_params}), '
+        f'output_dir = "{out_path.parent.as_posix()}", output_file = "{out_path.name}", knit_root_dir = "{cwd.as_posix()}")'
+    )
+    proc = subprocess.run(["Rscript", "-e", expr], check=False, capture_output=True, text=True)
+    rows = []
+    if timing.exists():
+        for i, line in enumerate(timing.read_text(encoding="utf-8").splitlines()):
+            label, _, seconds = line.partition("\t")
+            rows.append((i, label, float(seconds or 0)))
+    error = None if proc.returncode == 0 else (proc.stderr.strip().splitlines() or ["failed"])[-1]
+    return rows, error
+
+
+def execute_mlx(path, params, out_path, cwd):
+    """Run a MATLAB live script with parameters pre-assigned in the workspace (total time only)."""
+    assignments = " ".join(f"{k} = {json.dumps(v)};" for k, v in params.items())
+    start = time.perf_counter()
+    proc = subprocess.run(
+        ["matlab", "-batch", f"cd('{cwd.as_posix()}'); {assignments} run('{path.as_posix()}');"],
+        check=False, capture_output=True, text=True,
+    )
+    out_path.with_suffix(".log").write_text(proc.stdout + proc.stderr, encoding="utf-8")
+    error = None if proc.returncode == 0 else (proc.stderr.strip().splitlines() or ["failed"])[-1]
+    return [(0, path.name, time.perf_counter() - start)], error
+
+
+def run_one(notebook, index, params, out_dir, cwd, timeout=None, fresh=False):
+    """Execute one parameter set (in a worker process) with working folder `cwd`. Returns a result record."""
+    notebook, out_dir, cwd = pathlib.Path(notebook), pathlib.Path(out_dir), pathlib.Path(cwd)
+    run_id = task_id(index, params) if params else "default"
+    start = time.perf_counter()
+    suffix = notebook.suffix.lower()
+    if suffix == ".ipynb":
+        out_path = out_dir / f"{run_id}.ipynb"
+        timings, error = execute_ipynb(notebook, params, out_path, cwd, timeout, fresh)
+    elif suffix == ".rmd":
+        out_path = out_dir / f"{run_id}.html"
+        timings, error = execute_rmd(notebook, params, out_path, cwd)
+    else:
+        out_path = out_dir / f"{run_id}.mlx"
+        timings, error = execute_mlx(notebook, params, out_path, cwd)
+    return {
+        "run": run_id,
+        "params": params,
+        "status": "error" if error else "ok",
+        "error": error,
+        "seconds": time.perf_counter() - start,
+        "output": out_path.name,
+        "cells": timings,
+    }
+
+
+def _shutdown_kernels():
+    for km in _KERNEL.values():
+        km.shutdown_kernel(now=True)
+    _KERNEL.clear()
+
+
+def _worker_init():
+    # Pool workers leave via os._exit, which skips atexit; multiprocessing finalizers still run
+    from multiprocessing.util import Finalize
+
+    Finalize(None, _shutdown_kernels, exitpriority=10)
+
+
+def run_notebook(notebook, grid=None, root=None, workers=None, timeout=None, fresh=False, cwd=None):
+    """
+    Execute a notebook headless for each parameter set of `grid`.
+
+    Parameter sets run in parallel worker processes; each worker keeps one
+    kernel alive and resets its namespace between runs instead of paying
+    kernel startup every time. Executed notebooks, a runs.json summary and a
+    per-cell timings.csv are written to results/notebooks/<notebook>/.
+
+    The notebook runs in its own folder, as it does when opened interactively,
+    so relative paths in it resolve the same way; `cwd` overrides that.
+
+    Returns
+    -------
+        list[dict]: One record per parameter set.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    notebook = pathlib.Path(notebook).resolve()
+    cwd = pathlib.Path(cwd).resolve() if cwd else notebook.parent
+    suffix = notebook.suffix.lower()
+    if suffix == ".ipynb":
+        _jupyter()
+    if suffix in (".rmd", ".mlx"):
+        exe = "Rscript" if suffix == ".rmd" else "matlab"
+        if not shutil.which(exe):
+            raise FileNotFoundError(f"{exe} not found on PATH.")
+    elif suffix != ".ipynb":
+        raise ValueError(f"Unsupported notebook type: {notebook.name}")
+
+    out_dir = root / RESULTS_DIR / notebook.stem
+    out_dir.mkdir(parents=True, exist_ok=True)
+    param_sets = expand_grid(grid) if grid else [{}]
+    workers = workers or min(len(param_sets), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if workers == 1:
+        records = [run_one(notebook, i, p, out_dir, cwd, timeout, fresh) for i, p in enumerate(param_sets)]
+        _shutdown_kernels()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) as pool:
+            jobs = [pool.submit(run_one, notebook, i, p, out_dir, cwd, timeout, fresh) for i, p in enumerate(param_sets)]
+            records = [job.result() for job in jobs]
+    wall = time.perf_counter() - start
+
+    write_text_atomic(out_dir / "runs.json", json.dumps(records, indent=2, default=str))
+    with open(out_dir / "timings.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["run", "cell", "source", "seconds"])
+        for record in records:
+            for index, source, seconds in record["cells"]:
+                writer.writerow([record["run"], index, source, f"{seconds:.3f}"])
+
+    slowest = sorted(((s, r["run"], i, src) for r in records for i, src, s in r["cells"]), reverse=True)[:5]
+    print("Slowest cells:")
+    for seconds, run, index, source in slowest:
+        print(f"  {seconds:8.2f}s  {run} cell {index}: {source}")
+    for record in records:
+        print(f"{record['run']}: {record['status']} in {record['seconds']:.1f}s" + (f" ({record['error']})" if record["error"] else ""))
+    print(f"{len(records)} runs on {workers} workers in {wall:.1f}s. Outputs: {out_dir.relative_to(root).as_posix()}")
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless, parallel notebook execution with parameter injection.")
+    parser.add_argument("notebook", help="Notebook to run (.ipynb, .Rmd or .mlx), e.g. src/s00_workflow.ipynb")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--grid", default=None, help="JSON/TOML file with {name: [values]}")
+    parser.add_argument("-p", "--param", action="append", default=[], help="name=v1,v2 (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel kernels")
+    parser.add_argument("--timeout", type=int, default=None, help="Per-cell timeout in seconds (.ipynb)")
+    parser.add_argument("--fresh", action="store_true", help="Start a new kernel for every run")
+    parser.add_argument("--cwd", default=None, help="Working folder of the kernel (default: the notebook's folder)")
+    args = parser.parse_args(argv)
+    grid = load_grid(args.grid, args.param) if (args.grid or args.param) else None
+    records = run_notebook(args.notebook, grid, args.root, args.workers, args.timeout, args.fresh, args.cwd)
+    raise SystemExit(0 if all(r["status"] == "ok" for r in records) else 1)
+
+
+if __name__ == "__main__":
+    main()
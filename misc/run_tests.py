@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from .project_config import find_project_root, tool_section, write_text_atomic
+
+DURATIONS_FILE = ".cache/test_durations.json"
+TEST_SUFFIXES = {
+    "Python": (".py",),
+    "R": (".R", ".r"),
+    "Stata": (".do",),
+    "Matlab": (".m",),
+}
+EXECUTABLES = {
+    "R": ("Rscript",),
+    "Stata": ("stata-mp", "stata-se", "stata", "StataMP-64", "StataSE-64"),
+    "Matlab": ("matlab",),
+}
+TIMING_TAG = "TIMING|"
+# Project environments created by setup, and where each keeps its interpreter
+ENV_DIRS = (".venv", ".conda")
+ENV_PYTHONS = ("bin/python", "Scripts/python.exe", "python.exe")
+
+
+def project_language(root):
+    language = tool_section("cookiecutter", root).get("PROGRAMMING_LANGUAGE", "Python")
+    # "Stata (Pre-installation required)" -> "Stata"
+    return language.split(" ")[0]
+
+
+def discover_tests(root, language):
+    suffixes = TEST_SUFFIXES.get(language, ())
+    tests = root / "tests"
+    if not tests.is_dir():
+        return []
+    return sorted(p.relative_to(root).as_posix() for p in tests.glob("test_*") if p.suffix in suffixes)
+
+
+def load_durations(root):
+    try:
+        return json.loads((root / DURATIONS_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}, "tests": {}}
+
+
+def shard_tests(root, files, shards):
+    """
+    Split test files into `shards` groups of similar cost, assigning the most
+    expensive file to the least loaded shard first. The cost is the file's last
+    recorded duration, or its size when it has not been timed yet.
+    """
+    recorded = load_durations(root).get("files", {})
+    sizes = {rel: (root / rel).stat().st_size for rel in files}
+    # Put untimed files on the same scale as timed ones (about 1 s per 10 KB)
+    cost = {rel: recorded.get(rel, sizes[rel] / 10_000) for rel in files}
+    shards = max(1, min(shards, len(files)))
+    groups = [[] for _ in range(shards)]
+    load = [0.0] * shards
+    for rel in sorted(files, key=lambda f: -cost[f]):
+        # Ties (e.g. empty, untimed files) go to the shard with the fewest files
+        i = min(range(shards), key=lambda k: (load[k], len(groups[k])))
+        groups[i].append(rel)
+        load[i] += cost[rel]
+    return [sorted(g) for g in groups if g]
+
+
+def project_python(root):
+    """The interpreter of the project's .venv/.conda environment, else the one running this tool."""
+    for env in ENV_DIRS:
+        for rel in ENV_PYTHONS:
+            exe = root / env / rel
+            if exe.is_file():
+                return str(exe)
+    return sys.executable
+
+
+def find_executable(language):
+    for name in EXECUTABLES[language]:
+        exe = shutil.which(name)
+        if exe:
+            return exe
+    raise FileNotFoundError(f"No {language} executable found on PATH ({', '.join(EXECUTABLES[language])}).")
+
+
+def _parse_junit(path):
+    """Return ({test_id: seconds}, {file: seconds}, failed test ids) from a pytest junit XML report."""
+    tests, files, failed = {}, {}, []
+    for case in ET.parse(path).getroot().iter("testcase"):
+        module = case.get("classname", "")
+        test_id = f"{module}::{case.get('name')}"
+        seconds = float(case.get("time", 0))
+        tests[test_id] = seconds
+        rel = case.get("file") or module.rsplit(".", 1)[0].replace(".", "/") + ".py"
+        files[rel] = files.get(rel, 0.0) + seconds
+        if case.find("failure") is not None or case.find("error") is not None:
+            failed.append(test_id)
+    return tests, files, failed
+
+
+def _parse_timings(output):
+    """Parse `TIMING|file|seconds|ok` lines printed by the R/Stata/Matlab shard drivers."""
+    files, failed = {}, []
+    for line in output.splitlines():
+        if line.startswith(TIMING_TAG):
+            _, rel, seconds, status = line.strip().split("|")
+            files[rel] = float(seconds)
+            if status != "ok":
+                failed.append(rel)
+    return files, failed
+
+
+def _r_driver(files):
+    calls = "\n".join(f'run("{rel}")' for rel in files)
+    return (
+        "run <- function(f) {\n"
+        "  t0 <- Sys.time()\n"
+        "  ok <- tryCatch({ testthat::test_file(f, stop_on_failure = TRUE); TRUE }, error = function(e) FALSE)\n"
+        f'  cat("{TIMING_TAG}", f, "|", as.numeric(Sys.time() - t0, units = "secs"), "|", if (ok) "ok" else "fail", "\\n", sep = "")\n'
+        "}\n" + calls + "\n"
+    )
+
+
+def _stata_driver(root, files):
+    lines = [f'cd "{root.as_posix()}"']
+    for rel in files:
+        lines += [
+            "timer clear 1",
+            "timer on 1",
+            f'capture noisily do "{rel}"',
+            "local rc = _rc",
+            "timer off 1",
+            "quietly timer list 1",
+            f'display "{TIMING_TAG}{rel}|" r(t1) "|" cond(`rc\' == 0, "ok", "fail")',
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def _matlab_driver(files):
+    parts = []
+    for rel in files:
+        parts.append(
+            f"t0 = tic; ok = 'ok'; try, run('{rel}'); catch, ok = 'fail'; end; "
+            f"fprintf('{TIMING_TAG}%s|%f|%s\\n', '{rel}', toc(t0), ok);"
+        )
+    return " ".join(parts)
+
+
+def run_shard(root, language, files, workdir, index=0):
+    """
+    Run one shard's files in a single interpreter, so startup is paid once per shard.
+
+    Returns
+    -------
+        dict: {"tests": {id: s}, "files": {file: s}, "failed": [...], "seconds": s}
+    """
+    start = time.perf_counter()
+    tests = {}
+    if language == "Python":
+        report = workdir / f"junit-{index}.xml"
+        proc = subprocess.run(
+            [project_python(root), "-m", "pytest", "-q", "-p", "no:cacheprovider",
+             f"--junitxml={report}", "-o", "junit_family=xunit1", *files],
+            cwd=root, capture_output=True, text=True,
+        )
+        if report.exists():
+            tests, timings, failed = _parse_junit(report)
+        else:
+            print(proc.stderr or proc.stdout)
+            timings, failed = {}, list(files)
+    else:
+        exe = find_executable(language)
+        if language == "R":
+            driver = workdir / f"shard-{index}.R"
+            driver.write_text(_r_driver(files), encoding="utf-8")
+            proc = subprocess.run([exe, str(driver)], cwd=root, capture_output=True, text=True)
+            output = proc.stdout
+        elif language == "Stata":
+            driver = workdir / f"shard-{index}.do"
+            driver.write_text(_stata_driver(root, files), encoding="utf-8")
+            subprocess.run([exe, "-b", "do", str(driver)], cwd=workdir, capture_output=True, text=True)
+            log = driver.with_suffix(".log")
+            output = log.read_text(encoding="utf-8", errors="ignore") if log.exists() else ""
+        else:
+            proc = subprocess.run(
+                [exe, "-batch", f"cd('{root.as_posix()}'); {_matlab_driver(files)}"],
+                capture_output=True, text=True,
+            )
+            output = proc.stdout
+        timings, failed = _parse_timings(output)
+        failed += [rel for rel in files if rel not in timings]
+    return {"tests": tests, "files": timings, "failed": failed, "seconds": time.perf_counter() - start}
+
+
+def run_tests(root=None, language=None, shards=None, files=None):
+    """
+    Run the tests/ suite in parallel shards and record per-test and per-file durations.
+
+    Each shard is one interpreter process (pytest, Rscript, Stata batch or
+    `matlab -batch`) that runs all of its files, and shards run concurrently.
+    Durations are written to `.cache/test_durations.json` and used to balance
+    the shards of the next run (and the CI shards rendered by ci_workflows).
+
+    Returns
+    -------
+        bool: True if all tests passed.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    language = language or project_language(root)
+    if language not in TEST_SUFFIXES:
+        raise ValueError(f"No test runner for language '{language}'.")
+    files = files or discover_tests(root, language)
+    if not files:
+        print("No test files found in tests/.")
+        return True
+    shards = shards or min(len(files), os.cpu_count() or 1)
+    groups = shard_tests(root, files, shards)
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp, ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        jobs = [pool.submit(run_shard, root, language, g, pathlib.Path(tmp), i) for i, g in enumerate(groups)]
+        results = [job.result() for job in jobs]
+    wall = time.perf_counter() - start
+
+    durations = load_durations(root)
+    failed = []
+    for result in results:
+        durations["files"].update(result["files"])
+        durations["tests"].update(result["tests"])
+        failed += result["failed"]
+    write_text_atomic(root / DURATIONS_FILE, json.dumps(durations, indent=2, sort_keys=True))
+
+    # Per-test timings where the runner reports them (pytest), per-file otherwise
+    timed = {}
+    for result in results:
+        timed.update(result["tests"] or result["files"])
+    print("Slowest tests:")
+    for test_id, seconds in sorted(timed.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {seconds:8.2f}s  {test_id}")
+    busy = sum(r["seconds"] for r in results)
+    print(f"{len(files)} files in {len(groups)} shards: {wall:.1f}s wall, {busy:.1f}s total shard time.")
+    for item in failed:
+        print(f"FAILED {item}")
+    return not failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the tests/ suite in parallel shards with per-test timing.")
+    parser.add_argument("files", nargs="*", help="Test files (default: tests/test_* for the project language)")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--language", choices=list(TEST_SUFFIXES), default=None, help="Default: PROGRAMMING_LANGUAGE")
+    parser.add_argument("-n", "--shards", type=int, default=None, help="Parallel shards (default: one per core)")
+    args = parser.parse_args(argv)
+    ok = run_tests(args.root, args.language, args.shards, args.files or None)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
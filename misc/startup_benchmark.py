@@ -0,0 +1,84 @@
+import argparse
+import re
+import subprocess
+import sys
+import time
+
+from .cli import COMMANDS
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+DISPATCHER_BUDGET_MS = 30.0
+# Subcommands import their own module; heavy optional dependencies must wait until they are used
+COMMAND_BUDGET_MS = 150.0
+
+
+def measure(args, repeat=3):
+    """
+    Run `python -X importtime -m misc.cli <args>` and return
+    (best wall time in ms, cumulative import time in ms, slowest top-level imports).
+    `args=None` measures a bare interpreter (`-c pass`) as the baseline.
+    """
+    target = ["-c", "pass"] if args is None else ["-m", f"{__package__}.cli", *args]
+    cmd = [sys.executable, "-X", "importtime", *target]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        wall = (time.perf_counter() - start) * 1000
+        if best is None or wall < best[0]:
+            best = (wall, proc.stderr)
+    wall, stderr = best
+    top_level = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:  # one space of indent = imported directly
+            top_level.append((int(match.group(2)) / 1000, match.group(4)))
+    imports_ms = sum(ms for ms, _ in top_level)
+    return wall, imports_ms, sorted(top_level, reverse=True)
+
+
+def run_benchmark(budget_ms=DISPATCHER_BUDGET_MS, commands=None, repeat=3, command_budget_ms=COMMAND_BUDGET_MS):
+    """
+    Measure the startup cost of `--help` for the dispatcher and each subcommand,
+    relative to a bare interpreter.
+
+    Returns
+    -------
+        bool: True if the dispatcher's own `--help` adds at most `budget_ms` and every
+        subcommand's `--help` at most `command_budget_ms` of wall time.
+    """
+    base_wall, base_imports, base_modules = measure(None, repeat)
+    base_modules = {module for _, module in base_modules}
+    print(f"{'python -c pass':<28} wall {base_wall:7.1f} ms   imports {base_imports:7.1f} ms")
+    ok = True
+    for name in [None, *(commands or COMMANDS)]:
+        args = ["--help"] if name is None else [name, "--help"]
+        wall, imports_ms, slowest = measure(args, repeat)
+        label = "cli --help" if name is None else f"{name} --help"
+        print(f"{label:<28} wall {wall - base_wall:+7.1f} ms   imports {imports_ms - base_imports:+7.1f} ms")
+        for ms, module in [s for s in slowest if s[1] not in base_modules][:3]:
+            print(f"{'':<30}{module}: {ms:.1f} ms")
+        limit = budget_ms if name is None else command_budget_ms
+        if wall - base_wall > limit:
+            print(f"{label} exceeds the {limit:.0f} ms startup budget.")
+            ok = False
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup benchmark of the misc CLI (-X importtime).")
+    parser.add_argument(
+        "--budget-ms", type=float, default=DISPATCHER_BUDGET_MS, help="Startup budget of `cli --help` over a bare interpreter"
+    )
+    parser.add_argument(
+        "--command-budget-ms", type=float, default=COMMAND_BUDGET_MS, help="Startup budget of each `<command> --help`"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command (best is reported)")
+    parser.add_argument("commands", nargs="*", help="Subcommands to measure (default: all)")
+    args = parser.parse_args(argv)
+    ok = run_benchmark(args.budget_ms, args.commands or None, args.repeat, args.command_budget_ms)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import time
+
+from .data_manifest import SKIP_FILES, dataset_roots
+from .ignore_patterns import walk
+from .project_config import find_project_root, tool_section
+
+BACKENDS = ("Datalad", "DVC")
+DEFAULT_BATCH_SIZE = 200
+DVC_PUSHED = re.compile(r"(\d+) files? pushed")
+
+
+def tracking_settings(root):
+    """
+    Read `[tool.data_tracking]`.
+
+    Returns
+    -------
+        tuple: (jobs, batch_size); jobs = 0 in the config means one per CPU core.
+    """
+    section = tool_section("data_tracking", root)
+    jobs = int(section.get("jobs", 0)) or (os.cpu_count() or 1)
+    batch_size = int(section.get("batch_size", DEFAULT_BATCH_SIZE))
+    return jobs, max(1, batch_size)
+
+
+def tree_stats(root, paths):
+    """File count and total bytes under `paths`, for throughput reporting."""
+    files = total = 0
+    for path in paths:
+        path = root / path
+        if path.is_file():
+            files, total = files + 1, total + path.stat().st_size
+            continue
+        for _, entry in walk(path, root=root):
+            if entry.name not in SKIP_FILES and entry.is_file(follow_symlinks=False):
+                files += 1
+                total += entry.stat(follow_symlinks=False).st_size
+    return files, total
+
+
+def batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _run(cmd, root, capture=False):
+    print(" ".join(cmd[:8]) + (" ..." if len(cmd) > 8 else ""))
+    if not capture:
+        return subprocess.run(cmd, cwd=root).returncode == 0
+    proc = subprocess.run(cmd, cwd=root, stdout=subprocess.PIPE, text=True)
+    return proc.returncode == 0, proc.stdout
+
+
+def _dvc_checksum_jobs(root, jobs):
+    """
+    Set `core.checksum_jobs` (dvc add takes its hashing parallelism only from the
+    repo config) and return a function restoring the user's previous value.
+    """
+    proc = subprocess.run(
+        ["dvc", "config", "--local", "core.checksum_jobs"], cwd=root, capture_output=True, text=True
+    )
+    previous = proc.stdout.strip() if proc.returncode == 0 else None
+    _run(["dvc", "config", "--local", "core.checksum_jobs", str(jobs)], root)
+
+    def restore():
+        if previous is None:
+            _run(["dvc", "config", "--local", "--unset", "core.checksum_jobs"], root)
+        else:
+            _run(["dvc", "config", "--local", "core.checksum_jobs", previous], root)
+
+    return restore
+
+
+def save_command(backend, paths, jobs, message):
+    """
+    Command that records `paths` in the data-tracking backend.
+
+    Dataset folders are passed as a whole, so DataLad hashes their files with
+    `jobs` parallel annex processes and DVC tracks each folder as one .dvc
+    entry instead of one pointer file per small file.
+    """
+    if backend == "Datalad":
+        return ["datalad", "save", "-J", str(jobs), "-m", message, *paths]
+    return ["dvc", "add", *paths]
+
+
+def push_command(backend, remote, jobs):
+    if backend == "Datalad":
+        # JSON results name every file actually copied to the sibling
+        cmd = ["datalad", "-f", "json", "push", "-J", str(jobs)]
+        return cmd + (["--to", remote] if remote else [])
+    cmd = ["dvc", "push", "-j", str(jobs)]
+    return cmd + (["-r", remote] if remote else [])
+
+
+def pushed_stats(backend, output, root):
+    """
+    Files (and, for DataLad, bytes) actually transferred, from the push output.
+
+    Returns
+    -------
+        tuple: (files, bytes); bytes is None for DVC, which only reports a file count.
+    """
+    if backend == "DVC":
+        match = DVC_PUSHED.search(output)
+        return (int(match.group(1)) if match else 0), None
+    files = n_bytes = 0
+    for line in output.splitlines():
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if result.get("action") == "copy" and result.get("status") == "ok" and result.get("path"):
+            path = pathlib.Path(result["path"])
+            path = path if path.is_absolute() else root / path
+            files += 1
+            n_bytes += path.stat().st_size if path.is_file() else 0
+    return files, n_bytes
+
+
+def report(label, files, n_bytes, seconds):
+    files_s = files / seconds if seconds else 0
+    if n_bytes is None:
+        print(f"{label}: {files} files in {seconds:.1f}s ({files_s:.1f} files/s)")
+        return
+    mb_s = n_bytes / 1024**2 / seconds if seconds else 0
+    print(f"{label}: {files} files, {n_bytes / 1024**2:.1f} MB in {seconds:.1f}s ({mb_s:.1f} MB/s, {files_s:.1f} files/s)")
+
+
+def save_and_push(root=None, backend=None, paths=None, remote=None, jobs=None, batch_size=None, push=True, message=None):
+    """
+    Save the data tree with DataLad or DVC in parallel batches and push it.
+
+    Args:
+        backend (str): "Datalad" or "DVC". Defaults to the project's VERSION_CONTROL.
+        paths (list): Paths to save. Defaults to the `[tool.datasets]` folders.
+        remote (str): Sibling (DataLad) or remote (DVC) to push to; None uses the default.
+        jobs (int): Parallel hashing/transfer jobs. Defaults to `[tool.data_tracking]` jobs.
+        batch_size (int): Paths per save call.
+        push (bool): Push after saving.
+
+    Returns
+    -------
+        bool: True if every save and the push succeeded.
+    """
+    root = pathlib.Path(root or find_project_root()).resolve()
+    backend = backend or tool_section("cookiecutter", root).get("VERSION_CONTROL", "None")
+    if backend not in BACKENDS:
+        raise ValueError(f"Data tracking needs VERSION_CONTROL Datalad or DVC, not '{backend}'.")
+    exe = "datalad" if backend == "Datalad" else "dvc"
+    if not shutil.which(exe):
+        raise FileNotFoundError(f"{exe} not found on PATH.")
+
+    configured_jobs, configured_batch = tracking_settings(root)
+    jobs = jobs or configured_jobs
+    batch_size = batch_size or configured_batch
+    if paths is None:
+        paths = [p.relative_to(root).as_posix() for p in dataset_roots(root)]
+    if not paths:
+        print("Nothing to save.")
+        return True
+    files, n_bytes = tree_stats(root, paths)
+    message = message or "Update data"
+
+    ok = True
+    start = time.perf_counter()
+    restore = _dvc_checksum_jobs(root, jobs) if backend == "DVC" else None
+    try:
+        for batch in batches(paths, batch_size):
+            ok = _run(save_command(backend, batch, jobs, message), root) and ok
+    finally:
+        if restore:
+            restore()
+    report(f"{backend} save (-J {jobs})", files, n_bytes, time.perf_counter() - start)
+
+    if push and ok:
+        start = time.perf_counter()
+        ok, output = _run(push_command(backend, remote, jobs), root, capture=True)
+        seconds = time.perf_counter() - start
+        if backend == "DVC":
+            print(output, end="")
+        pushed, pushed_bytes = pushed_stats(backend, output, root)
+        report(f"{backend} push (-J {jobs})", pushed, pushed_bytes, seconds)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel, batched DataLad/DVC save and push of the data tree.")
+    parser.add_argument("paths", nargs="*", help="Paths to save (default: [tool.datasets] folders)")
+    parser.add_argument("--root", default=None, help="Project root (default: nearest pyproject.toml)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="Default: VERSION_CONTROL")
+    parser.add_argument("--remote", default=None, help="DataLad sibling or DVC remote to push to")
+    parser.add_argument("-J", "--jobs", type=int, default=None, help="Parallel jobs (default: [tool.data_tracking])")
+    parser.add_argument("--batch-size", type=int, default=None, help="Paths per save call")
+    parser.add_argument("--no-push", action="store_true", help="Only save")
+    parser.add_argument("-m", "--message", default=None, help="Commit message")
+    args = parser.parse_args(argv)
+    ok = save_and_push(
+        args.root, args.backend, args.paths or None, args.remote, args.jobs, args.batch_size, not args.no_push, args.message
+    )
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import pathlib
+import sys
+
+import pytest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = REPO_ROOT / "{{cookiecutter.repo_name}}"
+
+# The misc/ tools use relative imports and run as `python -m misc.<module>` from the repo root
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def project(tmp_path):
+    """An empty project root: a folder holding a pyproject.toml."""
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\n', encoding="utf-8")
+    return tmp_path
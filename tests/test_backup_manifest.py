@@ -0,0 +1,72 @@
+import pathlib
+
+from misc import backup_manifest
+from misc.backup_manifest import diff_manifest, load_manifest, manifest_path, push
+
+
+def _data(project):
+    (project / "data").mkdir()
+    for name in ("a.csv", "b.csv"):
+        (project / "data" / name).write_bytes(b"x" * 1000)
+
+
+def _fake_rclone(monkeypatch):
+    calls = []
+    monkeypatch.setattr(backup_manifest, "_run_rclone", lambda root, args, flags=(): calls.append(args[0]) or True)
+    return calls
+
+
+def test_incremental_push_sends_only_changes(project, monkeypatch):
+    _data(project)
+    calls = _fake_rclone(monkeypatch)
+    assert push("data", "remote:x", root=project, full_verify=True)["files"] == 2
+    assert push("data", "remote:x", root=project)["files"] == 0
+    (project / "data" / "c.csv").write_bytes(b"y" * 10)
+    (project / "data" / "a.csv").unlink()
+    report = push("data", "remote:x", root=project)
+    assert (report["files"], report["bytes"]) == (1, 10)
+    assert calls == ["sync", "check", "copy", "delete"]
+
+
+def test_full_verify_reports_only_transferred_files(project, monkeypatch):
+    _data(project)
+    _fake_rclone(monkeypatch)
+    push("data", "remote:x", root=project, full_verify=True)
+    (project / "data" / "c.csv").write_bytes(b"y" * 10)
+    report = push("data", "remote:x", root=project, full_verify=True)
+    assert (report["files"], report["bytes"]) == (1, 10)
+
+
+def test_touched_but_identical_file_is_not_modified(project, monkeypatch):
+    _data(project)
+    _fake_rclone(monkeypatch)
+    push("data", "remote:x", root=project, full_verify=True)
+    (project / "data" / "a.csv").write_bytes(b"x" * 1000)
+    manifest = load_manifest(manifest_path(project, "data", "remote:x"))
+    added, modified, deleted, _ = diff_manifest(project, "data", manifest)
+    assert (added, modified, deleted) == ([], [], [])
+
+
+def test_full_verify_passes_rcloneignore_filters(project, monkeypatch):
+    (project / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\n\n[tool.rcloneignore]\n'
+        'patterns = ["*.tmp", "data/scratch/", "results/", "!keep.tmp"]\n',
+        encoding="utf-8",
+    )
+    _data(project)
+    calls = []
+
+    def fake(root, args, flags=()):
+        listing = args[args.index("--filter-from") + 1]
+        calls.append((args[:3], pathlib.Path(listing).read_text(encoding="utf-8").split("\n")))
+        return True
+
+    monkeypatch.setattr(backup_manifest, "_run_rclone", fake)
+    push("data", "remote:x", root=project, full_verify=True)
+    src = str(project / "data")
+    assert [args for args, _ in calls] == [["sync", src, "remote:x"], ["check", src, "remote:x"]]
+    rules = calls[0][1]
+    assert rules[:2] == ["+ keep.tmp", "+ keep.tmp/**"]
+    assert "- /scratch/**" in rules and "- *.tmp" in rules
+    assert "- results/**" in rules
+    assert not any(".venv" in rule for rule in rules)
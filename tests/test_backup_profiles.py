@@ -0,0 +1,39 @@
+import json
+import stat
+import sys
+
+from misc.backup_profiles import parse_stats, transfer
+
+FAKE_RCLONE = """#!{python}
+import json, sys
+if sys.argv[1] == "listremotes":
+    print("remote: s3")
+    raise SystemExit(0)
+print(json.dumps({{"level": "error", "msg": "one file failed"}}), file=sys.stderr)
+print(json.dumps({{"level": "notice", "msg": "stats", "stats": {{"bytes": 2097152, "transfers": 3}}}}), file=sys.stderr)
+"""
+
+
+def test_parse_stats_uses_last_stats_entry():
+    log = "\n".join([
+        "not json",
+        json.dumps({"level": "notice", "stats": {"bytes": 1, "transfers": 1}}),
+        json.dumps({"level": "notice", "stats": {"bytes": 5, "transfers": 2}}),
+    ])
+    assert parse_stats(log) == {"bytes": 5, "files": 2}
+    assert parse_stats("") == {"bytes": 0, "files": 0}
+
+
+def test_pull_reports_bytes_actually_transferred(project, capsys):
+    (project / "data").mkdir()
+    # Overwrites shrink the tree; the report must not depend on net growth
+    (project / "data" / "big.bin").write_bytes(b"x" * 10_000_000)
+    (project / "bin").mkdir()
+    rclone = project / "bin" / "rclone"
+    rclone.write_text(FAKE_RCLONE.format(python=sys.executable), encoding="utf-8")
+    rclone.chmod(rclone.stat().st_mode | stat.S_IXUSR)
+
+    assert transfer("pull", "remote:data", root=project)
+    captured = capsys.readouterr()
+    assert "3 files, 2.0 MB" in captured.out
+    assert "one file failed" in captured.err
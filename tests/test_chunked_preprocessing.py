@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from misc.chunked_preprocessing import process_chunked
+
+
+@pytest.fixture
+def drifting_csv(tmp_path):
+    # With 2-row chunks, `value` is int64 in the first chunk and a string in the last
+    src = tmp_path / "in.csv"
+    src.write_text("id,value\n1,10\n2,20\n3,\n4,40\n5,abc\n", encoding="utf-8")
+    return src
+
+
+def test_type_drift_fails_clearly_and_keeps_previous_output(tmp_path, drifting_csv):
+    dest = tmp_path / "out.parquet"
+    dest.write_bytes(b"previous")
+    with pytest.raises(ValueError, match="column 'value'"):
+        process_chunked(drifting_csv, dest, chunk_rows=2)
+    assert dest.read_bytes() == b"previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in.csv", "out.parquet"]
+
+
+def test_dtype_pins_types_across_chunks(tmp_path, drifting_csv):
+    import pyarrow.parquet as pq
+
+    dest = tmp_path / "out.parquet"
+    report = process_chunked(drifting_csv, dest, chunk_rows=2, dtype={"value": "string"})
+    assert report["rows_out"] == 5 and report["chunks"] == 3
+    table = pq.read_table(dest)
+    assert table.column("value").to_pylist() == ["10", "20", None, "40", "abc"]
+
+
+def test_missing_values_in_later_chunks_fit_the_first_chunk_type(tmp_path):
+    import pyarrow.parquet as pq
+
+    src = tmp_path / "in.csv"
+    src.write_text("id,value\n1,10\n2,20\n3,\n4,40\n", encoding="utf-8")
+    process_chunked(src, tmp_path / "out.parquet", chunk_rows=2)
+    assert pq.read_table(tmp_path / "out.parquet").column("value").to_pylist() == [10, 20, None, 40]
+
+
+def test_failing_step_publishes_nothing(tmp_path, drifting_csv):
+    def boom(chunk):
+        if chunk["id"].iloc[0] > 2:
+            raise RuntimeError("step failed")
+        return chunk
+
+    with pytest.raises(RuntimeError):
+        process_chunked(drifting_csv, tmp_path / "out.csv", steps=[boom], chunk_rows=2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in.csv"]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_all_rows_filtered_out_publishes_an_empty_output(tmp_path, drifting_csv, suffix):
+    import pandas as pd
+
+    dest = tmp_path / f"out{suffix}"
+    dest.write_bytes(b"previous")
+    report = process_chunked(drifting_csv, dest, steps=[lambda chunk: chunk[chunk["id"] > 100]], chunk_rows=2)
+    assert (report["rows_in"], report["rows_out"]) == (5, 0)
+    result = pd.read_parquet(dest) if suffix == ".parquet" else pd.read_csv(dest)
+    assert list(result.columns) == ["id", "value"] and len(result) == 0
+
+
+def test_tab_separated_input_by_suffix(tmp_path):
+    import pandas as pd
+
+    src = tmp_path / "in.TAB"
+    src.write_text("id\tname\n1\ta, b\n", encoding="utf-8")
+    process_chunked(src, tmp_path / "out.csv")
+    assert pd.read_csv(tmp_path / "out.csv").to_dict("records") == [{"id": 1, "name": "a, b"}]
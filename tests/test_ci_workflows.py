@@ -0,0 +1,36 @@
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from misc.ci_workflows import render_workflow
+
+
+def test_uv_lock_workflow_runs_pytest_in_the_locked_env(project):
+    (project / "uv.lock").write_text("version = 1\n", encoding="utf-8")
+    rel, text = render_workflow(project, host="GitHub", shards=1)
+    assert rel == ".github/workflows/ci.yml"
+    steps = yaml.safe_load(text)["jobs"]["tests"]["steps"]
+    commands = {step.get("name"): step.get("run") for step in steps}
+    assert commands["Install dependencies"] == "pip install uv && uv sync --frozen"
+    # pytest is rarely a locked project dependency, so uv adds it for the run
+    assert commands["Run tests (shard ${{ matrix.shard }})"].startswith("uv run --with pytest python -m pytest ")
+
+
+def test_requirements_workflow_installs_pytest(project):
+    _, text = render_workflow(project, host="GitLab", shards=1)
+    job = yaml.safe_load(text)["tests"]
+    assert "pytest" in job["before_script"][-1]
+    assert job["script"] == ["python -m pytest $TEST_FILES"]
+
+
+def test_conda_workflow_installs_pytest_into_the_env(project):
+    (project / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\n\n[tool.cookiecutter]\nPYTHON_ENV_MANAGER = "Conda"\n', encoding="utf-8"
+    )
+    _, text = render_workflow(project, host="GitHub", shards=1)
+    job = yaml.safe_load(text)["jobs"]["tests"]
+    commands = {step.get("name"): step.get("run") for step in job["steps"]}
+    install = commands["Install dependencies"].split(" && ")
+    assert install == ["conda env update --name base --file environment.yml", "conda install --name base --yes pytest"]
+    assert commands["Run tests (shard ${{ matrix.shard }})"].startswith("python -m pytest ")
+    assert job["defaults"] == {"run": {"shell": "bash -el {0}"}}
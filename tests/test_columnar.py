@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from misc.columnar import ingest, ingest_file, load
+
+
+@pytest.fixture
+def late_string_csv(tmp_path):
+    src = tmp_path / "late.csv"
+    rows = "".join(f"{i},{i * 2}\n" for i in range(2000))
+    src.write_text("id,value\n" + rows + "2000,abc\n", encoding="utf-8")
+    return src
+
+
+def test_late_value_falls_back_to_string(tmp_path, late_string_csv, capsys):
+    dest = tmp_path / "late"
+    # A small block makes the first block infer int64 for `value`
+    assert ingest_file(late_string_csv, dest, block_size=1024) == 2001
+    assert "column 'value'" in capsys.readouterr().out
+
+    import pyarrow.dataset as ds
+
+    table = ds.dataset(dest).to_table()
+    assert str(table.schema.field("id").type) == "int64"
+    assert str(table.schema.field("value").type) == "string"
+    assert table.column("value").to_pylist()[-1] == "abc"
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_failed_conversion_publishes_nothing(tmp_path, late_string_csv):
+    dest = tmp_path / "late"
+    with pytest.raises(Exception, match="abc"):
+        ingest_file(late_string_csv, dest, block_size=1024, column_types={"value": "int64"})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["late.csv"]
+
+
+def test_ingest_and_load_projection(project):
+    raw = project / "data" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "points.csv").write_text("x,year\n1,2020\n2,2021\n3,2020\n", encoding="utf-8")
+    assert ingest(project, column_types={"x": "float64"}) == ["data/interim/points"]
+    assert ingest(project, column_types={"x": "float64"}) == []
+
+    import pyarrow.dataset as ds
+
+    table = load("points", columns=["x"], filter=ds.field("year") == 2020, root=project)
+    assert table.column("x").to_pylist() == [1.0, 3.0]
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+
+from conftest import TEMPLATE_DIR
+
+from misc.data_manifest import CACHE_FILE, MANIFEST_FILE, build_manifest, dataset_roots
+
+
+def _dataset(project):
+    folder = project / "data" / "raw"
+    folder.mkdir(parents=True)
+    (folder / "a.csv").write_text("x\n1\n", encoding="utf-8")
+    (folder / "b.csv").write_text("x\n2\n", encoding="utf-8")
+    (folder / ".gitkeep").write_text("", encoding="utf-8")
+    return folder
+
+
+def test_manifest_lists_files_and_skips_gitkeep(project):
+    _dataset(project)
+    manifest = build_manifest(project)
+    assert sorted(manifest["files"]) == ["data/raw/a.csv", "data/raw/b.csv"]
+    assert manifest["datasets"]["data/raw"]["file_count"] == 2
+    assert json.loads((project / MANIFEST_FILE).read_text(encoding="utf-8"))["files"] == manifest["files"]
+
+
+def test_unchanged_files_come_from_cache(project, capsys):
+    _dataset(project)
+    build_manifest(project)
+    capsys.readouterr()
+    build_manifest(project)
+    assert "(0 hashed, 2 from cache)" in capsys.readouterr().out
+
+
+def test_modified_file_is_rehashed(project, capsys):
+    folder = _dataset(project)
+    before = build_manifest(project)
+    (folder / "a.csv").write_text("x\n3\n", encoding="utf-8")
+    st = (folder / "a.csv").stat()
+    os.utime(folder / "a.csv", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    capsys.readouterr()
+    after = build_manifest(project)
+    assert "(1 hashed, 1 from cache)" in capsys.readouterr().out
+    assert after["files"]["data/raw/a.csv"]["digest"] != before["files"]["data/raw/a.csv"]["digest"]
+    assert after["datasets"]["data/raw"]["digest"] != before["datasets"]["data/raw"]["digest"]
+
+
+def test_dry_run_writes_nothing(project):
+    _dataset(project)
+    build_manifest(project, write=False)
+    assert not (project / MANIFEST_FILE).exists()
+    assert not (project / CACHE_FILE).exists()
+
+
+def test_generated_layout_datasets_are_the_data_folders(tmp_path):
+    # The layout main_setup.intro() creates, with the template's [tool.datasets]
+    shutil.copy(TEMPLATE_DIR / "pyproject.toml", tmp_path / "pyproject.toml")
+    folders = ["raw", "interim", "processed", "external", "proprietary", "sensitive"]
+    for name in folders:
+        (tmp_path / "data" / name).mkdir(parents=True)
+        (tmp_path / "data" / name / ".gitkeep").touch()
+    (tmp_path / "data" / "README.md").write_text("# Data Folder Structure\n", encoding="utf-8")
+    assert [p.name for p in dataset_roots(tmp_path)] == sorted(folders)
+
+    (tmp_path / "data" / "raw" / "survey.csv").write_text("x\n1\n", encoding="utf-8")
+    manifest = build_manifest(tmp_path)
+    assert list(manifest["files"]) == ["data/raw/survey.csv"]
@@ -0,0 +1,35 @@
+import os
+import stat
+
+import pytest
+
+from misc.dcas_package import build_package
+
+
+def _project(project):
+    (project / "pyproject.toml").write_text('[tool.dcas]\npatterns = ["README.md", "docs"]\n', encoding="utf-8")
+    (project / "README.md").write_text("# demo\n", encoding="utf-8")
+    (project / "docs").mkdir()
+    (project / "docs" / "notes.md").write_text("notes\n" * 1000, encoding="utf-8")
+    return project
+
+
+def test_archive_is_deterministic(project):
+    _project(project)
+    first = build_package(project, project / "a.tar.gz").read_bytes()
+    os.utime(project / "README.md", (0, 0))
+    second = build_package(project, project / "b.tar.gz").read_bytes()
+    assert first == second
+
+
+def test_failed_compressor_removes_partial_archive(project, tmp_path_factory, monkeypatch):
+    _project(project)
+    bin_dir = tmp_path_factory.mktemp("bin")
+    pigz = bin_dir / "pigz"
+    pigz.write_text("#!/bin/sh\ncat > /dev/null\nexit 3\n", encoding="utf-8")
+    pigz.chmod(pigz.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    out = project / "package.tar.gz"
+    with pytest.raises(RuntimeError, match="exit code 3"):
+        build_package(project, out)
+    assert not out.exists()
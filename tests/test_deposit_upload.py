@@ -0,0 +1,104 @@
+import email
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from misc.deposit_upload import STATE_FILE, load_state, main, publish_files
+
+
+class FakeDataverse(BaseHTTPRequestHandler):
+    uploads = []
+    existing = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        files = [{"dataFile": {"filename": name, "md5": md5}} for name, md5 in self.existing]
+        self._reply({"data": {"latestVersion": {"files": files}}})
+
+    def do_POST(self):
+        assert "Transfer-Encoding" not in self.headers
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        message = email.message_from_bytes(b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + raw)
+        part = message.get_payload()[0]
+        content = part.get_payload(decode=True)
+        self.uploads.append((part.get_filename(), content))
+        self._reply({"data": {"files": [{"dataFile": {"md5": hashlib.md5(content).hexdigest()}}]}})
+
+
+@pytest.fixture
+def dataverse():
+    FakeDataverse.uploads = []
+    FakeDataverse.existing = []
+    server = HTTPServer(("127.0.0.1", 0), FakeDataverse)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield {"kind": "dataverse", "url": f"http://127.0.0.1:{server.server_port}", "id": "doi:10.5072/FK2/X"}
+    server.shutdown()
+
+
+def _files(project):
+    (project / "results").mkdir()
+    for name in ("a.csv", "b.csv", "empty.txt"):
+        (project / "results" / name).write_bytes(b"" if name == "empty.txt" else name.encode() * 5000)
+
+
+def test_streamed_multipart_upload(project, dataverse):
+    _files(project)
+    report = publish_files(["results"], dataverse, root=project, workers=2)
+    assert sorted(report["uploaded"]) == ["results/a.csv", "results/b.csv", "results/empty.txt"]
+    uploaded = dict(FakeDataverse.uploads)
+    assert uploaded["results__a.csv"] == b"a.csv" * 5000
+    assert uploaded["results__empty.txt"] == b""
+
+
+def test_resume_from_state_log(project, dataverse):
+    _files(project)
+    publish_files(["results"], dataverse, root=project)
+    log = project / STATE_FILE
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 3
+
+    # A record torn by an interrupted run is ignored, not fatal
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"target": "dataverse:')
+    FakeDataverse.uploads = []
+    report = publish_files(["results"], dataverse, root=project)
+    assert FakeDataverse.uploads == []
+    assert len(report["skipped"]) == 3
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 3
+
+    (project / "results" / "b.csv").write_bytes(b"changed")
+    report = publish_files(["results"], dataverse, root=project)
+    assert report["uploaded"] == ["results/b.csv"]
+    assert len(load_state(log)) == 1
+
+
+def test_name_collision_with_different_content_fails(project, dataverse, monkeypatch):
+    _files(project)
+    FakeDataverse.existing = [
+        ("results__a.csv", hashlib.md5(b"a.csv" * 5000).hexdigest()),
+        ("results__b.csv", hashlib.md5(b"older version").hexdigest()),
+    ]
+    report = publish_files(["results"], dataverse, root=project)
+    assert report["skipped"] == ["results/a.csv"]
+    assert report["uploaded"] == ["results/empty.txt"]
+    assert list(report["failed"]) == ["results/b.csv"]
+    assert [name for name, _ in FakeDataverse.uploads] == ["results__empty.txt"]
+
+    # The command line exits non-zero when any file failed
+    monkeypatch.chdir(project)
+    with pytest.raises(SystemExit) as exit_info:
+        main(["dataverse", dataverse["id"], "results", "--url", dataverse["url"]])
+    assert exit_info.value.code == 1
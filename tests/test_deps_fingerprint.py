@@ -0,0 +1,31 @@
+from misc.deps_fingerprint import FINGERPRINT_FILE, OUTPUTS, regenerate
+
+
+def test_regenerates_only_when_inputs_change(project):
+    (project / "src").mkdir()
+    (project / "src" / "main.py").write_text("import json\n", encoding="utf-8")
+    assert regenerate(project)
+    assert all((project / name).exists() for name in OUTPUTS)
+    assert (project / FINGERPRINT_FILE).exists()
+
+    assert not regenerate(project)
+
+    (project / "src" / "main.py").write_text("import json\nimport pytest\n", encoding="utf-8")
+    assert regenerate(project)
+    assert not regenerate(project)
+
+
+def test_missing_output_or_force_regenerates(project):
+    assert regenerate(project)
+    (project / "requirements.txt").unlink()
+    assert regenerate(project)
+    assert regenerate(project, force=True)
+
+
+def test_platform_rules_change_regenerates(project):
+    assert regenerate(project)
+    assert not regenerate(project)
+    with (project / "pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write('\n[tool.platform_rules]\npywin32 = "win32"\n')
+    assert regenerate(project)
+    assert not regenerate(project)
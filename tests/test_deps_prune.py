@@ -0,0 +1,49 @@
+import subprocess
+
+from misc import deps_prune
+from misc.deps_prune import find_unused, prune
+
+
+class FakeDist:
+    def __init__(self, name):
+        self.metadata = {"Name": name}
+        self.files = []
+
+
+def _fake_env(monkeypatch, requires):
+    """Replace the installed environment with `requires`: {distribution: [its requirements]}."""
+    monkeypatch.setattr(deps_prune, "installed", lambda: {name: FakeDist(name) for name in requires})
+    monkeypatch.setattr(deps_prune, "_requirement_names", lambda dist: requires[dist])
+    monkeypatch.setattr(deps_prune, "distribution_index", lambda: {"numpy": ["numpy"], "pandas": ["pandas"]})
+
+
+ENV = {"numpy": [], "pandas": ["numpy", "tzdata"], "tzdata": [], "pyarrow": [], "pip": [], "pyyaml": []}
+
+
+def test_only_imported_and_kept_packages_are_used(project, monkeypatch):
+    _fake_env(monkeypatch, ENV)
+    (project / "src").mkdir()
+    (project / "src" / "main.py").write_text("import numpy\n", encoding="utf-8")
+    assert set(find_unused(project)) == {"pandas", "tzdata", "pyarrow"}
+
+    (project / "src" / "main.py").write_text("import numpy\nimport pandas\n", encoding="utf-8")
+    assert set(find_unused(project)) == {"pyarrow"}
+
+
+def test_keep_list_from_pyproject(project, monkeypatch):
+    _fake_env(monkeypatch, ENV)
+    assert "pandas" in find_unused(project)
+    (project / "pyproject.toml").write_text('[tool.deps_prune]\nkeep = ["Pandas"]\n', encoding="utf-8")
+    assert set(find_unused(project)) == {"pyarrow"}
+    assert find_unused(project, keep=["pyarrow"]) == {}
+
+
+def test_uninstall_is_a_dry_run_by_default(project, monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda *a, **k: calls.append(a))
+    monkeypatch.setattr(deps_prune, "find_unused", lambda root, keep: {"unused-pkg": 10})
+    prune(project, uninstall=True)
+    assert calls == []
+    assert "Dry run" in capsys.readouterr().out
+    prune(project, uninstall=True, dry_run=False)
+    assert len(calls) == 1 and "unused-pkg" in calls[0][0]
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from misc.dmp_inventory import check_required_fields, update_dmp_datasets
+
+
+def _project(project):
+    (project / "data" / "raw").mkdir(parents=True)
+    (project / "data" / "raw" / "a.csv").write_text("x\n1\n", encoding="utf-8")
+    (project / "dmp.json").write_text(json.dumps({"dmp": {"title": "demo"}}), encoding="utf-8")
+    return project
+
+
+def test_sync_is_incremental(project):
+    _project(project)
+    assert update_dmp_datasets(project) == 1
+    dataset = json.loads((project / "dmp.json").read_text(encoding="utf-8"))["dmp"]["dataset"][0]
+    assert [d["title"] for d in dataset["distribution"]] == ["data/raw/a.csv"]
+    assert update_dmp_datasets(project) == 0
+    (project / "data" / "raw" / "b.csv").write_text("x\n2\n", encoding="utf-8")
+    assert update_dmp_datasets(project) == 1
+
+
+def test_required_fields_check():
+    with pytest.raises(ValueError, match="dataset_id"):
+        check_required_fields([{"title": "x", "personal_data": "no", "sensitive_data": "no"}])
+
+
+def test_schema_violations_block_the_write(project):
+    pytest.importorskip("jsonschema")
+    _project(project)
+    schema = project / "schema.json"
+    schema.write_text(json.dumps({"type": "object", "required": ["dmp"], "properties": {
+        "dmp": {"type": "object", "required": ["contact"]}}}), encoding="utf-8")
+    before = (project / "dmp.json").read_text(encoding="utf-8")
+    with pytest.raises(ValueError, match="contact"):
+        update_dmp_datasets(project, schema=schema)
+    assert (project / "dmp.json").read_text(encoding="utf-8") == before
@@ -0,0 +1,64 @@
+import sys
+
+from misc import env_export
+from misc.env_export import environment_yml_text, requirements_text
+
+
+def _snap(project):
+    return {
+        "python": "3.12.1",
+        "conda": [],
+        "pip": {
+            "numpy": {"name": "numpy", "version": "2.0.0", "installer": "pip", "direct_url": None},
+            "pip": {"name": "pip", "version": "24.0", "installer": "pip", "direct_url": None},
+            "setuptools": {"name": "setuptools", "version": "70.0", "installer": "pip"},
+            "uv": {"name": "uv", "version": "0.4.0", "installer": "pip", "direct_url": None},
+            "demo": {
+                "name": "demo",
+                "version": "0.0.1",
+                "installer": "uv",
+                "direct_url": {"url": (project / "setup").as_uri(), "dir_info": {"editable": True}},
+            },
+            "repokit": {
+                "name": "repokit",
+                "version": "1.0",
+                "installer": "uv",
+                "direct_url": {"url": (project / "setup" / "repokit-1.0-py3-none-any.whl").as_uri(), "archive_info": {}},
+            },
+            "tool": {
+                "name": "tool",
+                "version": "0.1",
+                "installer": "pip",
+                "direct_url": {"url": "https://example.org/tool.git", "vcs_info": {"vcs": "git", "commit_id": "abc123"}},
+            },
+        },
+    }
+
+
+def test_requirements_skip_bootstrap_and_keep_direct_urls(project):
+    lines = requirements_text(_snap(project), project).splitlines()
+    assert lines == [
+        "-e ./setup",
+        "numpy==2.0.0",
+        "repokit==1.0",
+        "tool @ git+https://example.org/tool.git@abc123",
+    ]
+
+
+def test_environment_yml_pip_section(project):
+    text = environment_yml_text(_snap(project), "demo", project)
+    assert "  - python=3.12.1" in text
+    assert "    - -e ./setup" in text
+    assert "    - numpy==2.0.0" in text
+    assert "pip==" not in text and "uv==" not in text
+
+
+def test_conda_meta_follows_the_running_interpreter(tmp_path, monkeypatch):
+    active = tmp_path / "active"
+    (active / "conda-meta").mkdir(parents=True)
+    monkeypatch.setenv("CONDA_PREFIX", str(active))
+    monkeypatch.setattr(sys, "prefix", str(tmp_path / "venv"))
+    assert env_export.conda_meta_dir() is None
+
+    (tmp_path / "venv" / "conda-meta").mkdir(parents=True)
+    assert env_export.conda_meta_dir() == tmp_path / "venv" / "conda-meta"
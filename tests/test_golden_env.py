@@ -0,0 +1,103 @@
+import importlib.util
+import json
+import subprocess
+
+import pytest
+from conftest import REPO_ROOT
+
+
+@pytest.fixture
+def hook(tmp_path, monkeypatch):
+    """hooks/post_gen_project.py, imported with the cwd set to a fresh project folder."""
+    spec = importlib.util.spec_from_file_location("post_gen_project", REPO_ROOT / "hooks" / "post_gen_project.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "_uv_version", lambda: "uv 0.0.0")
+    monkeypatch.setattr(module.os, "name", "posix")
+    monkeypatch.setenv(module.GOLDEN_CACHE_ENV, str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    return module
+
+
+def write_config(path, **choices):
+    config = {
+        "programming_language": "Python",
+        "version_control": "Git",
+        "authors": "A. Author",
+        "orcids": "",
+        "python_env_manager": "Venv",
+        "r_env_manager": None,
+        "code_repo": "GitHub",
+        "remote_storage": "None",
+        **choices,
+    }
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+
+def test_key_covers_every_choice_that_changes_installed_packages(hook, tmp_path):
+    base = hook.golden_key(write_config(tmp_path / "a.json"))
+    assert base == hook.golden_key(write_config(tmp_path / "b.json", authors="Someone Else", orcids="0000"))
+    for choice in ({"version_control": "DVC"}, {"code_repo": "GitLab"}, {"remote_storage": "Dropbox"}):
+        assert hook.golden_key(write_config(tmp_path / "c.json", **choice)) != base
+    assert hook.golden_key(write_config(tmp_path / "d.json", python_env_manager="Conda")) is None
+
+
+def test_key_changes_with_bundled_wheels(hook, tmp_path):
+    config = write_config(tmp_path / "a.json")
+    before = hook.golden_key(config)
+    dist = hook.pathlib.Path("setup", "repokit", "dist")
+    dist.mkdir(parents=True)
+    (dist / "repokit-1.0-py3-none-any.whl").write_bytes(b"wheel")
+    assert hook.golden_key(config) != before
+
+
+def test_store_and_restore_rewrites_paths(hook, tmp_path, monkeypatch):
+    config = write_config(tmp_path / "a.json")
+    source = hook.pathlib.Path.cwd()
+    (source / ".venv" / "bin").mkdir(parents=True)
+    (source / ".venv" / "pyvenv.cfg").write_text("home = /usr/bin\nprompt = project\n", encoding="utf-8")
+    (source / ".venv" / "bin" / "activate").write_text(f'VIRTUAL_ENV="{source}/.venv"\n', encoding="utf-8")
+    hook.store_golden_env(config)
+
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    assert hook.restore_golden_env(config)
+    assert (other / ".venv" / "bin" / "activate").read_text(encoding="utf-8") == f'VIRTUAL_ENV="{other}/.venv"\n'
+    assert "prompt = other" in (other / ".venv" / "pyvenv.cfg").read_text(encoding="utf-8")
+    # The cached copy is untouched
+    entry = next(p for p in (tmp_path / "cache").iterdir() if not p.name.startswith("."))
+    assert str(source) in (entry / ".venv" / "bin" / "activate").read_text(encoding="utf-8")
+
+    monkeypatch.chdir(tmp_path)
+    assert not hook.restore_golden_env(write_config(tmp_path / "b.json", version_control="DVC"))
+
+
+def test_failed_uv_setup_on_restored_env_falls_back_to_a_fresh_pip_env(hook, tmp_path, monkeypatch):
+    config = write_config(tmp_path / "a.json")
+    calls = []
+
+    def restore(path):
+        (hook.pathlib.Path(".venv") / "golden-marker").parent.mkdir()
+        (hook.pathlib.Path(".venv") / "golden-marker").write_text("hardlinked", encoding="utf-8")
+        return True
+
+    def uv(path):
+        calls.append("uv")
+        raise subprocess.CalledProcessError(1, ["uv", "lock"])
+
+    def pip(path):
+        calls.append(("pip", hook.pathlib.Path(".venv").exists()))
+
+    monkeypatch.setattr(hook, "write_setup_config", lambda: config)
+    monkeypatch.setattr(hook, "restore_golden_env", restore)
+    monkeypatch.setattr(hook, "install_uv", lambda: True)
+    monkeypatch.setattr(hook, "create_with_uv", uv)
+    monkeypatch.setattr(hook, "create_with_pip", pip)
+    monkeypatch.setattr(hook, "store_golden_env", lambda path: calls.append("store"))
+    hook.main()
+    # The golden copy is removed before pip builds .venv, and nothing is stored
+    assert calls == ["uv", ("pip", False)]
@@ -0,0 +1,59 @@
+from conftest import TEMPLATE_DIR
+
+from misc.ignore_patterns import PatternSet, load_matchers, walk
+from misc.project_config import load_toml
+
+
+def test_unanchored_and_anchored_patterns():
+    patterns = PatternSet(["*.log", "docs/build", "__pycache__"])
+    assert patterns.match("run.log")
+    assert patterns.match("src/deep/run.log")
+    assert patterns.match("docs/build", is_dir=True)
+    assert not patterns.match("src/docs/build", is_dir=True)
+    assert patterns.match("src/__pycache__", is_dir=True)
+
+
+def test_directory_only_patterns():
+    patterns = PatternSet(["bin/"])
+    assert patterns.match("bin", is_dir=True)
+    assert not patterns.match("bin")
+    assert patterns.match_path("bin/tool.exe")
+
+
+def test_negation_last_match_wins():
+    patterns = PatternSet(["data/*", "!data/keep.csv"])
+    assert patterns.match("data/drop.csv")
+    assert not patterns.match("data/keep.csv")
+
+
+def test_double_star():
+    patterns = PatternSet(["**/tmp/**", "a/**/z.txt"])
+    assert patterns.match("x/tmp/y/file")
+    assert patterns.match("a/z.txt")
+    assert patterns.match("a/b/c/z.txt")
+
+
+def test_walk_prunes_ignored_folders(project):
+    (project / "pyproject.toml").write_text('[tool.treeignore]\npatterns = ["build/"]\n', encoding="utf-8")
+    for rel in ("src/a.py", "build/out/b.py", ".venv/lib/c.py"):
+        (project / rel).parent.mkdir(parents=True, exist_ok=True)
+        (project / rel).write_text("", encoding="utf-8")
+    found = [rel for rel, _ in walk(root=project, ignore="treeignore")]
+    assert found == ["pyproject.toml", "src/a.py"]
+
+
+def test_matchers_recompile_when_pyproject_changes(project):
+    (project / "pyproject.toml").write_text('[tool.treeignore]\npatterns = ["a/"]\n', encoding="utf-8")
+    assert load_matchers(project)["treeignore"].match("a", is_dir=True)
+    (project / "pyproject.toml").write_text('[tool.treeignore]\npatterns = ["b/"]\n', encoding="utf-8")
+    matchers = load_matchers(project)
+    assert not matchers["treeignore"].match("a", is_dir=True)
+    assert matchers["treeignore"].match("b", is_dir=True)
+
+
+def test_template_ignores_tool_caches():
+    tools = load_toml(TEMPLATE_DIR / "pyproject.toml")["tool"]
+    for section in ("treeignore", "rcloneignore"):
+        patterns = PatternSet(tools[section]["patterns"])
+        for rel, is_dir in ((".cache", True), (".trash", True), ("data_manifest.json", False), (".deps_fingerprint.json", False)):
+            assert patterns.match(rel, is_dir=is_dir), (section, rel)
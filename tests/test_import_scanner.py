@@ -0,0 +1,51 @@
+import json
+
+from misc import import_scanner
+from misc.import_scanner import CACHE_FILE, python_requirements, scan_imports
+
+
+def _src(project, files):
+    (project / "src").mkdir(exist_ok=True)
+    for name, text in files.items():
+        (project / "src" / name).write_text(text, encoding="utf-8")
+
+
+def test_scans_python_and_r_sources(project):
+    _src(
+        project,
+        {
+            "main.py": "import os\nimport yaml\nfrom helpers import util\nfrom . import local\n",
+            "helpers.py": "import json\n",
+            "model.R": 'library(dplyr)\nrequire("data.table")\nx <- stats::median(y)\nreadr::read_csv(f)\n',
+        },
+    )
+    found = scan_imports(project)
+    assert found["python"] == ["json", "os", "yaml"]
+    assert found["r"] == ["data.table", "dplyr", "readr"]
+
+
+def test_unchanged_files_come_from_the_cache(project, monkeypatch, capsys):
+    _src(project, {"a.py": "import yaml\n", "b.py": "import json\n"})
+    scan_imports(project)
+    cache = json.loads((project / CACHE_FILE).read_text(encoding="utf-8"))
+    assert set(cache) == {"src/a.py", "src/b.py"}
+
+    parsed = []
+    real = import_scanner.parse_file
+    monkeypatch.setattr(import_scanner, "parse_file", lambda path: parsed.append(path) or real(path))
+    (project / "src" / "b.py").write_text("import csv\n", encoding="utf-8")
+    assert scan_imports(project)["python"] == ["csv", "yaml"]
+    assert [p.replace("\\", "/").rsplit("/", 2)[-2:] for p in parsed] == [["src", "b.py"]]
+    assert "(1 parsed, 1 cached)" in capsys.readouterr().out
+
+
+def test_platform_rules_add_markers(project):
+    plain = python_requirements(["yaml", "os"], project)
+    assert len(plain) == 1 and plain[0].startswith("PyYAML==")
+
+    with (project / "pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write('\n[tool.platform_rules]\ntool-description = "rules"\npyyaml = "win32"\n')
+    assert python_requirements(["yaml"], project) == [f'{plain[0]}; sys_platform == "win32"']
+
+    text = import_scanner.dependencies_text({"python": ["yaml"], "r": ["dplyr"]}, project)
+    assert text.splitlines() == ["Dependencies:", f'{plain[0]}; sys_platform == "win32"', "", "R packages:", "dplyr"]
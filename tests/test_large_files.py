@@ -0,0 +1,95 @@
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from misc.large_files import find_large_files, guard, install_hook
+
+FAKE_DVC = """#!{python}
+import pathlib, sys
+for path in sys.argv[2:]:
+    pathlib.Path(path + ".dvc").write_text("outs: []\\n")
+"""
+
+
+def _config(project, vc="None", action="flag"):
+    (project / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\n\n'
+        f'[tool.cookiecutter]\nVERSION_CONTROL = "{vc}"\n\n'
+        f'[tool.large_files]\nthreshold_mb = 0.001\naction = "{action}"\npatterns = ["data/"]\n',
+        encoding="utf-8",
+    )
+
+
+def _tree(project):
+    (project / "big.bin").write_bytes(b"x" * 5000)
+    (project / "small.txt").write_bytes(b"x" * 10)
+    (project / "data").mkdir()
+    (project / "data" / "huge.bin").write_bytes(b"x" * 5000)
+    (project / "build").mkdir()
+    (project / "build" / "out.bin").write_bytes(b"x" * 5000)
+    (project / ".gitignore").write_text("build/\n", encoding="utf-8")
+
+
+def test_sizes_skip_exempt_and_ignored_paths(project):
+    _config(project)
+    _tree(project)
+    assert find_large_files(project) == {"big.bin": 5000}
+    # the cached listing still sees files that grew in place
+    (project / "small.txt").write_bytes(b"x" * 8000)
+    assert find_large_files(project) == {"small.txt": 8000, "big.bin": 5000}
+
+
+def test_flag_blocks_until_handled(project, capsys):
+    _config(project)
+    _tree(project)
+    assert not guard(project)
+    assert "big.bin" in capsys.readouterr().out
+    (project / "big.bin.dvc").write_text("outs: []\n", encoding="utf-8")
+    assert guard(project)
+
+
+def test_route_to_annex_rules(project):
+    _config(project, vc="Datalad", action="route")
+    _tree(project)
+    (project / "my file.bin").write_bytes(b"x" * 5000)
+    assert guard(project)
+    rules = (project / ".gitattributes").read_text(encoding="utf-8").splitlines()
+    assert sorted(rules) == [
+        "big.bin annex.largefiles=anything",
+        "my[[:space:]]file.bin annex.largefiles=anything",
+    ]
+    assert guard(project)
+    assert len((project / ".gitattributes").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_route_to_dvc(project, monkeypatch):
+    _config(project, vc="DVC", action="route")
+    _tree(project)
+    bin_dir = project / "bin"
+    bin_dir.mkdir()
+    dvc = bin_dir / "dvc"
+    dvc.write_text(FAKE_DVC.format(python=sys.executable), encoding="utf-8")
+    dvc.chmod(dvc.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    assert guard(project)
+    assert (project / "big.bin.dvc").exists()
+    assert not (project / ".gitattributes").exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="runs the hook with sh")
+def test_pre_push_hook_runs_the_guard(project):
+    _config(project)
+    _tree(project)
+    assert not install_hook(project)
+    subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+    assert install_hook(project)
+    hook = project / ".git" / "hooks" / "pre-push"
+    assert subprocess.run(["sh", str(hook)], cwd=project, capture_output=True, check=False).returncode == 1
+    (project / "big.bin").unlink()
+    assert subprocess.run(["sh", str(hook)], cwd=project, capture_output=True, check=False).returncode == 0
+
+    hook.write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+    assert not install_hook(project)
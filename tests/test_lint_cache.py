@@ -0,0 +1,43 @@
+import json
+import shutil
+
+import pytest
+
+from misc.lint_cache import CACHE_FILE, lint
+
+pytestmark = pytest.mark.skipif(not shutil.which("ruff"), reason="ruff not installed")
+
+
+@pytest.fixture
+def sources(project):
+    (project / "src").mkdir()
+    (project / "src" / "clean.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (project / "src" / "dirty.py").write_text("import os\n", encoding="utf-8")
+    return ["src/clean.py", "src/dirty.py"]
+
+
+def test_unchanged_files_are_served_from_cache(project, sources, capsys):
+    found, errors = lint(project, sources)
+    assert list(found) == ["src/dirty.py"] and "F401" in found["src/dirty.py"][0]
+    assert not errors
+    assert "Linted 2 of 2 files" in capsys.readouterr().out
+
+    found, _ = lint(project, sources)
+    assert list(found) == ["src/dirty.py"]
+    assert "Linted 0 of 2 files" in capsys.readouterr().out
+
+
+def test_linter_failure_is_reported_and_not_cached(project, sources, capsys):
+    (project / "ruff.toml").write_text('line-length = "x"\n', encoding="utf-8")
+    found, errors = lint(project, sources)
+    assert not found
+    assert set(errors) == set(sources)
+    assert "exit code 2" in errors["src/clean.py"] and "ruff.toml" in errors["src/clean.py"]
+    cache = json.loads((project / CACHE_FILE).read_text(encoding="utf-8"))
+    assert cache["python"]["files"] == {}
+    capsys.readouterr()
+
+    (project / "ruff.toml").write_text("line-length = 100\n", encoding="utf-8")
+    found, errors = lint(project, sources)
+    assert list(found) == ["src/dirty.py"] and not errors
+    assert "Linted 2 of 2 files" in capsys.readouterr().out
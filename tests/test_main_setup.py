@@ -0,0 +1,74 @@
+import ast
+import os
+import sys
+
+from conftest import TEMPLATE_DIR
+
+
+def _load_helpers(project):
+    """
+    Execute main_setup.py up to its first module-level call, which installs the
+    repokit wheels, with __file__ pointing into `project`.
+    """
+    source = (TEMPLATE_DIR / "setup" / "main_setup.py").read_text(encoding="utf-8")
+    body = ast.parse(source).body
+    stop = next(i for i, node in enumerate(body) if isinstance(node, ast.Expr))
+    ns = {"__file__": str(project / "setup" / "main_setup.py"), "__name__": "main_setup"}
+    code = compile(ast.Module(body=body[:stop], type_ignores=[]), "main_setup.py", "exec")
+    exec(code, ns)  # noqa: S102 - the setup script cannot be imported without repokit
+    return ns
+
+
+def _run_worker(ns, trash, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["-c", str(trash), ns["TRASH_FAILURES"]])
+    exec(ns["_TRASH_WORKER"], {"__name__": "__main__"})  # noqa: S102 - normally run via `python -c`
+
+
+def _files(project):
+    (project / "setup").mkdir()
+    (project / "old.txt").write_text("x", encoding="utf-8")
+    (project / "old_dir" / "sub").mkdir(parents=True)
+    (project / "old_dir" / "sub" / "a.bin").write_bytes(b"a")
+    (project / "old_dir" / "locked.bin").write_bytes(b"b")
+
+
+def test_background_delete_moves_targets_aside_and_empties_trash(project, monkeypatch):
+    _files(project)
+    ns = _load_helpers(project)
+    trash = project / ".trash"
+    moved = []
+
+    def spawn(trash_dir):
+        moved.extend(sorted(p.name for p in trash_dir.glob("*/*")))
+        _run_worker(ns, trash_dir, monkeypatch)
+        return True
+
+    ns["_spawn_trash_worker"] = spawn
+    assert ns["delete_files"](["old.txt", "old_dir", "missing.txt"], background=True) == {}
+    assert moved == ["old.txt", "old_dir"]
+    assert not (project / "old.txt").exists() and not (project / "old_dir").exists()
+    assert not trash.exists()
+
+
+def test_trash_worker_reports_files_it_cannot_remove(project, monkeypatch):
+    _files(project)
+    ns = _load_helpers(project)
+    ns["_spawn_trash_worker"] = lambda trash_dir: True
+    ns["delete_files"](["old_dir"], background=True)
+
+    real_unlink = os.unlink
+
+    def unlink(path, *args, **kwargs):
+        if str(path).endswith("locked.bin"):
+            raise PermissionError("in use")
+        return real_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "unlink", unlink)
+    trash = project / ".trash"
+    _run_worker(ns, trash, monkeypatch)
+    monkeypatch.undo()
+
+    failures = (trash / ns["TRASH_FAILURES"]).read_text(encoding="utf-8").splitlines()
+    assert any(line.startswith(str(trash)) and "locked.bin: in use" in line for line in failures)
+    left = sorted(p.name for p in trash.rglob("*") if p.is_file())
+    assert left == sorted(["locked.bin", ns["TRASH_FAILURES"]])
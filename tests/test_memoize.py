@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import REPO_ROOT
+
+from misc.memoize import call_key, memoize
+
+
+def test_results_are_cached_on_disk(tmp_path):
+    calls = []
+
+    @memoize(cache_dir=tmp_path)
+    def double(values):
+        calls.append(values)
+        return [v * 2 for v in values]
+
+    assert double([1, 2]) == [2, 4]
+    assert double([1, 2]) == [2, 4]
+    assert double([3]) == [6]
+    assert len(calls) == 2
+    assert double.cache_stats()["hits"] == 1
+
+
+def test_sliced_tables_hash_by_their_rows():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"x": list(range(10)), "s": [str(i) for i in range(10)]})
+    head, tail = table.slice(0, 5), table.slice(5, 5)
+    # Both slices share the parent's buffers
+    assert call_key("f", (head,), {}) != call_key("f", (tail,), {})
+    assert call_key("f", (tail,), {}) == call_key("f", (table.slice(5, 5),), {})
+
+
+def test_sliced_table_is_not_served_another_slices_result(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+
+    @memoize(cache_dir=tmp_path)
+    def total(table):
+        return sum(table.column("x").to_pylist())
+
+    table = pa.table({"x": list(range(10))})
+    assert total(table.slice(0, 5)) == 10
+    assert total(table.slice(5, 5)) == 35
+
+
+def test_sets_and_dicts_hash_the_same_in_every_process():
+    code = (
+        "from misc.memoize import call_key\n"
+        "members = [f'item{i}' for i in range(50)]\n"
+        "args = (set(members), frozenset(members[::-1]), {m: {m, 'x'} for m in members})\n"
+        "print(call_key('f', args, {'opts': {'b': 1, 'a': 2}}))\n"
+    )
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(keys) == 1
+    assert call_key("f", ({1, 2},), {}) != call_key("f", ([1, 2],), {})
+    assert call_key("f", ({1, 2},), {}) != call_key("f", (frozenset({1, 2}),), {})
@@ -0,0 +1,53 @@
+import pytest
+
+from misc import param_sweep
+from misc.param_sweep import expand_grid, load_grid, run_sweep
+
+pytestmark = pytest.mark.skipif(param_sweep.resource is None, reason="per-task limits need POSIX rlimits")
+
+BURN = """
+import os
+import signal
+import time
+
+
+def burn(seconds, i):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+    return {"i": i}
+
+
+def crash(i):
+    if i == 1:
+        os.kill(os.getpid(), signal.SIGKILL)  # as the kernel does when a limit is hit in C code
+    time.sleep(0.2)
+    return {"i": i}
+"""
+
+
+@pytest.fixture
+def burner(project):
+    (project / "src").mkdir()
+    (project / "src" / "burn_cpu.py").write_text(BURN, encoding="utf-8")
+    return project
+
+
+def test_grid_parsing():
+    grid = load_grid(params=["alpha=0.1,0.2", "name=a"])
+    assert grid == {"alpha": [0.1, 0.2], "name": ["a"]}
+    assert expand_grid(grid) == [{"alpha": 0.1, "name": "a"}, {"alpha": 0.2, "name": "a"}]
+
+
+def test_cpu_limit_does_not_accumulate_across_tasks(burner):
+    # Each task uses 0.6s of CPU; in a reused worker the 1s limit would kill the second one
+    grid = {"seconds": [0.6], "i": [0, 1, 2]}
+    records = run_sweep("burn_cpu:burn", grid, root=burner, workers=1, cpu_seconds=1)
+    assert [r["status"] for r in records.values()] == ["ok", "ok", "ok"]
+
+
+def test_killed_task_fails_alone(burner):
+    records = run_sweep("burn_cpu:crash", {"i": [0, 1, 2, 3]}, root=burner, workers=2, timeout=60)
+    statuses = [records[tid]["status"] for tid in sorted(records)]
+    assert statuses == ["ok", "error", "ok", "ok"]
+    assert "worker process died" in records[sorted(records)[1]]["error"]
@@ -0,0 +1,39 @@
+from misc.project_tree import TREE_START, build_tree, update_readme_tree
+
+
+def _touch(project, *paths):
+    for rel in paths:
+        (project / rel).parent.mkdir(parents=True, exist_ok=True)
+        (project / rel).write_text("x", encoding="utf-8")
+
+
+def test_tree_honors_treeignore(project):
+    (project / "pyproject.toml").write_text('[tool.treeignore]\npatterns = [".cache/", "*.log"]\n', encoding="utf-8")
+    _touch(project, "src/main.py", ".cache/index.json", "run.log")
+    lines = build_tree(project)
+    assert any(line.endswith("src/") for line in lines)
+    assert not any(".cache" in line or "run.log" in line for line in lines)
+
+
+def test_tree_is_bounded(project):
+    _touch(project, *[f"many/f{i:02d}.txt" for i in range(10)], "a/b/c/d/deep.txt")
+    lines = build_tree(project, max_depth=2, max_entries=3)
+    assert any("... (7 more)" in line for line in lines)
+    assert any(line.endswith("b/ ...") for line in lines)
+    assert not any("deep.txt" in line for line in lines)
+
+
+def test_data_folders_are_summarized(project):
+    _touch(project, "data/raw/a.csv", "data/raw/b.csv")
+    lines = build_tree(project)
+    assert any("raw/  (2 files" in line for line in lines)
+    assert not any("a.csv" in line for line in lines)
+
+
+def test_readme_only_rewritten_when_tree_changes(project):
+    _touch(project, "src/main.py", "README.md")
+    assert update_readme_tree(root=project)
+    assert TREE_START in (project / "README.md").read_text(encoding="utf-8")
+    assert not update_readme_tree(root=project)
+    _touch(project, "src/other.py")
+    assert update_readme_tree(root=project)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+nbformat = pytest.importorskip("nbformat")
+pytest.importorskip("nbclient")
+pytest.importorskip("ipykernel")
+
+from misc import run_notebook as run_notebook_module
+from misc.run_notebook import run_notebook
+
+
+@pytest.fixture
+def notebook(project):
+    nb = nbformat.v4.new_notebook()
+    nb.metadata["kernelspec"] = {"name": "python3", "language": "python", "display_name": "Python 3"}
+    nb.cells = [
+        nbformat.v4.new_code_cell("scale = 1", metadata={"tags": ["parameters"]}),
+        nbformat.v4.new_code_cell(
+            "import json, os\n"
+            "with open('cwd.json', 'w') as f:\n"
+            "    json.dump({'cwd': os.getcwd(), 'scale': scale}, f)"
+        ),
+    ]
+    (project / "src").mkdir()
+    path = project / "src" / "analysis.ipynb"
+    nbformat.write(nb, str(path))
+    return path
+
+
+def test_kernel_runs_in_the_notebook_folder(project, notebook):
+    records = run_notebook(notebook, {"scale": [3]}, root=project, workers=1)
+    assert [r["status"] for r in records] == ["ok"]
+    written = json.loads((project / "src" / "cwd.json").read_text(encoding="utf-8"))
+    assert written == {"cwd": str(project / "src"), "scale": 3}
+    assert (project / "results" / "notebooks" / "analysis" / "timings.csv").exists()
+
+
+def test_cwd_override(project, notebook):
+    records = run_notebook(notebook, root=project, workers=1, cwd=project)
+    assert [r["status"] for r in records] == ["ok"]
+    assert json.loads((project / "cwd.json").read_text(encoding="utf-8"))["cwd"] == str(project)
+
+
+def test_reused_kernel_is_reset_between_runs(project, notebook):
+    nb = nbformat.read(str(notebook), as_version=4)
+    nb.cells[1].source = (
+        "import json, os\n"
+        "with open('runs.jsonl', 'a') as f:\n"
+        "    f.write(json.dumps({'cwd': os.getcwd(), 'leaked': 'leak' in dir()}) + '\\n')\n"
+        "leak = True\n"
+        "os.chdir('..')\n"
+        "assert scale != 2"
+    )
+    nbformat.write(nb, str(notebook))
+    records = run_notebook(notebook, {"scale": [1, 2, 3]}, root=project, workers=1)
+    assert [r["status"] for r in records] == ["ok", "error", "ok"]
+    runs = [json.loads(line) for line in (project / "src" / "runs.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert runs == [{"cwd": str(project / "src"), "leaked": False}] * 3
+    assert not run_notebook_module._KERNEL
+
+
+def test_failed_run_discards_the_kernel(project, notebook):
+    out = project / "out.ipynb"
+    nb = nbformat.read(str(notebook), as_version=4)
+    nb.cells[1].source = "raise ValueError('boom')"
+    nbformat.write(nb, str(project / "bad.ipynb"))
+    try:
+        _, error = run_notebook_module.execute_ipynb(project / "bad.ipynb", {}, out, project)
+        assert error == "ValueError: boom"
+        assert not run_notebook_module._KERNEL
+        _, error = run_notebook_module.execute_ipynb(notebook, {}, out, project)
+        assert error is None and len(run_notebook_module._KERNEL) == 1
+    finally:
+        run_notebook_module._shutdown_kernels()
@@ -0,0 +1,64 @@
+import json
+import sys
+
+from misc import run_tests as runner
+from misc.run_tests import DURATIONS_FILE, project_python, run_tests, shard_tests
+
+
+def _write(project, name, text):
+    (project / "tests").mkdir(exist_ok=True)
+    (project / "tests" / name).write_text(text, encoding="utf-8")
+    return f"tests/{name}"
+
+
+def test_shards_balance_recorded_durations(project):
+    files = [_write(project, f"test_{n}.py", "") for n in "abcd"]
+    durations = {"files": dict(zip(files, [10.0, 6.0, 5.0, 1.0])), "tests": {}}
+    (project / ".cache").mkdir()
+    (project / DURATIONS_FILE).write_text(json.dumps(durations), encoding="utf-8")
+    assert shard_tests(project, files, 2) == [["tests/test_a.py", "tests/test_d.py"], ["tests/test_b.py", "tests/test_c.py"]]
+    assert shard_tests(project, files, 10) == [[f] for f in files]
+
+
+def test_untimed_files_are_weighted_by_size(project):
+    big = _write(project, "test_big.py", "#" * 50_000)
+    small = [_write(project, f"test_s{i}.py", "#" * 10_000) for i in range(3)]
+    assert shard_tests(project, [big, *small], 2) == [[big], sorted(small)]
+
+
+def test_results_are_aggregated_across_shards(project, monkeypatch, capsys):
+    files = [_write(project, f"test_{n}.py", "") for n in "abc"]
+    (project / ".cache").mkdir()
+    (project / DURATIONS_FILE).write_text(
+        json.dumps({"files": {"tests/test_old.py": 9.0}, "tests": {}}), encoding="utf-8"
+    )
+
+    def fake_shard(root, language, group, workdir, index=0):
+        timings = {rel: 1.0 + index for rel in group}
+        tests = {f"{rel}::test_x": 1.0 + index for rel in group}
+        return {"tests": tests, "files": timings, "failed": [r for r in group if r.endswith("b.py")], "seconds": 1.0}
+
+    monkeypatch.setattr(runner, "run_shard", fake_shard)
+    assert not run_tests(project, "Python", shards=3)
+    recorded = json.loads((project / DURATIONS_FILE).read_text(encoding="utf-8"))
+    assert set(recorded["files"]) == {"tests/test_old.py", *files}
+    assert len(recorded["tests"]) == 3
+    out = capsys.readouterr().out
+    assert "3 files in 3 shards" in out and "FAILED tests/test_b.py" in out
+
+
+def test_pytest_shards_report_failures_and_timings(project):
+    _write(project, "test_ok.py", "def test_ok():\n    assert True\n")
+    _write(project, "test_bad.py", "def test_bad():\n    assert False\n")
+    assert not run_tests(project, "Python", shards=2)
+    recorded = json.loads((project / DURATIONS_FILE).read_text(encoding="utf-8"))
+    assert set(recorded["files"]) == {"tests/test_ok.py", "tests/test_bad.py"}
+    assert any(test.endswith("::test_bad") for test in recorded["tests"])
+
+
+def test_project_python_prefers_the_project_env(project):
+    assert project_python(project) == sys.executable
+    exe = project / ".venv" / "bin" / "python"
+    exe.parent.mkdir(parents=True)
+    exe.write_text("", encoding="utf-8")
+    assert project_python(project) == str(exe)
@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+
+# Optional backends a subcommand may load when it runs, but never at import time
+HEAVY_MODULES = {
+    "pandas", "pyarrow", "numpy", "polars", "matplotlib", "nbclient", "nbformat", "jupyter_client",
+    "zmq", "requests", "psutil", "packaging",
+}
+
+PROBE = """
+import importlib, json, sys
+import misc.cli
+dispatcher = sorted(m for m in sys.modules if m.startswith("misc."))
+for module, _ in misc.cli.COMMANDS.values():
+    importlib.import_module(f"misc.{module}")
+print(json.dumps({"dispatcher": dispatcher, "loaded": sorted({m.split(".")[0] for m in sys.modules})}))
+"""
+
+
+def test_cli_and_subcommands_do_not_import_heavy_modules():
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    result = json.loads(proc.stdout)
+    assert result["dispatcher"] == ["misc.cli"]
+    assert not HEAVY_MODULES & set(result["loaded"])
@@ -0,0 +1,66 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+from misc.vc_data_push import pushed_stats, save_and_push
+
+FAKE_DVC = """#!{python}
+import json, pathlib, sys
+config = pathlib.Path(".fake_dvc_config.json")
+values = json.loads(config.read_text()) if config.exists() else {{}}
+args = sys.argv[1:]
+if args[:2] == ["config", "--local"]:
+    rest = args[2:]
+    if rest[0] == "--unset":
+        values.pop(rest[1], None)
+    elif len(rest) == 1:
+        if rest[0] not in values:
+            raise SystemExit(251)
+        print(values[rest[0]])
+    else:
+        values[rest[0]] = rest[1]
+    config.write_text(json.dumps(values))
+elif args[0] == "push":
+    print("2 files pushed")
+"""
+
+
+@pytest.fixture
+def fake_dvc(project, monkeypatch):
+    bin_dir = project / "bin"
+    bin_dir.mkdir()
+    dvc = bin_dir / "dvc"
+    dvc.write_text(FAKE_DVC.format(python=sys.executable), encoding="utf-8")
+    dvc.chmod(dvc.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    (project / "data").mkdir()
+    (project / "data" / "a.csv").write_bytes(b"x" * 1000)
+    return project / ".fake_dvc_config.json"
+
+
+def test_dvc_checksum_jobs_is_unset_after_save(project, fake_dvc, capsys):
+    assert save_and_push(project, "DVC", ["data"], jobs=3)
+    assert json.loads(fake_dvc.read_text()) == {}
+    # Throughput is reported for what was pushed, not the tracked tree
+    assert "DVC push (-J 3): 2 files in" in capsys.readouterr().out
+
+
+def test_dvc_checksum_jobs_previous_value_restored(project, fake_dvc):
+    fake_dvc.write_text(json.dumps({"core.checksum_jobs": "7"}))
+    assert save_and_push(project, "DVC", ["data"], jobs=3, push=False)
+    assert json.loads(fake_dvc.read_text()) == {"core.checksum_jobs": "7"}
+
+
+def test_datalad_pushed_stats_counts_copied_files(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"x" * 10)
+    (tmp_path / "b.bin").write_bytes(b"x" * 20)
+    output = "\n".join([
+        json.dumps({"action": "copy", "status": "ok", "path": str(tmp_path / "a.bin")}),
+        json.dumps({"action": "copy", "status": "notneeded", "path": str(tmp_path / "b.bin")}),
+        json.dumps({"action": "publish", "status": "ok", "path": str(tmp_path)}),
+    ])
+    assert pushed_stats("Datalad", output, tmp_path) == (1, 10)
+    assert pushed_stats("DVC", "Everything is up to date.", tmp_path) == (0, None)
@@ -89,6 +89,16 @@ function Verify-EnvPaths {
     }
 }
 
+function Show-TrashFailures {
+    $log = ".\.trash\failures.txt"
+    if (Test-Path $log) {
+        Write-Host ""
+        Write-Host "Background cleanup could not delete the following paths:" -ForegroundColor Yellow
+        Get-Content $log | ForEach-Object { Write-Host "  - $_" }
+        Write-Host "Delete the '.trash' folder manually once they are no longer in use." -ForegroundColor Yellow
+    }
+}
+
 # --- First: Load only environment activation paths (venv or conda) ---
 $condaPath      = Get-EnvValueFromDotEnv -varName "CONDA"
 $condaEnvPath   = Get-EnvValueFromDotEnv -varName "CONDA_ENV_PATH"
@@ -150,3 +160,6 @@ function global:prompt {
 
 # check missing paths
 Verify-EnvPaths
+
+# report leftovers of the background setup cleanup
+Show-TrashFailures
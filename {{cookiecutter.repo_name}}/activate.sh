@@ -136,6 +136,16 @@ verify_env_paths() {
     fi
 }
 
+report_trash_failures() {
+    local log=".trash/failures.txt"
+    if [ -f "$log" ]; then
+        echo ""
+        echo "⚠️ Background cleanup could not delete the following paths:"
+        sed 's/^/  - /' "$log"
+        echo "Delete the '.trash' folder manually once they are no longer in use."
+    fi
+}
+
 reset_env
 activate_env
 
@@ -162,3 +172,6 @@ export PS1="[$repo_name:$env_label] \$ "
 
 # check missing paths
 verify_env_paths
+
+# report leftovers of the background setup cleanup
+report_trash_failures
@@ -5,11 +5,14 @@ import subprocess
 import sys
 import shutil
 import stat
+import time
 
 PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent
 SETUP_DIR = pathlib.Path(__file__).resolve().parent
 REPOKIT_DIR = SETUP_DIR / "repokit"
 REPOKIT_EXTERNAL = REPOKIT_DIR / "external"
+TRASH_DIR = PROJECT_DIR / ".trash"
+TRASH_FAILURES = "failures.txt"
 
 LOCAL_PACKAGES = [
     REPOKIT_DIR,
@@ -142,11 +145,80 @@ def _on_rm_error(func, path, exc_info):
     func(path)
 
 
-def delete_files(file_paths: list | None = None) -> dict:
+# Runs detached from the setup process: unlinks everything under the trash
+# directory in parallel, then removes the emptied folders. Paths that cannot be
+# removed are written to failures.txt, which activate.sh/activate.ps1 report.
+_TRASH_WORKER = """
+import os, stat, sys
+from concurrent.futures import ThreadPoolExecutor
+
+trash, log_name = sys.argv[1], sys.argv[2]
+failures = []
+
+def unlink(path):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        try:
+            os.chmod(path, stat.S_IWRITE)
+            os.unlink(path)
+        except OSError as e:
+            failures.append(f"{path}: {e}")
+    except OSError as e:
+        failures.append(f"{path}: {e}")
+
+files, dirs = [], []
+for top, subdirs, names in os.walk(trash):
+    files.extend(os.path.join(top, n) for n in names if not (top == trash and n == log_name))
+    dirs.extend(os.path.join(top, d) for d in subdirs)
+with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+    list(pool.map(unlink, files))
+for d in sorted(dirs, key=len, reverse=True):
+    try:
+        os.unlink(d) if os.path.islink(d) else os.rmdir(d)
+    except OSError as e:
+        failures.append(f"{d}: {e}")
+
+log = os.path.join(trash, log_name)
+if failures:
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("\\n".join(failures) + "\\n")
+else:
+    try:
+        os.unlink(log)
+    except OSError:
+        pass
+    try:
+        os.rmdir(trash)
+    except OSError:
+        pass
+"""
+
+
+def _spawn_trash_worker(trash_dir: pathlib.Path) -> bool:
+    """Start the detached background worker that empties `trash_dir`."""
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if platform.system().lower() == "windows":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    try:
+        subprocess.Popen([sys.executable, "-c", _TRASH_WORKER, str(trash_dir), TRASH_FAILURES], **kwargs)
+        return True
+    except OSError:
+        return False
+
+
+def delete_files(file_paths: list | None = None, background: bool = False) -> dict:
     """
     Delete files or folders listed in `file_paths`.
-    Returns {absolute_path: "Deleted file" | "Deleted folder" | "Not Found" | "Error: ..."}.
+    Returns {absolute_path: "Error: ..."} for the paths that could not be deleted.
     Paths are resolved relative to the repo root two levels above this file (your original behavior).
+
+    With `background=True` each target is renamed into `.trash/` (atomic, same
+    filesystem) and the function returns immediately; a detached worker removes
+    the trash with parallel unlinks. Targets that cannot be renamed (e.g. locked
+    on Windows) fall back to synchronous deletion.
     """
     if file_paths is None:
         file_paths = []
@@ -154,6 +226,22 @@ def delete_files(file_paths: list | None = None) -> dict:
     results = {}
     base = pathlib.Path(__file__).resolve().parent.parent
 
+    if background:
+        batch = TRASH_DIR / f"{os.getpid()}-{int(time.time())}"
+        remaining = []
+        for raw in file_paths:
+            p = (base / pathlib.Path(raw)).resolve()
+            if not (p.exists() or p.is_symlink()):
+                continue
+            try:
+                batch.mkdir(parents=True, exist_ok=True)
+                os.replace(p, batch / p.name)
+            except OSError:
+                remaining.append(raw)
+        if batch.exists() and not _spawn_trash_worker(TRASH_DIR):
+            results[str(batch)] = "Error: could not start background cleanup"
+        file_paths = remaining
+
     for raw in file_paths:
         p = (base / pathlib.Path(raw)).resolve()
         key = str(p)
@@ -359,8 +447,8 @@ def outro():
     if load_from_env("PYTHON_ENV_MANAGER", ".cookiecutter").lower() == "conda":
         files_to_remove.append("./.venv")
 
-    # Deleting Setup scripts
-    failed = delete_files(files_to_remove)
+    # Deleting Setup scripts (removed in the background after being moved to .trash/)
+    failed = delete_files(files_to_remove, background=True)
 
     # Updating README
     creating_readme(programming_language=load_from_env("PROGRAMMING_LANGUAGE", ".cookiecutter"))